@@ -0,0 +1,261 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from app_budgets import spend_matrix
+from app_dedupe import find_duplicates
+from app_recurring import detect_recurring
+
+# --- 🧮 Shared Aggregate Cache 🧮 ---
+# The sidebar views all summarize the same few cubes (day/month/year x type,
+# category x type). They are computed once per data version and shared, so switching
+# views is a dictionary lookup instead of a copy + groupby over the whole ledger.
+# Added transactions are folded into the cached cubes as deltas (see apply) rather
+# than invalidating them, so a new record costs O(1) per cube, not a rescan.
+
+
+class AggregateCache:
+    def __init__(self):
+        self.version = 0
+        self._cubes = {}
+
+    @classmethod
+    def from_cubes(cls, cubes):
+        """Rebuilds a cache from cubes previously returned by cubes() (e.g. a snapshot)."""
+        cache = cls()
+        cache._cubes = dict(cubes)
+        return cache
+
+    @classmethod
+    def combine(cls, caches):
+        """A cache whose cubes are the sums of several ledgers' cubes (no rows needed).
+
+        Only the additive cubes are combined; lookups that need rows (date_order,
+        recurring) are not available on the result.
+        """
+        combined = {}
+        for cache in caches:
+            for name in ('month', 'year', 'day', 'category'):
+                if name not in cache._cubes:
+                    continue
+                sums, counts = cache._cubes[name]
+                if name in combined:
+                    old_sums, old_counts = combined[name]
+                    sums = old_sums.add(sums, fill_value=0)
+                    counts = old_counts.add(counts, fill_value=0).astype('int64')
+                combined[name] = (sums, counts)
+            if 'month_category' in cache._cubes:
+                spend = cache._cubes['month_category']
+                if 'month_category' in combined:
+                    spend = combined['month_category'].add(spend, fill_value=0).sort_index()
+                combined['month_category'] = spend
+            latest = cache._cubes.get('latest')
+            if latest is not None and not pd.isna(latest):
+                combined['latest'] = max(combined.get('latest', latest), latest)
+        return cls.from_cubes(combined)
+
+    def cubes(self):
+        """Deep copy of the cached cubes, safe to hand to a worker thread."""
+        return copy.deepcopy(self._cubes)
+
+    def invalidate(self):
+        """Drops every cached cube; called whenever self.df is replaced wholesale."""
+        self.version += 1
+        self._cubes.clear()
+
+    def _get(self, key, df, builder):
+        if key not in self._cubes:
+            self._cubes[key] = builder(df)
+        return self._cubes[key]
+
+    @staticmethod
+    def _cube(df, key):
+        """Sums Amount by (key, Type) and unstacks Type into plain string columns."""
+        grouped = df.groupby([key, df['Type']], observed=True)['Amount']
+        sums = grouped.sum().unstack(fill_value=0)
+        counts = grouped.size().unstack(fill_value=0)
+        for frame in (sums, counts):
+            frame.columns = frame.columns.astype(str)
+            if isinstance(frame.index, pd.CategoricalIndex):
+                frame.index = frame.index.astype(str)
+        return sums, counts
+
+    @staticmethod
+    def _month_category(df):
+        """Expense sums by (Month, Category)."""
+        expenses = df[df['Type'] == 'Expense']
+        spend = expenses.groupby([expenses['Date'].dt.to_period('M').rename('Month'),
+                                  expenses['Category'].astype(str)])['Amount'].sum()
+        return spend.sort_index()
+
+    # --- Cubes ---
+    def monthly(self, df):
+        """Month x Type amount sums, indexed by a monthly PeriodIndex."""
+        return self._get('month', df, lambda d: self._cube(d, d['Date'].dt.to_period('M').rename('Month')))[0]
+
+    def daily(self, df):
+        """Day x Type amount sums, indexed by a DatetimeIndex of calendar days."""
+        return self._get('day', df, lambda d: self._cube(d, d['Date'].dt.normalize().rename('Day')))[0]
+
+    def yearly(self, df):
+        """Year x Type amount sums, indexed by calendar year."""
+        return self._get('year', df, lambda d: self._cube(d, d['Date'].dt.year.rename('Year')))[0]
+
+    def by_category(self, df):
+        """Category x Type (sums, row counts)."""
+        return self._get('category', df, lambda d: self._cube(d, 'Category'))
+
+    def month_category_spend(self, df, period):
+        """Expense sums by category for one monthly Period."""
+        spend = self._get('month_category', df, self._month_category)
+        if period not in spend.index.get_level_values(0):
+            return pd.Series(dtype='float64', name='Amount')
+        return spend.xs(period, level='Month')
+
+    def spend_matrix(self, df):
+        """Month x Category expense matrix behind the budget engine (see app_budgets)."""
+        return self._get('spend_matrix', df,
+                         lambda d: spend_matrix(self._get('month_category', d, self._month_category)))
+
+    def date_order(self, df):
+        """Row positions sorted newest-first, used to page through the transactions table."""
+        return self._get('date_order', df,
+                         lambda d: np.argsort(-d['Date'].to_numpy().astype('int64'), kind='stable'))
+
+    def latest_date(self, df):
+        """Most recent transaction date in the ledger (NaT when empty)."""
+        return self._get('latest', df, lambda d: d['Date'].max())
+
+    def recurring(self, df):
+        """Detected recurring charges (see app_recurring), rebuilt lazily after edits."""
+        return self._get('recurring', df, detect_recurring)
+
+    def duplicates(self, df, found=None):
+        """Likely duplicate rows (see app_dedupe), flagged at load and rebuilt lazily after edits.
+
+        found, when given, is a result already computed for df on a worker.
+        """
+        if found is not None:
+            self._cubes['duplicates'] = found
+        return self._get('duplicates', df, find_duplicates)
+
+    def accumulate(self, chunk, sign=1):
+        """Merges the cubes of a freshly parsed chunk (streamed in or appended) into the cache.
+
+        sign=-1 takes the cubes of rows removed from the ledger back out.
+        """
+        track_latest = sign > 0 and ('latest' in self._cubes or not self._cubes)  # popped after a removal
+        if sign < 0:
+            self._cubes.pop('latest', None)
+        parts = {
+            'month': self._cube(chunk, chunk['Date'].dt.to_period('M').rename('Month')),
+            'year': self._cube(chunk, chunk['Date'].dt.year.rename('Year')),
+            'day': self._cube(chunk, chunk['Date'].dt.normalize().rename('Day')),
+            'category': self._cube(chunk, 'Category'),
+        }
+        for name, (sums, counts) in parts.items():
+            sums, counts = sums * sign, counts * sign
+            if name in self._cubes:
+                old_sums, old_counts = self._cubes[name]
+                sums = old_sums.add(sums, fill_value=0)
+                counts = old_counts.add(counts, fill_value=0).astype('int64')
+            self._cubes[name] = (sums, counts)
+
+        spend = self._month_category(chunk) * sign
+        if 'month_category' in self._cubes:
+            spend = self._cubes['month_category'].add(spend, fill_value=0).sort_index()
+        self._cubes['month_category'] = spend
+        self._cubes.pop('spend_matrix', None)
+
+        if track_latest:
+            latest = chunk['Date'].max()
+            if 'latest' in self._cubes and not pd.isna(self._cubes['latest']):
+                latest = max(self._cubes['latest'], latest) if not pd.isna(latest) else self._cubes['latest']
+            self._cubes['latest'] = latest
+        self._cubes.pop('date_order', None)
+        self._cubes.pop('recurring', None)
+        self._cubes.pop('duplicates', None)
+        self.version += 1
+
+    def warm(self, df):
+        """Builds every cube up front; run on a worker right after a ledger loads."""
+        self.monthly(df)
+        self.yearly(df)
+        self.daily(df)
+        self.by_category(df)
+        self._get('month_category', df, self._month_category)
+        self.date_order(df)
+        self.latest_date(df)
+        return self
+
+    # --- Derived Lookups ---
+    def totals(self, df):
+        """(income, expenses) over the whole ledger."""
+        sums, _ = self.by_category(df)
+        income = sums['Income'].sum() if 'Income' in sums.columns else 0.0
+        expenses = sums['Expense'].sum() if 'Expense' in sums.columns else 0.0
+        return income, expenses
+
+    def expense_by_category(self, df):
+        """Expense sums for every category that has at least one expense."""
+        sums, counts = self.by_category(df)
+        if 'Expense' not in sums.columns:
+            return pd.Series(dtype='float64', name='Amount')
+        return sums['Expense'][counts['Expense'] > 0].rename('Amount')
+
+    # --- Incremental Maintenance ---
+    @staticmethod
+    def _bump(cube, key, column, amount, sign):
+        """Adds one record to a (sums, counts) cube, growing it if the key is new."""
+        sums, counts = cube
+        if column not in sums.columns:
+            sums[column] = 0.0
+            counts[column] = 0
+        if key not in sums.index:
+            sums.loc[key] = 0.0
+            counts.loc[key] = 0
+            sums, counts = sums.sort_index(), counts.sort_index()
+        sums.loc[key, column] += amount
+        counts.loc[key, column] += sign
+        return sums, counts
+
+    def apply(self, records, sign=1):
+        """Folds added (sign=1) or removed (sign=-1) records into the cached cubes in place.
+
+        Records must already be normalized (rows taken from the typed store). An edit
+        is a removal of the old row followed by an addition of the new one.
+        """
+        for rec in records:
+            date = pd.Timestamp(rec['Date'])
+            column = str(rec['Type'])
+            category = str(rec['Category'])
+            amount = sign * float(rec['Amount'])
+
+            keys = {'month': date.to_period('M'), 'year': date.year, 'category': category,
+                    'day': date.normalize()}
+            for name, key in keys.items():
+                if name in self._cubes:
+                    self._cubes[name] = self._bump(self._cubes[name], key, column, amount, sign)
+
+            if column == 'Expense':
+                self._cubes.pop('spend_matrix', None)  # re-derived from month_category
+            if column == 'Expense' and 'month_category' in self._cubes:
+                spend = self._cubes['month_category']
+                key = (date.to_period('M'), category)
+                if key in spend.index:
+                    spend.loc[key] += amount
+                else:
+                    spend.loc[key] = amount
+                    self._cubes['month_category'] = spend.sort_index()
+
+            self._cubes.pop('date_order', None)  # re-sorted lazily by the table view
+            self._cubes.pop('recurring', None)   # periodicity needs the whole merchant history
+            self._cubes.pop('duplicates', None)  # a new row may repeat an existing one
+            if 'latest' in self._cubes:
+                if sign > 0:
+                    latest = self._cubes['latest']
+                    self._cubes['latest'] = date if pd.isna(latest) else max(latest, date)
+                else:
+                    self._cubes.pop('latest')  # a removed maximum can't be undone in O(1)
+        self.version += 1
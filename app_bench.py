@@ -0,0 +1,237 @@
+"""Benchmarks ingestion, per-view data preparation and headless chart rendering.
+
+    python app_bench.py                          # 10k / 100k / 1M / 10M rows
+    python app_bench.py --rows 10000 100000 --repeat 5 --out bench_output.txt
+
+Ledgers come from a deterministic synthetic generator (same seed, same ledger), so
+results are comparable between versions. Results are written as JSON lines: one
+"meta" line describing the run, then one line per (rows, stage) measurement.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from app_aggregates import AggregateCache
+from app_budgets import evaluate_budgets
+from app_charts import style_figure
+from app_lod import choose_resolution, resample
+from app_loader import load_ledger
+from app_report import REPORT_VIEWS
+from app_search import SearchIndex
+from app_snapshot import snapshot_paths
+
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000, 10_000_000]
+
+_CATEGORY_WORDS = ['Food', 'Shopping', 'Transport', 'Entertainment', 'Rent', 'Utilities',
+                   'Health', 'Travel', 'Education', 'Gifts', 'Insurance', 'Fees']
+_MERCHANT_WORDS = ['fresh', 'city', 'metro', 'prime', 'star', 'corner', 'global', 'smart',
+                   'green', 'royal', 'quick', 'urban', 'sun', 'blue', 'daily', 'north']
+_SUBSCRIPTIONS = [('Netflix', 'Entertainment', 649.0), ('Spotify', 'Entertainment', 119.0),
+                  ('Gym Membership', 'Health', 1500.0), ('Cloud Storage', 'Utilities', 130.0)]
+
+
+# --- 🧪 Synthetic Ledger Generator 🧪 ---
+def generate_ledger(rows, categories=12, days=1095, merchants=500, entropy=0.3, seed=0,
+                    start='2022-01-01'):
+    """Deterministic raw ledger frame (Date, Category, Description, Type, Amount).
+
+    categories: distinct expense categories. days: date span. merchants: distinct
+    merchant names. entropy: share of descriptions carrying a unique reference
+    number (0 = only merchant names, 1 = nearly every description is distinct).
+    A few monthly subscriptions and a monthly salary are mixed in.
+    """
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp(start)
+    category_names = np.array([_CATEGORY_WORDS[i % len(_CATEGORY_WORDS)] +
+                               ('' if i < len(_CATEGORY_WORDS) else f' {i // len(_CATEGORY_WORDS) + 1}')
+                               for i in range(categories)], dtype=object)
+    words = np.array(_MERCHANT_WORDS, dtype=object)
+    merchant_names = np.array([f'{words[i % 16].title()} {words[(i // 16) % 16]} {i}'
+                               for i in range(merchants)], dtype=object)
+    merchant_category = rng.integers(0, categories, merchants)
+
+    # Recurring rows: one salary and a few subscriptions per month of the span.
+    months = pd.date_range(start, start + pd.Timedelta(days=days - 1), freq='MS')
+    fixed = [(months, 'Salary', 'Employer payroll', 'Income', 75000.0)]
+    fixed += [(months + pd.Timedelta(days=4 + i), category, name, 'Expense', amount)
+              for i, (name, category, amount) in enumerate(_SUBSCRIPTIONS)]
+    fixed_rows = sum(len(dates) for dates, *_ in fixed)
+    n = max(rows - fixed_rows, 0)
+
+    merchant = rng.integers(0, merchants, n)
+    description = pd.Series(merchant_names[merchant], dtype='string')
+    unique = rng.random(n) < entropy
+    refs = pd.Series(rng.integers(100_000, 1_000_000_000, int(unique.sum())).astype(str), dtype='string')
+    description[unique] = description[unique].to_numpy() + ' #' + refs.to_numpy()
+
+    random = pd.DataFrame({
+        'Date': start + pd.to_timedelta(rng.integers(0, days, n), unit='D'),
+        'Category': category_names[merchant_category[merchant]],
+        'Description': description.to_numpy(dtype=object),
+        'Type': np.where(rng.random(n) < 0.05, 'Income', 'Expense'),
+        'Amount': np.round(rng.lognormal(6, 1, n), 2),
+    })
+    recurring = pd.DataFrame({
+        'Date': np.concatenate([dates.to_numpy() for dates, *_ in fixed]),
+        'Category': np.concatenate([[c] * len(d) for d, c, *_ in fixed]),
+        'Description': np.concatenate([[s] * len(d) for d, _, s, *_ in fixed]),
+        'Type': np.concatenate([[t] * len(d) for d, _, _, t, _ in fixed]),
+        'Amount': np.concatenate([[a] * len(d) for d, *_, a in fixed]),
+    })
+    ledger = pd.concat([random, recurring], ignore_index=True).iloc[:rows]
+    return ledger.sort_values('Date', kind='stable', ignore_index=True)
+
+
+def ledger_file(folder, rows, **options):
+    """CSV for the given generator settings, generated once and reused across runs."""
+    tag = '_'.join(f'{k}{v}' for k, v in sorted(options.items()))
+    path = os.path.join(folder, f'bench_{rows}_{tag}.csv')
+    if not os.path.exists(path):
+        generate_ledger(rows, **options).to_csv(path + '.tmp', index=False, date_format='%Y-%m-%d')
+        os.replace(path + '.tmp', path)
+    return path
+
+
+def _drop_snapshot(path):
+    for sidecar in snapshot_paths(path):
+        if os.path.exists(sidecar):
+            os.remove(sidecar)
+
+
+# --- ⏱️ Stages ⏱️ ---
+def _timed(fn, repeat):
+    """Best wall time of fn() over repeat runs, and the last result."""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _trend_buckets(agg, df):
+    daily = agg.daily(df)
+    if daily.empty:
+        return daily
+    _, rule, _ = choose_resolution(daily.index[0], daily.index[-1])
+    return resample(daily, rule)
+
+
+def _transactions_page(agg, df):
+    order = agg.date_order(df)
+    index = SearchIndex(df)
+    matches = index.search('fresh')
+    return df.iloc[order[:50]], matches
+
+
+def _budgets(agg, df):
+    latest = agg.latest_date(df)
+    budgets = {category: 10_000.0 for category in df['Category'].cat.categories[:8]}
+    return evaluate_budgets(agg.spend_matrix(df), budgets, latest.to_period('M'), as_of=latest)
+
+
+VIEW_PREP = [
+    ('overview', lambda agg, df: (agg.totals(df), agg.expense_by_category(df))),
+    ('category_pie', lambda agg, df: agg.expense_by_category(df).sort_values(ascending=False)),
+    ('income_expense', _trend_buckets),
+    ('monthly_trends', _trend_buckets),
+    ('yearly_summary', lambda agg, df: agg.yearly(df)),
+    ('all_transactions', _transactions_page),
+    ('subscriptions', lambda agg, df: agg.recurring(df)),
+    ('budgets', _budgets),
+]
+
+
+def bench_rows(path, rows, repeat=3, render=True):
+    """Yields (stage, seconds) for one ledger file."""
+    def ingest():
+        _drop_snapshot(path)
+        return load_ledger(path)
+
+    seconds, (df, agg, _) = _timed(ingest, 1)
+    yield 'ingest', seconds
+    seconds, _ = _timed(lambda: load_ledger(path), repeat)
+    yield 'reopen_snapshot', seconds
+    seconds, _ = _timed(lambda: AggregateCache().warm(df), repeat)
+    yield 'aggregates_warm', seconds
+
+    # Cold: a fresh cache per run, so each view pays for the cubes it needs.
+    for name, prepare in VIEW_PREP:
+        seconds, _ = _timed(lambda: prepare(AggregateCache(), df), repeat)
+        yield f'prep:{name}', seconds
+
+    if render:
+        for name, chart_type, select in REPORT_VIEWS:
+            data = select(agg, df)
+
+            def draw():
+                chart = chart_type(style_figure)
+                canvas = FigureCanvasAgg(chart.figure)
+                chart.render(data)
+                canvas.draw()
+            seconds, _ = _timed(draw, repeat)
+            yield f'render:{name}', seconds
+
+
+def _meta(args):
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                  text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        revision = ''
+    return {'type': 'meta', 'time': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'revision': revision, 'python': platform.python_version(), 'numpy': np.__version__,
+            'pandas': pd.__version__, 'matplotlib': matplotlib.__version__,
+            'machine': platform.machine(), 'cpus': os.cpu_count(),
+            'generator': {'categories': args.categories, 'days': args.days,
+                          'merchants': args.merchants, 'entropy': args.entropy, 'seed': args.seed},
+            'repeat': args.repeat}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard on synthetic ledgers.")
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS)
+    parser.add_argument('--categories', type=int, default=12)
+    parser.add_argument('--days', type=int, default=1095, help="date span in days")
+    parser.add_argument('--merchants', type=int, default=500)
+    parser.add_argument('--entropy', type=float, default=0.3, help="share of unique descriptions")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help="runs per stage (best is kept)")
+    parser.add_argument('--no-render', action='store_true', help="skip chart rendering")
+    parser.add_argument('--workdir', default=os.path.join(tempfile.gettempdir(), 'dashboard-bench'),
+                        help="where generated ledgers are cached")
+    parser.add_argument('--out', default='bench_output.txt', help="JSON-lines results file")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.workdir, exist_ok=True)
+    options = {'categories': args.categories, 'days': args.days, 'merchants': args.merchants,
+               'entropy': args.entropy, 'seed': args.seed}
+    with open(args.out, 'w', encoding='utf-8') as out:
+        out.write(json.dumps(_meta(args)) + '\n')
+        for rows in args.rows:
+            print(f"--- {rows:,} rows ---", flush=True)
+            path = ledger_file(args.workdir, rows, **options)
+            for stage, seconds in bench_rows(path, rows, args.repeat, render=not args.no_render):
+                print(f"{stage:<24}{seconds * 1000:>12.1f} ms", flush=True)
+                out.write(json.dumps({'type': 'result', 'rows': rows, 'stage': stage,
+                                      'seconds': round(seconds, 6)}) + '\n')
+                out.flush()
+    print(f"Results written to {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+# --- 💰 Budget Engine 💰 ---
+# Budgets are evaluated against a (Month x Category) expense matrix derived from the
+# incrementally maintained month_category cube, so checking every budget for any
+# month is one row lookup and a vector divide, and budget-vs-actual history over all
+# months is one frame divide. For the month that contains the latest transaction the
+# month-to-date spend is also extrapolated at its daily run-rate to flag categories
+# that are still under budget but on track to overshoot.
+
+STATUS_OVER = 'over'
+STATUS_AT_RISK = 'at risk'
+STATUS_OK = 'ok'
+
+
+def spend_matrix(month_category):
+    """Month x Category expense matrix (zeros where nothing was spent)."""
+    if month_category.empty:
+        return pd.DataFrame(index=pd.PeriodIndex([], freq='M', name='Month'), dtype='float64')
+    return month_category.unstack('Category', fill_value=0.0).sort_index()
+
+
+def _budget_vector(budgets):
+    return pd.Series(budgets, dtype='float64').rename_axis('Category')
+
+
+def evaluate_budgets(matrix, budgets, month, as_of=None):
+    """Spend, share of budget and month-end projection of every budget for one month.
+
+    as_of is the latest transaction date; when it falls inside month the projection
+    uses the month-to-date run-rate, otherwise the month is complete and the
+    projection is the actual spend.
+    """
+    limits = _budget_vector(budgets)
+    if month in matrix.index:
+        spent = matrix.loc[month].reindex(limits.index, fill_value=0.0)
+    else:
+        spent = pd.Series(0.0, index=limits.index)
+
+    projected = spent.copy()
+    if as_of is not None and not pd.isna(as_of) and pd.Timestamp(as_of).to_period('M') == month:
+        elapsed = pd.Timestamp(as_of).day
+        projected = spent * (month.days_in_month / elapsed)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percent = np.where(limits > 0, spent / limits * 100, 0.0)
+    status = np.where(spent > limits, STATUS_OVER,
+                      np.where(projected > limits, STATUS_AT_RISK, STATUS_OK))
+    return pd.DataFrame({'Budget': limits, 'Spent': spent, 'Percent': percent,
+                         'Projected': projected, 'Status': status})
+
+
+def budget_history(matrix, budgets):
+    """Month x Category actual spend as a share of budget (1.0 = exactly on budget)."""
+    limits = _budget_vector(budgets)
+    actual = matrix.reindex(columns=limits.index, fill_value=0.0)
+    return actual.div(limits.where(limits > 0))
+
+
+def history_summary(matrix, budgets):
+    """Per budget: months over budget, months with data and the average share of budget."""
+    history = budget_history(matrix, budgets)
+    return pd.DataFrame({'Over': (history > 1).sum(),
+                         'Months': history.notna().sum(),
+                         'Average': history.mean()})
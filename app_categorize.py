@@ -0,0 +1,277 @@
+import hashlib
+import json
+import os
+import re
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from app_store import native_amounts, refresh_lower_columns
+
+# --- 🏷️ Rule-Based Auto-Categorization 🏷️ ---
+# User rules map a Description (merchant substring or regex) and/or an Amount range
+# (in the row's own currency) to a Category. Rows are categorized as they are ingested: parsed chunks, replayed
+# journal records, added transactions and rows appended to a watched file. Only
+# 'Uncategorized' rows (blank Category) are filled unless a rule says override.
+#
+# Every substring rule is compiled into one Aho-Corasick automaton, so a description
+# is scanned once for all of them. Matching runs over the unique descriptions (the
+# categories of the Description column), never the rows, and the matched rule ids
+# per description are cached across chunks. Amount ranges are then resolved with a
+# few vectorized passes over the rows. The first matching rule (in list order) wins.
+
+RULES_PATH = os.environ.get('DASHBOARD_RULES',
+                            os.path.join(os.path.expanduser('~'), '.budget_dashboard', 'rules.json'))
+UNCATEGORIZED = 'Uncategorized'
+MAX_CACHED = 1_000_000
+
+
+class Rule:
+    def __init__(self, category, contains=None, regex=None, min_amount=None, max_amount=None,
+                 override=False):
+        self.category = category
+        self.contains = contains.lower() if contains else None
+        self.regex = regex or None
+        self.min_amount = min_amount
+        self.max_amount = max_amount
+        self.override = override
+        if self.regex:
+            re.compile(self.regex)  # reject a bad pattern when the rule is created
+
+    @property
+    def has_amount(self):
+        return self.min_amount is not None or self.max_amount is not None
+
+    def describe(self):
+        """Human-readable condition, e.g. "contains 'uber' · amount 0–500"."""
+        parts = []
+        if self.contains:
+            parts.append(f"contains '{self.contains}'")
+        if self.regex:
+            parts.append(f"matches /{self.regex}/")
+        if self.has_amount:
+            low = '' if self.min_amount is None else f"{self.min_amount:g}"
+            high = '' if self.max_amount is None else f"{self.max_amount:g}"
+            parts.append(f"amount {low}–{high}")
+        return ' · '.join(parts) or 'every transaction'
+
+    def to_dict(self):
+        return {key: value for key, value in vars(self).items() if value is not None and value is not False}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+class _AhoCorasick:
+    """Multi-pattern substring matcher: one pass over the text finds every pattern."""
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [()]
+        for pattern_id, pattern in patterns:
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(())
+                state = nxt
+            self.out[state] += (pattern_id,)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] += self.out[self.fail[nxt]]
+
+    def matches(self, text):
+        """Set of pattern ids occurring in text."""
+        goto, fail, out = self.goto, self.fail, self.out
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+class Categorizer:
+    def __init__(self, rules=()):
+        self.rules = list(rules)
+        self.categories = [rule.category for rule in self.rules]
+        self._automaton = _AhoCorasick([(i, r.contains) for i, r in enumerate(self.rules) if r.contains])
+        self._regexes = {i: re.compile(r.regex, re.IGNORECASE) for i, r in enumerate(self.rules) if r.regex}
+        self._regex_only = [i for i in self._regexes if not self.rules[i].contains]
+        self._any_text = [i for i, r in enumerate(self.rules) if not r.contains and not r.regex]
+        self._cache = {}    # lower-cased description -> sorted matching rule ids
+        # One C-level pass over the literal substrings; only descriptions it lets
+        # through run the automaton. Regex-only rules are tested with their own
+        # patterns (joining them would break inline flags and backreferences).
+        literals = [re.escape(r.contains) for r in self.rules if r.contains]
+        try:
+            self._gate = re.compile('|'.join(literals), re.IGNORECASE) if literals else None
+        except re.error:
+            self._gate = None  # e.g. too many patterns; fall back to matching each rule
+
+    @property
+    def fingerprint(self):
+        """Digest of the rule list; snapshots parsed under other rules are not reused."""
+        text = json.dumps([rule.to_dict() for rule in self.rules], sort_keys=True)
+        return hashlib.blake2b(text.encode(), digest_size=12).hexdigest()
+
+    def _text_matches(self, description):
+        """Sorted ids of the rules whose substring/regex condition holds (cached per description)."""
+        ids = self._cache.get(description)
+        if ids is None:
+            # A rule with both a substring and a regex needs both.
+            found = [i for i in self._automaton.matches(description)
+                     if i not in self._regexes or self._regexes[i].search(description)]
+            found += [i for i in self._regex_only if self._regexes[i].search(description)]
+            ids = tuple(sorted(found + self._any_text))
+            self._cache[description] = ids
+        return ids
+
+    def _matches_many(self, descriptions):
+        """Matching rule ids for each lower-cased description, filling the cache."""
+        cache = self._cache
+        if len(cache) + len(descriptions) > MAX_CACHED:
+            cache.clear()
+        if self._gate is not None:
+            search, no_text = self._gate.search, tuple(self._any_text)
+            regexes = [self._regexes[i] for i in self._regex_only]
+            for d in descriptions:
+                if d not in cache and search(d) is None and not any(r.search(d) for r in regexes):
+                    cache[d] = no_text
+        return [cache[d] if d in cache else self._text_matches(d) for d in descriptions]
+
+    def match(self, descriptions, amounts, current):
+        """Per-row index of the winning rule (len(rules) where none applies).
+
+        descriptions: categorical Description column; amounts: float array;
+        current: categorical of existing categories (only 'Uncategorized' rows are
+        filled by rules without override).
+        """
+        n_rules = len(self.rules)
+        uniques = descriptions.categories.astype(str).str.lower().tolist()
+        matched = self._matches_many(uniques)
+
+        # Best amount-free rule per unique description (overall and among override rules);
+        # the extra last slot stands for a missing description.
+        plain = np.full(len(uniques) + 1, n_rules, dtype='int64')
+        plain_override = plain.copy()
+        amount_hits = {i: [] for i, rule in enumerate(self.rules) if rule.has_amount}
+        for k, ids in enumerate(matched):
+            if not ids:
+                continue
+            for i in ids:
+                rule = self.rules[i]
+                if rule.has_amount:
+                    amount_hits[i].append(k)
+                else:
+                    plain[k] = min(plain[k], i)
+                    if rule.override:
+                        plain_override[k] = min(plain_override[k], i)
+
+        codes = np.asarray(descriptions.codes, dtype='int64')
+        codes = np.where(codes < 0, len(uniques), codes)
+        blank = np.asarray(current == UNCATEGORIZED)
+        best = np.where(blank, plain[codes], plain_override[codes])
+
+        for i, hits in amount_hits.items():
+            if not hits:
+                continue
+            rule = self.rules[i]
+            text = np.zeros(len(uniques) + 1, dtype=bool)
+            text[hits] = True
+            mask = text[codes] & (best > i)
+            if rule.min_amount is not None:
+                mask &= amounts >= rule.min_amount
+            if rule.max_amount is not None:
+                mask &= amounts <= rule.max_amount
+            if not rule.override:
+                mask &= blank
+            best[mask] = i
+        return best
+
+    def apply(self, df):
+        """Returns df with rule categories filled in (df itself when nothing changes).
+
+        Works on typed chunks straight from the parser as well as on the full store.
+        """
+        if not self.rules or not len(df):
+            return df
+        best = self.match(df['Description'].array, native_amounts(df).to_numpy(), df['Category'].array)
+        hit = best < len(self.rules)
+        if not hit.any():
+            return df
+
+        category = df['Category'].array
+        missing = [c for c in dict.fromkeys(self.categories) if c not in category.categories]
+        if missing:
+            category = category.add_categories(missing)
+        lookup = {name: code for code, name in enumerate(category.categories)}
+        rule_codes = np.array([lookup[c] for c in self.categories], dtype=category.codes.dtype)
+        codes = category.codes.copy()
+        codes[hit] = rule_codes[best[hit]]
+        if np.array_equal(codes, category.codes):
+            return df
+        df = df.copy()
+        df['Category'] = pd.Categorical.from_codes(codes, dtype=category.dtype) \
+            .remove_unused_categories()
+        return refresh_lower_columns(df) if '_category_lower' in df.columns else df
+
+    def category_for(self, description, amount):
+        """Rule category for one new transaction with a blank Category (None if no rule applies)."""
+        ids = self._text_matches((description or '').lower())
+        for i in ids:
+            rule = self.rules[i]
+            if (rule.min_amount is None or amount >= rule.min_amount) and \
+                    (rule.max_amount is None or amount <= rule.max_amount):
+                return rule.category
+        return None
+
+
+def load_rules(path=RULES_PATH):
+    """The saved rule list ([] when none was saved yet)."""
+    try:
+        with open(path, encoding='utf-8') as fh:
+            return [Rule.from_dict(data) for data in json.load(fh)]
+    except (OSError, ValueError, TypeError):
+        return []
+
+
+def save_rules(rules, path=RULES_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump([rule.to_dict() for rule in rules], fh, indent=2)
+    os.replace(tmp, path)
+
+
+_active = None
+
+
+def active_categorizer():
+    """The Categorizer for the saved rules, rebuilt when the rules file changes."""
+    global _active
+    try:
+        stamp = os.stat(RULES_PATH).st_mtime_ns
+    except OSError:
+        stamp = None
+    if _active is None or _active[0] != stamp:
+        _active = (stamp, Categorizer(load_rules()))
+    return _active[1]
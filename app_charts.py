@@ -0,0 +1,344 @@
+import numpy as np
+import pandas as pd
+import matplotlib
+import matplotlib.dates as mdates
+from matplotlib.figure import Figure
+
+from app_currency import display_currency, money, symbol
+from app_lod import choose_resolution, downsample, resample
+from app_theme import (COLOR_BG, COLOR_BORDER, COLOR_CARD, COLOR_CONTENT_BG, COLOR_GREEN, COLOR_RED,
+                       COLOR_TEXT, COLOR_TEXT_SUBTLE)
+
+# --- 📊 Chart Builders 📊 ---
+# Each dashboard chart owns one Figure for its whole lifetime. render(data) draws it
+# from scratch the first time and whenever the shape of the data changes (new month,
+# new category); otherwise only the artist data is updated in place (bar heights,
+# line ydata, wedge angles), which skips the axes rebuild and tick layout.
+# The builders only need Matplotlib, so they work on any backend (Tk or Agg).
+
+
+def style_figure(fig, ax):
+    """Dark dashboard look for figures rendered outside the Tk window."""
+    fig.patch.set_facecolor(COLOR_CONTENT_BG)
+    ax.set_facecolor(COLOR_CARD)
+    ax.title.set_color(COLOR_TEXT)
+    ax.xaxis.label.set_color(COLOR_TEXT)
+    ax.yaxis.label.set_color(COLOR_TEXT)
+    ax.tick_params(colors=COLOR_TEXT_SUBTLE)
+    for spine in ax.spines.values():
+        spine.set_color(COLOR_BORDER)
+    legend = ax.get_legend()
+    if legend is not None:
+        legend.get_frame().set_facecolor(COLOR_CARD)
+        legend.get_frame().set_edgecolor(COLOR_BORDER)
+        for text in legend.get_texts():
+            text.set_color(COLOR_TEXT)
+
+
+class Chart:
+    figsize = (12, 7)
+
+    def __init__(self, style_fig):
+        self.figure = Figure(figsize=self.figsize, dpi=100)
+        self.ax = self.figure.add_subplot(111)
+        self.style_fig = style_fig
+        self.key = None
+
+    def render(self, data):
+        """Draws data, updating the existing artists when the data has the same shape
+        (and currency, which the labels show)."""
+        key = (display_currency(), self.shape(data))
+        if key == self.key and self.update(data):
+            return
+        self.ax.clear()
+        self.draw(data)
+        self.style_fig(self.figure, self.ax)
+        self.key = key
+
+    def shape(self, data):
+        return tuple(data.index)
+
+    def update(self, data):
+        return False
+
+    def attach(self, canvas):
+        """Hook for charts that react to canvas events (e.g. zoom)."""
+
+    def reset_view(self):
+        """Forgets any interactive view state before rendering an unrelated ledger."""
+
+    def draw_empty(self, message):
+        self.ax.text(0.5, 0.5, message, horizontalalignment='center', verticalalignment='center',
+                     transform=self.ax.transAxes, color=COLOR_TEXT_SUBTLE, fontsize=15)
+
+
+# --- Pies ---
+class _Pie(Chart):
+    cmap = matplotlib.colormaps['Pastel2']
+    legend_fontsize = 9
+
+    def legend_labels(self, data):
+        return list(data.index)
+
+    def draw(self, data):
+        self.wedges, self.autotexts = [], []
+        if not data.empty:
+            colors = self.cmap(np.linspace(0, 1, len(data)))
+            self.wedges, texts, self.autotexts = self.ax.pie(
+                data.values,
+                autopct='%1.1f%%',
+                startangle=90,
+                colors=colors,
+                pctdistance=0.85,
+                wedgeprops={'edgecolor': COLOR_TEXT, 'linewidth': 1}
+            )
+            for autotext in self.autotexts:
+                autotext.set_color(COLOR_BG)
+                autotext.set_fontweight('bold')
+            self.legend = self.ax.legend(self.legend_labels(data), loc='center left',
+                                         bbox_to_anchor=(1, 0, 0.5, 1), fontsize=self.legend_fontsize)
+        else:
+            self.draw_empty("No Expense Data")
+        self.draw_title()
+
+    def update(self, data):
+        if data.empty:
+            return True
+        fractions = data.values / data.values.sum()
+        theta = 90.0
+        for wedge, autotext, frac in zip(self.wedges, self.autotexts, fractions):
+            theta2 = theta + 360.0 * frac
+            wedge.set_theta1(theta)
+            wedge.set_theta2(theta2)
+            middle = np.deg2rad((theta + theta2) / 2)
+            autotext.set_position((0.85 * np.cos(middle), 0.85 * np.sin(middle)))
+            autotext.set_text('%1.1f%%' % (frac * 100))
+            theta = theta2
+        for text, label in zip(self.legend.get_texts(), self.legend_labels(data)):
+            text.set_text(label)
+        return True
+
+
+class OverviewPie(_Pie):
+    figsize = (10, 6)
+
+    def draw_title(self):
+        self.ax.set_title('Spending by Category')
+
+
+class CategoryPie(_Pie):
+    figsize = (12, 8)
+    cmap = matplotlib.colormaps['Set3']
+    legend_fontsize = 10
+
+    def legend_labels(self, data):
+        return [f'{cat}: {money(amt)}' for cat, amt in data.items()]
+
+    def draw_title(self):
+        self.ax.set_title('Spending Breakdown by Category', fontsize=18, fontweight='bold')
+
+
+# --- Bars & Lines ---
+class TotalsBars(Chart):
+    """Income vs Expenses totals; data is an (income, expenses) pair."""
+    figsize = (10, 6)
+
+    def shape(self, data):
+        return 'totals'
+
+    def draw(self, data):
+        self.bars = self.ax.bar(['Income', 'Expenses'], list(data), color=[COLOR_GREEN, COLOR_RED])
+        self.labels = []
+        for bar in self.bars:
+            height = bar.get_height()
+            self.labels.append(self.ax.text(bar.get_x() + bar.get_width()/2., height,
+                                            money(height, 0),
+                                            ha='center', va='bottom', color=COLOR_TEXT, fontweight='bold'))
+        self.ax.set_title('Total Income vs Expenses')
+        self.ax.set_ylabel(f'Amount ({symbol().strip()})')
+
+    def update(self, data):
+        for bar, label, height in zip(self.bars, self.labels, data):
+            bar.set_height(height)
+            label.set_y(height)
+            label.set_text(money(height, 0))
+        self.ax.relim()
+        self.ax.autoscale_view()
+        return True
+
+
+class YearlyBars(Chart):
+    """Income/Expense bar pairs per year of a (Year x Type) summary frame."""
+
+    def shape(self, data):
+        return (tuple(data.index), tuple(data.columns))
+
+    def draw(self, data):
+        self.containers = {}
+        if not data.empty:
+            x = np.arange(len(data))
+            width = 0.35
+            if 'Income' in data.columns:
+                self.containers['Income'] = self.ax.bar(x - width/2, data['Income'],
+                                                        width, label='Income', color=COLOR_GREEN)
+            if 'Expense' in data.columns:
+                self.containers['Expense'] = self.ax.bar(x + width/2, data['Expense'],
+                                                         width, label='Expenses', color=COLOR_RED)
+            self.ax.set_xticks(x)
+            self.ax.set_xticklabels(data.index)
+            self.ax.legend()
+        else:
+            self.draw_empty("No Data to Display")
+        self.ax.set_title('Yearly Income vs Expenses', fontsize=18)
+        self.ax.set_xlabel('Year')
+        self.ax.set_ylabel(f'Amount ({symbol().strip()})')
+
+    def update(self, data):
+        for column, bars in self.containers.items():
+            for bar, height in zip(bars, data[column]):
+                bar.set_height(height)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        return True
+
+
+# --- Level-of-Detail Time Series ---
+class _TimeSeriesChart(Chart):
+    """Income/Expense on a real datetime axis, re-aggregated for the visible range.
+
+    render() takes the Day x Type cube; the resolution (see app_lod) is picked from
+    the visible span. Scrolling over the chart zooms around the cursor and
+    re-aggregates on demand; a double-click resets to the full history.
+    """
+    allow_daily = False
+    zoom_step = 0.8
+    min_span_days = 14
+    hint = '  (scroll to zoom, double-click to reset)'
+
+    def __init__(self, style_fig):
+        super().__init__(style_fig)
+        self.daily = None
+        self.bounds = None
+        self.span = None
+
+    def reset_view(self):
+        self.span = None
+
+    def attach(self, canvas):
+        canvas.mpl_connect('scroll_event', self._on_scroll)
+        canvas.mpl_connect('button_press_event', self._on_press)
+
+    def render(self, data):
+        self.daily = data
+        if data.empty:
+            self.bounds = self.span = None
+        else:
+            self.bounds = (data.index[0], data.index[-1])
+            if self.span is not None:
+                lo, hi = max(self.span[0], self.bounds[0]), min(self.span[1], self.bounds[1])
+                self.span = (lo, hi) if lo < hi else None
+            if self.span is None:
+                self.span = self.bounds
+        self.render_span()
+
+    def render_span(self):
+        if self.span is None:
+            super().render(None)
+            return
+        name, rule, days = choose_resolution(*self.span, allow_daily=self.allow_daily)
+        super().render((resample(self.daily, rule, *self.span), name, rule, days))
+
+    def shape(self, data):
+        if data is None:
+            return None
+        buckets, name, rule, days = data
+        return (rule, tuple(buckets.index), tuple(buckets.columns))
+
+    def draw(self, data):
+        if data is None or data[0].empty:
+            self.draw_empty("No Data to Display")
+            self.ax.set_title(self.title_for('Monthly'), fontsize=18)
+            return
+        buckets, name, rule, days = data
+        self.draw_series(buckets, rule, days)
+        locator = mdates.AutoDateLocator(maxticks=12)
+        self.ax.xaxis.set_major_locator(locator)
+        self.ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+        self.ax.legend(fontsize=12)
+        self.ax.set_title(self.title_for(name), fontsize=18)
+        self.ax.set_xlabel('Date' + self.hint)
+        self.ax.set_ylabel(f'Amount ({symbol().strip()})')
+
+    # --- Zoom ---
+    def _on_scroll(self, event):
+        if self.span is None or event.inaxes is not self.ax or event.xdata is None:
+            return
+        center = pd.Timestamp(mdates.num2date(event.xdata)).tz_localize(None)
+        factor = self.zoom_step if event.button == 'up' else 1 / self.zoom_step
+        lo = center - (center - self.span[0]) * factor
+        hi = center + (self.span[1] - center) * factor
+        if hi - lo < pd.Timedelta(days=self.min_span_days):
+            return
+        self.span = (max(lo, self.bounds[0]), min(hi, self.bounds[1]))
+        self.render_span()
+        event.canvas.draw_idle()
+
+    def _on_press(self, event):
+        if event.dblclick and self.bounds is not None:
+            self.span = self.bounds
+            self.render_span()
+            event.canvas.draw_idle()
+
+
+class IncomeExpenseBars(_TimeSeriesChart):
+    def title_for(self, name):
+        return f'{name} Income vs Expenses'
+
+    def draw_series(self, buckets, rule, days):
+        x = mdates.date2num(buckets.index.to_pydatetime()) + days / 2
+        width = days * 0.35
+        self.containers = {}
+        if 'Income' in buckets.columns:
+            self.containers['Income'] = self.ax.bar(x - width/2, buckets['Income'],
+                                                    width, label='Income', color=COLOR_GREEN)
+        if 'Expense' in buckets.columns:
+            self.containers['Expense'] = self.ax.bar(x + width/2, buckets['Expense'],
+                                                     width, label='Expenses', color=COLOR_RED)
+
+    def update(self, data):
+        buckets = data[0]
+        for column, bars in self.containers.items():
+            for bar, height in zip(bars, buckets[column]):
+                bar.set_height(height)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        return True
+
+
+class MonthlyTrend(_TimeSeriesChart):
+    allow_daily = True
+
+    def title_for(self, name):
+        return f'{name} Financial Trends'
+
+    def draw_series(self, buckets, rule, days):
+        self.lines = {}
+        styles = {'Income': ('o', 'Income', COLOR_GREEN), 'Expense': ('s', 'Expenses', COLOR_RED)}
+        for column, (marker, label, color) in styles.items():
+            if column not in buckets.columns:
+                continue
+            series = downsample(buckets[column]) if rule == 'D' else buckets[column]
+            self.lines[column], = self.ax.plot(series.index, series.to_numpy(),
+                                               marker=marker, linewidth=3, label=label, color=color,
+                                               markersize=4 if rule == 'D' else 8)
+        self.ax.grid(True, alpha=0.3, color=COLOR_BORDER, linestyle='--')
+
+    def update(self, data):
+        buckets, name, rule, days = data
+        if rule == 'D':
+            return False  # LTTB may keep different points; redraw the downsampled lines
+        for column, line in self.lines.items():
+            line.set_ydata(buckets[column].to_numpy())
+        self.ax.relim()
+        self.ax.autoscale_view()
+        return True
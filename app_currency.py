@@ -0,0 +1,216 @@
+import os
+
+# --- 💱 Multi-Currency Amounts 💱 ---
+# Every row carries a Currency (BASE_CURRENCY when the file has no such column) and
+# the store keeps its Amount in that currency on disk. For display the whole ledger
+# is converted to one currency: daily rates come from a local CSV table (Date,
+# Currency, Rate = value of one unit in BASE_CURRENCY) and each row takes the latest
+# rate on or before its date. The as-of join runs once per distinct (day, currency)
+# pair with merge_asof and is mapped back to the rows with one take, so converting a
+# million rows is a handful of vectorized passes. The converted store keeps the
+# native amounts in _native_amount (written back on save), and each ledger caches its
+# amount-dependent state per display currency (DisplayConversions), so switching
+# back to a currency already shown is a column swap. pandas is imported on first
+# use, so the formatting helpers stay cheap for the startup modules.
+
+BASE_CURRENCY = os.environ.get('DASHBOARD_BASE_CURRENCY', 'INR').upper()
+RATES_PATH = os.environ.get('DASHBOARD_FX_RATES',
+                            os.path.join(os.path.expanduser('~'), '.budget_dashboard', 'fx_rates.csv'))
+SYMBOLS = {'INR': '₹', 'USD': '$', 'EUR': '€', 'GBP': '£', 'JPY': '¥'}
+
+_display = BASE_CURRENCY
+
+
+def display_currency():
+    """Currency the amounts on screen are in."""
+    return _display
+
+
+def set_display_currency(currency):
+    global _display
+    _display = currency.upper()
+
+
+def symbol(currency=None):
+    currency = currency or _display
+    return SYMBOLS.get(currency, f"{currency} ")
+
+
+def money(amount, decimals=2, currency=None):
+    """An amount formatted for display, e.g. ₹12,345.00 or CHF 12,345.00."""
+    return f"{symbol(currency)}{amount:,.{decimals}f}"
+
+
+class RateTable:
+    """Daily FX rates: Rate is the value of one unit of Currency in BASE_CURRENCY as of Date."""
+
+    def __init__(self, rates=None, path=RATES_PATH):
+        import pandas as pd
+
+        self.path = path
+        if rates is None:
+            rates = pd.DataFrame({'Date': pd.Series(dtype='datetime64[ns]'),
+                                  'Currency': pd.Series(dtype=object), 'Rate': pd.Series(dtype='float64')})
+        self.rates = rates
+
+    @classmethod
+    def load(cls, path=RATES_PATH):
+        """The saved table (empty when no rates were saved yet)."""
+        import pandas as pd
+
+        try:
+            return cls(cls._clean(pd.read_csv(path)), path)
+        except (OSError, ValueError):
+            return cls(path=path)
+
+    @staticmethod
+    def _clean(raw):
+        import pandas as pd
+
+        raw = raw.rename(columns=lambda c: str(c).strip().title())
+        missing = [c for c in ('Date', 'Currency', 'Rate') if c not in raw.columns]
+        if missing:
+            raise ValueError(f"Missing FX rate column(s): {', '.join(missing)}")
+        rates = pd.DataFrame({
+            'Date': pd.to_datetime(raw['Date'], errors='coerce').dt.normalize().astype('datetime64[ns]'),
+            'Currency': raw['Currency'].astype(str).str.strip().str.upper().to_numpy(dtype=object),
+            'Rate': pd.to_numeric(raw['Rate'], errors='coerce'),
+        })
+        rates = rates[rates['Date'].notna() & (rates['Rate'] > 0)]
+        return rates.drop_duplicates(['Date', 'Currency'], keep='last') \
+            .sort_values(['Date', 'Currency'], ignore_index=True)
+
+    @property
+    def currencies(self):
+        """Every currency the table can convert between (always includes BASE_CURRENCY)."""
+        return sorted(set(self.rates['Currency']) | {BASE_CURRENCY})
+
+    def merged(self, raw):
+        """A table with the rates in raw (a frame read from a CSV) added, newer quotes winning."""
+        import pandas as pd
+
+        return RateTable(self._clean(pd.concat([self.rates, self._clean(raw)], ignore_index=True)), self.path)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + '.tmp'
+        self.rates.to_csv(tmp, index=False, date_format='%Y-%m-%d')
+        os.replace(tmp, self.path)
+
+    def rates_on(self, dates, currencies):
+        """BASE_CURRENCY value of one unit of each currency as of each date (NaN if never quoted).
+
+        A date before a currency's first quote takes that first quote.
+        """
+        import numpy as np
+        import pandas as pd
+
+        query = pd.DataFrame({'Date': np.asarray(dates, dtype='datetime64[ns]'),
+                              'Currency': np.asarray(currencies, dtype=object),
+                              'Row': np.arange(len(dates))})
+        result = np.ones(len(query))
+        query = query[query['Currency'] != BASE_CURRENCY].sort_values('Date')
+        if not len(query):
+            return result
+        asof = pd.merge_asof(query, self.rates, on='Date', by='Currency', direction='backward')
+        early = asof['Rate'].isna().to_numpy()
+        if early.any():
+            ahead = pd.merge_asof(query[early], self.rates, on='Date', by='Currency', direction='forward')
+            asof.loc[early, 'Rate'] = ahead['Rate'].to_numpy()
+        result[asof['Row'].to_numpy()] = asof['Rate'].to_numpy()
+        return result
+
+    def factors(self, dates, currencies, target):
+        """Per-row multipliers taking amounts in currencies (a Categorical) to target.
+
+        Rates are looked up once per distinct (day, currency) pair.
+        """
+        import numpy as np
+
+        names = np.asarray(currencies.categories, dtype=object)
+        days = np.asarray(dates, dtype='datetime64[D]').astype('int64')
+        keys = days * len(names) + np.asarray(currencies.codes, dtype='int64')
+        unique, inverse = np.unique(keys, return_inverse=True)
+        unique_days = (unique // len(names)).astype('datetime64[D]')
+        unique_names = names[unique % len(names)]
+
+        factor = self.rates_on(unique_days, unique_names)
+        unknown = set(unique_names[np.isnan(factor)])
+        if target != BASE_CURRENCY:
+            target_rates = self.rates_on(unique_days, np.full(len(unique), target, dtype=object))
+            if np.isnan(target_rates).any():
+                unknown.add(target)
+            factor = factor / target_rates
+        if unknown:
+            raise ValueError(f"No FX rates for {', '.join(sorted(unknown))} in {self.path}")
+        return factor[inverse.ravel()]
+
+    def latest_factor(self, source, target):
+        """Multiplier from source to target at the most recent quotes."""
+        import pandas as pd
+
+        today = [pd.Timestamp.today().normalize()] * 2
+        from_rate, to_rate = self.rates_on(today, [source, target])
+        if pd.isna(from_rate) or pd.isna(to_rate):
+            raise ValueError(f"No FX rates for {source if pd.isna(from_rate) else target} in {self.path}")
+        return from_rate / to_rate
+
+
+_active = None
+
+
+def active_rates():
+    """The saved RateTable, re-read when the rates file changes."""
+    global _active
+    try:
+        stamp = os.stat(RATES_PATH).st_mtime_ns
+    except OSError:
+        stamp = None
+    if _active is None or _active[0] != stamp:
+        _active = (stamp, RateTable.load())
+    return _active[1]
+
+
+def convert(df, currency, rates=None):
+    """(store with Amount in currency, whether any Amount changed).
+
+    The native amounts are kept in _native_amount, so converting again (to any
+    currency) always starts from them.
+    """
+    import numpy as np
+
+    native = df['_native_amount'].to_numpy() if '_native_amount' in df.columns else df['Amount'].to_numpy()
+    currencies = df['Currency'].array
+    present = currencies.categories[np.unique(currencies.codes[currencies.codes >= 0])]
+    if all(code == currency for code in present):
+        amounts = native
+    else:
+        rates = rates if rates is not None else active_rates()
+        amounts = native * rates.factors(df['Date'].to_numpy(), currencies, currency)
+    changed = not np.array_equal(amounts, df['Amount'].to_numpy())
+    if not changed and '_native_amount' in df.columns:
+        return df, False
+    return df.assign(Amount=amounts, _native_amount=native), changed
+
+
+class DisplayConversions:
+    """One ledger's amount-dependent state per display currency.
+
+    currency is what the ledger's Amount column is in now. stash() remembers the
+    current (amounts, aggregates, filter index, top-N index) before switching away,
+    so switching back needs no conversion. Entries describe one version of the rows;
+    every edit calls clear().
+    """
+
+    def __init__(self, currency):
+        self.currency = currency
+        self._states = {}
+
+    def stash(self, *state):
+        self._states[self.currency] = state
+
+    def get(self, currency):
+        return self._states.get(currency)
+
+    def clear(self):
+        self._states.clear()
@@ -0,0 +1,184 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from app_store import native_amounts
+
+# --- 🧹 Duplicate Transaction Detection 🧹 ---
+# Re-importing overlapping bank exports repeats rows, which double-counts them in
+# every KPI. Two rows are likely duplicates when they have the same Type, Currency and
+# Amount (in that currency), fall within WINDOW_DAYS of each other and have similar
+# descriptions. Rather than comparing all pairs, rows are hashed into blocks by (Type,
+# Currency, Amount in cents) and ordered by day inside each block, so only neighbours
+# inside the date window are ever paired; the window slides instead of using fixed
+# buckets, so pairs straddling a bucket edge are not missed. Descriptions are
+# compared once per distinct pair of (normalized) categories with trigram Jaccard
+# similarity. Rows are then settled in date order: a row similar to an earlier
+# original inside the window is flagged against the earliest such original, and any
+# other row is an original itself. Flagged rows never act as originals, so a
+# recurring same-amount charge (a daily metro fare) can't chain into one group whose
+# original lies weeks away.
+#
+# Confirmed duplicates are removed from the store and saved to the journal as
+# content keys (the row's values plus which of the identical rows it was), so they
+# stay excluded when the unchanged source file is loaded again.
+
+WINDOW_DAYS = 3
+MIN_SIMILARITY = 0.6
+MAX_NEIGHBOURS = 64     # rows compared after each row inside a block (guards pathological blocks)
+
+DUPLICATE_COLUMNS = ['Row', 'Original', 'Date', 'Type', 'Amount', 'Category', 'Description',
+                     'Original Date', 'Original Description', 'Similarity']
+KEY_FIELDS = ['Date', 'Type', 'Amount', 'Description', 'Category', 'Currency']
+
+
+def _trigrams(text):
+    text = f"  {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def similarity(a, b):
+    """Trigram Jaccard similarity (0..1) of two normalized descriptions."""
+    if a == b:
+        return 1.0
+    left, right = _trigrams(a), _trigrams(b)
+    return len(left & right) / len(left | right)
+
+
+def _description_codes(descriptions):
+    """Row codes and texts of the normalized descriptions (blank ones share the last code)."""
+    values = descriptions.astype('category').array
+    names = pd.Series(values.categories.astype(str), dtype='string').str.lower() \
+        .str.replace(r'[^a-z0-9]+', ' ', regex=True).str.strip()
+    codes, texts = pd.factorize(names.to_numpy(dtype=object))
+    texts = np.append(np.asarray(texts, dtype=object), '')
+    codes = np.append(codes, len(texts) - 1)[np.asarray(values.codes, dtype='int64')]
+    return codes, texts
+
+
+def _candidate_pairs(days, blocks, window_days):
+    """(left, right) row indices of every same-block pair at most window_days apart."""
+    order = np.lexsort((days, blocks))
+    blocks, days = blocks[order], days[order]
+    left, right = [], []
+    # Inside a block rows are sorted by day: once no row has a partner k rows on
+    # within the window, no row has one further on either.
+    for k in range(1, min(MAX_NEIGHBOURS, len(order) - 1) + 1):
+        near = (blocks[k:] == blocks[:-k]) & (days[k:] - days[:-k] <= window_days)
+        if not near.any():
+            break
+        left.append(order[:-k][near])
+        right.append(order[k:][near])
+    if not left:
+        return np.empty(0, dtype='int64'), np.empty(0, dtype='int64')
+    return np.concatenate(left), np.concatenate(right)
+
+
+def _assign_originals(rank, left, right, score):
+    """(duplicate, original, similarity) for similar pairs where left precedes right in rank.
+
+    Rows are settled in rank (date) order; each takes the earliest partner that is
+    itself an original, and a row with none stays an original.
+    """
+    order = np.lexsort((rank[left], rank[right]))
+    original = {}
+    for a, b, similarity in zip(left[order].tolist(), right[order].tolist(), score[order].tolist()):
+        if b not in original and a not in original:
+            original[b] = (a, similarity)
+    dup = np.fromiter(original, dtype='int64', count=len(original))
+    orig = np.array([original[b][0] for b in dup.tolist()], dtype='int64')
+    best = np.array([original[b][1] for b in dup.tolist()], dtype='float64')
+    return dup, orig, best
+
+
+def find_duplicates(df, window_days=WINDOW_DAYS, min_similarity=MIN_SIMILARITY):
+    """One row per likely duplicate (see DUPLICATE_COLUMNS), grouped under its original.
+
+    Row and Original are positions in df.
+    """
+    rows = np.flatnonzero(df['Date'].notna().to_numpy())
+    if len(rows) < 2:
+        return pd.DataFrame(columns=DUPLICATE_COLUMNS)
+
+    days = df['Date'].to_numpy()[rows].astype('datetime64[D]').astype('int64')
+    cents = np.rint(native_amounts(df).to_numpy(dtype='float64')[rows] * 100).astype('int64')
+    types = df['Type'].astype('category').cat.codes.to_numpy().astype('int64')[rows] + 1
+    currencies = df['Currency'].cat.codes.to_numpy().astype('int64')[rows]
+    kinds = types * len(df['Currency'].cat.categories) + currencies
+    blocks, _ = pd.factorize(cents * (kinds.max() + 1) + kinds)
+    left, right = _candidate_pairs(days, blocks, window_days)
+    if not len(left):
+        return pd.DataFrame(columns=DUPLICATE_COLUMNS)
+    rank = np.empty(len(rows), dtype='int64')
+    rank[np.lexsort((days, blocks))] = np.arange(len(rows))  # the order pairs were taken in
+
+    codes, texts = _description_codes(df['Description'])
+    code_left, code_right = codes[rows[left]], codes[rows[right]]
+    score = np.ones(len(left))
+    differ = np.flatnonzero(code_left != code_right)
+    if len(differ):
+        pairs = np.stack([np.minimum(code_left[differ], code_right[differ]),
+                          np.maximum(code_left[differ], code_right[differ])], axis=1)
+        unique, inverse = np.unique(pairs, axis=0, return_inverse=True)
+        scores = np.array([similarity(texts[x], texts[y]) for x, y in unique])
+        score[differ] = scores[inverse.ravel()]
+    similar = score >= min_similarity
+    if not similar.any():
+        return pd.DataFrame(columns=DUPLICATE_COLUMNS)
+    dup, orig, best = _assign_originals(rank, left[similar], right[similar], score[similar])
+    dup, orig = rows[dup], rows[orig]
+
+    found = pd.DataFrame({
+        'Row': dup,
+        'Original': orig,
+        'Date': df['Date'].to_numpy()[dup],
+        'Type': df['Type'].to_numpy()[dup].astype(str),
+        'Amount': df['Amount'].to_numpy()[dup],
+        'Category': df['Category'].to_numpy()[dup].astype(str),
+        'Description': df['Description'].astype(object).fillna('').to_numpy()[dup],
+        'Original Date': df['Date'].to_numpy()[orig],
+        'Original Description': df['Description'].astype(object).fillna('').to_numpy()[orig],
+        'Similarity': best.round(2),
+    }, columns=DUPLICATE_COLUMNS)
+    return found.sort_values(['Original', 'Row'], ignore_index=True)
+
+
+# --- Exclusion Keys ---
+def _content(date, type_, amount, description, category, currency):
+    return (pd.Timestamp(date).isoformat() if not pd.isna(date) else None, str(type_),
+            round(float(amount), 2), '' if pd.isna(description) else str(description), str(category),
+            str(currency))
+
+
+def _numbered(df, amounts):
+    """{position: (content..., occurrence)} for every row whose native amount is in amounts.
+
+    Identical rows always share an amount, so numbering them within this subset
+    gives the same occurrence as numbering them over the whole frame.
+    """
+    native = native_amounts(df).to_numpy(dtype='float64')
+    candidates = np.flatnonzero(np.isin(np.round(native, 2), np.round(np.asarray(amounts, dtype='float64'), 2)))
+    window = df.iloc[candidates].assign(Amount=native[candidates])
+    seen = Counter()
+    numbered = {}
+    for position, *values in zip(candidates, *(window[name] for name in KEY_FIELDS)):
+        content = _content(*values)
+        seen[content] += 1
+        numbered[int(position)] = content + (seen[content],)
+    return numbered
+
+
+def exclusion_keys(df, positions):
+    """JSON-ready content keys identifying the rows at positions (for the journal)."""
+    numbered = _numbered(df, native_amounts(df).to_numpy(dtype='float64')[positions])
+    return [dict(zip(KEY_FIELDS + ['Occurrence'], numbered[int(position)])) for position in positions]
+
+
+def excluded_positions(df, keys):
+    """Sorted positions of the rows in df matching exclusion keys (unmatched keys are ignored)."""
+    if not keys:
+        return np.empty(0, dtype='int64')
+    wanted = {tuple(key[name] for name in KEY_FIELDS + ['Occurrence']) for key in keys}
+    numbered = _numbered(df, [key['Amount'] for key in keys])
+    return np.array(sorted(p for p, content in numbered.items() if content in wanted), dtype='int64')
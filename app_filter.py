@@ -0,0 +1,176 @@
+import numpy as np
+import pandas as pd
+
+from app_aggregates import AggregateCache
+
+# --- 🔎 Global Date / Category Filter 🔎 ---
+# The filter bar restricts every view to a date range and optionally one category.
+# FilterIndex is built once per ledger version (on the load worker): rows are sorted
+# by (category code, day) into one composite int64 key, so the rows of any category in
+# any date range are a contiguous slice found with two searchsorted calls, and all
+# selected categories are looked up in one vectorized call. Prefix sums of income
+# and expense over that order give the filtered KPI totals in O(k log n) for k
+# categories, without touching the rows. A second, date-only order serves the common
+# "all categories" case as a single slice.
+
+
+class FilterIndex:
+    def __init__(self, df):
+        dates = df['Date'].to_numpy()
+        valid = ~np.isnat(dates)
+        days = dates.astype('datetime64[D]').astype('int64')
+        rows = np.flatnonzero(valid)
+        self.categories = {name: code for code, name in enumerate(df['Category'].cat.categories)}
+        if len(rows):
+            self.origin = int(days[rows].min())
+            self.span = int(days[rows].max()) - self.origin + 1
+        else:
+            self.origin, self.span = 0, 1
+        self.first_day = pd.Timestamp(np.datetime64(self.origin, 'D'))
+
+        offsets = days[rows] - self.origin
+        codes = np.maximum(df['Category'].cat.codes.to_numpy()[rows], 0).astype('int64')
+        keys = codes * self.span + offsets
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.rows = rows[order]
+        self.row_days = offsets[order]
+
+        amounts = df['Amount'].to_numpy()[self.rows]
+        income = (df['Type'] == 'Income').to_numpy()[self.rows]
+        expense = (df['Type'] == 'Expense').to_numpy()[self.rows]
+        self.income_cum = np.concatenate([[0.0], np.cumsum(np.where(income, amounts, 0.0))])
+        self.expense_cum = np.concatenate([[0.0], np.cumsum(np.where(expense, amounts, 0.0))])
+
+        by_date = np.argsort(offsets, kind='stable')
+        self.date_rows = rows[by_date]
+        self.date_days = offsets[by_date]
+
+    @property
+    def date_range(self):
+        """(first, last) transaction day as Timestamps, or None for an empty ledger."""
+        if not len(self.rows):
+            return None
+        return self.first_day, self.first_day + pd.Timedelta(days=self.span - 1)
+
+    def _offsets(self, start, end):
+        lo = 0 if start is None else (pd.Timestamp(start) - self.first_day).days
+        hi = self.span - 1 if end is None else (pd.Timestamp(end) - self.first_day).days
+        return max(lo, 0), min(hi, self.span - 1)
+
+    def _bounds(self, start, end, categories):
+        """(lo, hi) slice bounds into the (category, day) order, one pair per category."""
+        if categories is None:
+            codes = np.arange(len(self.categories), dtype='int64')
+        else:
+            codes = np.array([self.categories[c] for c in categories if c in self.categories], dtype='int64')
+        lo_day, hi_day = self._offsets(start, end)
+        if lo_day > hi_day or not len(codes):
+            return np.zeros(0, dtype='int64'), np.zeros(0, dtype='int64')
+        lo = np.searchsorted(self.keys, codes * self.span + lo_day, side='left')
+        hi = np.searchsorted(self.keys, codes * self.span + hi_day, side='right')
+        return lo, hi
+
+    def totals(self, start=None, end=None, categories=None):
+        """(income, expenses, rows) in the range from the prefix sums, without a scan."""
+        lo, hi = self._bounds(start, end, categories)
+        income = float((self.income_cum[hi] - self.income_cum[lo]).sum())
+        expenses = float((self.expense_cum[hi] - self.expense_cum[lo]).sum())
+        return income, expenses, int((hi - lo).sum())
+
+    def positions(self, start=None, end=None, categories=None):
+        """Row positions (into the ledger) matching the filter, in ascending date order."""
+        if categories is None:
+            lo_day, hi_day = self._offsets(start, end)
+            lo = np.searchsorted(self.date_days, lo_day, side='left')
+            hi = np.searchsorted(self.date_days, hi_day, side='right')
+            return self.date_rows[lo:hi]
+
+        lo, hi = self._bounds(start, end, categories)
+        lengths = hi - lo
+        if not lengths.sum():
+            return np.zeros(0, dtype='int64')
+        # Concatenated aranges lo[i]:hi[i] without a Python loop.
+        starts = np.repeat(lo - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+        idx = starts + np.arange(lengths.sum())
+        if len(lo) > 1:
+            idx = idx[np.argsort(self.row_days[idx], kind='stable')]
+        return self.rows[idx]
+
+
+class LedgerFilter:
+    """Filter bar state shared by all views, with the filtered frame cached per version."""
+
+    def __init__(self):
+        self.start = None
+        self.end = None
+        self.category = None
+        self.index = None
+        self._index_version = None
+        self._view = None
+
+    @property
+    def active(self):
+        return self.start is not None or self.end is not None or self.category is not None
+
+    def key(self):
+        return (self.start, self.end, self.category)
+
+    def set(self, start=None, end=None, category=None):
+        self.start = None if start is None else pd.Timestamp(start).normalize()
+        self.end = None if end is None else pd.Timestamp(end).normalize()
+        self.category = category
+
+    def reset(self):
+        self.set()
+
+    def attach(self, index, version):
+        """Uses a FilterIndex prebuilt (e.g. on the load worker) for this data version."""
+        self.index, self._index_version = index, version
+        self._view = None
+
+    def current_index(self, aggregates):
+        """The attached FilterIndex if it still matches the data version, else None."""
+        return self.index if self._index_version == aggregates.version else None
+
+    def _index(self, df, aggregates):
+        if self._index_version != aggregates.version:
+            self.attach(FilterIndex(df), aggregates.version)
+        return self.index
+
+    def _categories(self):
+        return None if self.category is None else [self.category]
+
+    def version(self, aggregates):
+        """Chart cache key: changes with the data version or the filter."""
+        return (aggregates.version, self.key())
+
+    def positions(self, df, aggregates):
+        """Matching row positions into df, oldest first (None when no filter is set)."""
+        if not self.active:
+            return None
+        return self._index(df, aggregates).positions(self.start, self.end, self._categories())
+
+    def totals(self, df, aggregates):
+        """(income, expenses) for the filtered rows, from the prefix sums."""
+        if not self.active:
+            return aggregates.totals(df)
+        income, expenses, _ = self._index(df, aggregates).totals(self.start, self.end, self._categories())
+        return income, expenses
+
+    def summary(self, df, aggregates):
+        """(rows, income, expenses) shown in the filter bar."""
+        if not self.active:
+            return (len(df), *aggregates.totals(df))
+        income, expenses, rows = self._index(df, aggregates).totals(self.start, self.end, self._categories())
+        return rows, income, expenses
+
+    def apply(self, df, aggregates):
+        """(df, aggregates) restricted to the filter; the unfiltered pair when inactive."""
+        if not self.active:
+            return df, aggregates
+        key = self.version(aggregates)
+        if self._view is None or self._view[0] != key:
+            view = df.iloc[self.positions(df, aggregates)].reset_index(drop=True)
+            self._view = (key, view, AggregateCache())
+        return self._view[1], self._view[2]
@@ -0,0 +1,106 @@
+from tkinter import ttk
+
+from app_currency import money
+from app_theme import COLOR_CONTENT_BG, COLOR_GREEN, COLOR_RED, COLOR_TEXT_SUBTLE, FONT_BOLD, FONT_NORMAL
+
+# --- 🔎 Filter Bar 🔎 ---
+# One bar above the content area, shared by every view. Like the cached chart views
+# it is owned by root and packed into the content frame on demand, so
+# clear_content_frame (which destroys the content's children) leaves it alive.
+# Changing a date or the category calls on_change(start, end, category); a date
+# equal to the ledger's first/last day means "unbounded" on that side.
+
+ALL_CATEGORIES = "All categories"
+
+
+class FilterBar:
+    def __init__(self, root, on_change):
+        from tkcalendar import DateEntry
+
+        self.on_change = on_change
+        self.bounds = None
+        self.frame = ttk.Frame(root, style='Content.TFrame')
+
+        ttk.Label(self.frame, text="📅 From:", font=FONT_BOLD,
+                  background=COLOR_CONTENT_BG).pack(side='left', padx=(10, 5))
+        self.start_entry = DateEntry(self.frame, date_pattern='yyyy-mm-dd', width=12)
+        self.start_entry.pack(side='left', padx=5)
+        ttk.Label(self.frame, text="To:", font=FONT_BOLD,
+                  background=COLOR_CONTENT_BG).pack(side='left', padx=5)
+        self.end_entry = DateEntry(self.frame, date_pattern='yyyy-mm-dd', width=12)
+        self.end_entry.pack(side='left', padx=5)
+
+        ttk.Label(self.frame, text="🏷️ Category:", font=FONT_BOLD,
+                  background=COLOR_CONTENT_BG).pack(side='left', padx=(15, 5))
+        self.category_combo = ttk.Combobox(self.frame, state='readonly', width=20)
+        self.category_combo.pack(side='left', padx=5)
+
+        ttk.Button(self.frame, text="Reset", command=self.reset,
+                   style='TButton', cursor='hand2').pack(side='left', padx=10)
+        self.summary = ttk.Label(self.frame, text="", font=FONT_NORMAL,
+                                 background=COLOR_CONTENT_BG, foreground=COLOR_TEXT_SUBTLE)
+        self.summary.pack(side='right', padx=10)
+
+        for widget in (self.start_entry, self.end_entry):
+            widget.bind('<<DateEntrySelected>>', self._changed)
+            widget.bind('<Return>', self._changed)
+        self.category_combo.bind('<<ComboboxSelected>>', self._changed)
+
+    def set_ledger(self, date_range, categories):
+        """Resets the bar to a newly loaded ledger's full date range and categories."""
+        self.bounds = date_range
+        if date_range is not None:
+            self.start_entry.set_date(date_range[0].date())
+            self.end_entry.set_date(date_range[1].date())
+        self.category_combo['values'] = [ALL_CATEGORIES] + sorted(categories)
+        self.category_combo.set(ALL_CATEGORIES)
+
+    def include(self, date, category):
+        """Widens the bar to cover a newly added transaction's date and category."""
+        values = list(self.category_combo['values'])
+        if category not in values:
+            self.category_combo['values'] = values[:1] + sorted(values[1:] + [category])
+        if self.bounds is None:
+            self.bounds = (date, date)
+            return
+        first, last = self.bounds
+        if date < first:
+            if self.start_entry.get_date() <= first.date():  # unbounded start follows the data
+                self.start_entry.set_date(date.date())
+            first = date
+        if date > last:
+            if self.end_entry.get_date() >= last.date():
+                self.end_entry.set_date(date.date())
+            last = date
+        self.bounds = (first, last)
+
+    def reset(self):
+        if self.bounds is not None:
+            self.start_entry.set_date(self.bounds[0].date())
+            self.end_entry.set_date(self.bounds[1].date())
+        self.category_combo.set(ALL_CATEGORIES)
+        self._changed()
+
+    def _changed(self, event=None):
+        start, end = self.start_entry.get_date(), self.end_entry.get_date()
+        if self.bounds is not None:
+            start = None if start <= self.bounds[0].date() else start
+            end = None if end >= self.bounds[1].date() else end
+        category = self.category_combo.get()
+        self.on_change(start, end, None if category in ('', ALL_CATEGORIES) else category)
+
+    def set_summary(self, rows, income, expenses):
+        self.summary.config(text=f"{rows:,} transactions · {money(income, 0)} in · {money(expenses, 0)} out",
+                            foreground=COLOR_GREEN if income >= expenses else COLOR_RED)
+
+    def show(self, parent):
+        """Packs the bar at the top of parent (before anything already packed there)."""
+        if self.frame.winfo_manager():
+            return
+        slaves = parent.pack_slaves()
+        options = {'before': slaves[0]} if slaves else {}
+        self.frame.pack(in_=parent, side='top', fill='x', padx=30, pady=(10, 0), **options)
+        self.frame.lift()
+
+    def hide(self):
+        self.frame.pack_forget()
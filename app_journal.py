@@ -0,0 +1,222 @@
+import json
+import os
+import threading
+
+import pandas as pd
+
+from app_store import count_unparseable_rows, public_columns, write_ledger_file
+from app_watch import prefix_samples
+
+# --- 📓 Append-Only Transaction Journal 📓 ---
+# Save Changes only appends the records added since the last save (plus the budgets,
+# when they changed, and the keys of rows confirmed as duplicates) to a sidecar JSON-lines journal and fsyncs it. Rewriting the
+# whole workbook happens later on a worker: the ledger is written to a temp file and
+# renamed over the source, so an interrupted rewrite never leaves a torn file.
+#
+# Every journal entry carries the (size, mtime) of the source it applies to, plus a
+# prefix stamp (size and digests of the head and tail of those bytes). A CSV that
+# only grew since (a bank export appended rows while the app was closed) still has
+# that prefix, so its entries keep applying. Entries that match neither are kept in
+# the journal (and counted by stale()) instead of being dropped. Before a compaction
+# replaces the source, the entries it folds in lose their prefix stamp, so a crash
+# between the rename and the journal reset can't double-apply them.
+#
+# The rewrite keeps the rows in the order the source had them (added rows follow).
+# The loader skips rows without a valid Date or Amount, so a source that has any is
+# never compacted: rewriting it from the store would delete them. Its changes stay
+# in the journal and keep being replayed on load.
+
+
+def _encode(value):
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if hasattr(value, 'item'):  # numpy scalars
+        return value.item()
+    return value
+
+
+class Journal:
+    def __init__(self, file_path):
+        self.file_path = file_path
+        folder, name = os.path.split(os.path.abspath(file_path))
+        self.path = os.path.join(folder, f".{name}.journal.jsonl")
+        self.budgets_path = os.path.join(folder, f".{name}.budgets.json")
+        self._lock = threading.Lock()
+
+    def _base(self):
+        stat = os.stat(self.file_path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _prefix(self, path=None):
+        with open(path or self.file_path, 'rb') as fh:
+            size = os.fstat(fh.fileno()).st_size
+            return [size, *prefix_samples(fh, size)]
+
+    def _matcher(self):
+        """Predicate telling whether a journal entry applies to the source as it is now."""
+        base = self._base()
+        grows = self.file_path.lower().endswith('.csv')  # only CSV sources grow by appended rows
+        checked = {}
+
+        def applies(entry):
+            if entry.get('base') == base:
+                return True
+            prefix = entry.get('prefix')
+            if not grows or not prefix or prefix[0] > base[0]:
+                return False
+            key = tuple(prefix)
+            if key not in checked:
+                with open(self.file_path, 'rb') as fh:
+                    checked[key] = list(prefix_samples(fh, prefix[0])) == prefix[1:]
+            return checked[key]
+        return applies
+
+    def _read(self):
+        try:
+            with open(self.path, 'rb') as fh:
+                return fh.read().decode('utf-8', errors='replace')
+        except OSError:
+            return None
+
+    def _rewrite(self, entries):
+        journal_tmp = self.path + '.tmp'
+        with open(journal_tmp, 'w', encoding='utf-8') as fh:
+            for entry in entries:
+                fh.write(json.dumps(entry) + '\n')
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(journal_tmp, self.path)
+
+    def append(self, records=(), budgets=None, exclusions=()):
+        """Durably appends records, budgets and exclusion keys; returns the journal size afterwards."""
+        with self._lock:
+            base, prefix = self._base(), self._prefix()
+            with open(self.path, 'a+b') as fh:
+                if fh.seek(0, os.SEEK_END):
+                    fh.seek(-1, os.SEEK_END)
+                    if fh.read(1) != b'\n':
+                        fh.write(b'\n')  # seal a torn line left by an interrupted append
+                for record in records:
+                    entry = {'base': base, 'prefix': prefix, 'op': 'add',
+                             'record': {k: _encode(v) for k, v in record.items()}}
+                    fh.write((json.dumps(entry) + '\n').encode('utf-8'))
+                for key in exclusions:
+                    entry = {'base': base, 'prefix': prefix, 'op': 'exclude', 'key': key}
+                    fh.write((json.dumps(entry) + '\n').encode('utf-8'))
+                if budgets is not None:
+                    entry = {'base': base, 'prefix': prefix, 'op': 'budgets', 'budgets': budgets}
+                    fh.write((json.dumps(entry) + '\n').encode('utf-8'))
+                fh.flush()
+                os.fsync(fh.fileno())
+                return fh.tell()
+
+    def _entries(self, data):
+        for line in data.splitlines():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue  # torn line from an interrupted append
+
+    def replay(self):
+        """(records, budgets, exclusion keys) saved against the current source file.
+
+        budgets is None if never saved. Exclusions apply after every record was added.
+        """
+        budgets = None
+        try:
+            with open(self.budgets_path, encoding='utf-8') as fh:
+                budgets = json.load(fh)
+        except (OSError, ValueError):
+            pass
+
+        records, exclusions = [], []
+        data = self._read()
+        if data is None:
+            return records, budgets, exclusions
+
+        applies = self._matcher()
+        for entry in self._entries(data):
+            if not applies(entry):
+                continue
+            if entry['op'] == 'add':
+                records.append(entry['record'])
+            elif entry['op'] == 'exclude':
+                exclusions.append(entry['key'])
+            elif entry['op'] == 'budgets':
+                budgets = entry['budgets']
+        return records, budgets, exclusions
+
+    def stale(self):
+        """Number of saved entries that no longer apply (the source was rewritten elsewhere)."""
+        data = self._read()
+        if not data:
+            return 0
+        applies = self._matcher()
+        return sum(not applies(entry) for entry in self._entries(data))
+
+    def rebase(self, old_base, new_base):
+        """Moves entries saved against old_base onto new_base.
+
+        Used when the source only grew by appended rows (checked by the file watcher),
+        so changes saved before the append still apply to it.
+        """
+        with self._lock:
+            data = self._read()
+            if data is None:
+                return
+            entries = list(self._entries(data))
+            if not any(entry.get('base') == old_base for entry in entries):
+                return
+            for entry in entries:
+                if entry.get('base') == old_base:
+                    entry['base'] = new_base
+            self._rewrite(entries)
+
+    def compact(self, df, budgets, offset):
+        """Rewrites the source from df, which must include every entry up to offset.
+
+        Entries appended while the rewrite was running are kept and re-based onto
+        the new source file. Raises ValueError (leaving everything untouched) when the
+        source has rows the store could not parse.
+        """
+        folder, name = os.path.split(os.path.abspath(self.file_path))
+        skipped = count_unparseable_rows(self.file_path)
+        if skipped:
+            raise ValueError(f"{skipped:,} row(s) of {name} have no valid Date or Amount; fix them "
+                             f"so they aren't lost in the rewrite (changes stay saved in the journal)")
+        root, ext = os.path.splitext(name)
+        tmp = os.path.join(folder, f".{root}.compact{ext}")
+        write_ledger_file(public_columns(df), tmp)
+
+        budgets_tmp = self.budgets_path + '.tmp'
+        with open(budgets_tmp, 'w', encoding='utf-8') as fh:
+            json.dump(budgets, fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+
+        with self._lock:
+            try:
+                with open(self.path, 'rb') as fh:
+                    done = fh.read(offset).decode('utf-8', errors='replace')
+                    tail = fh.read().decode('utf-8', errors='replace')
+            except OSError:
+                done = tail = ''
+            applies = self._matcher()
+            folded = [entry for entry in self._entries(done) if applies(entry)]
+            stale = [entry for entry in self._entries(done) if not applies(entry)]
+            pending = [(entry, applies(entry)) for entry in self._entries(tail)]
+            if folded:
+                # Pin the folded entries to the old source's exact (size, mtime) first:
+                # should the rename below be the last thing to happen, they can't be
+                # mistaken for entries of a grown file and applied twice.
+                for entry in folded:
+                    entry.pop('prefix', None)
+                self._rewrite(folded + stale + [entry for entry, _ in pending])
+
+            os.replace(tmp, self.file_path)
+            os.replace(budgets_tmp, self.budgets_path)
+            base, prefix = self._base(), self._prefix()
+            for entry, current in pending:
+                if current:
+                    entry['base'], entry['prefix'] = base, prefix
+            self._rewrite(stale + [entry for entry, _ in pending])
@@ -0,0 +1,89 @@
+import logging
+
+from app_aggregates import AggregateCache
+from app_categorize import active_categorizer
+from app_currency import BASE_CURRENCY
+from app_dedupe import excluded_positions
+from app_journal import Journal
+from app_perf import profiler
+from app_snapshot import WRITE_ERRORS, load_snapshot, write_snapshot
+from app_store import append_transactions, concat_typed, iter_ledger_chunks, remove_rows
+
+# --- 📥 Ledger Loading Pipeline 📥 ---
+# Snapshot -> streamed parse -> journal replay (added rows, then confirmed duplicates
+# taken out), shared by the dashboard's background load task and the headless tools.
+# Nothing here imports Tk.
+
+log = logging.getLogger(__name__)
+
+
+def _no_progress(fraction, text=None, partial=None):
+    pass
+
+
+def ingest_tag(categorizer=None):
+    """Snapshot tag for the settings baked into parsed rows (rules, currency of unlabeled rows)."""
+    return f"{(categorizer or active_categorizer()).fingerprint}:{BASE_CURRENCY}"
+
+
+def try_write_snapshot(file_path, df, cubes):
+    try:
+        write_snapshot(file_path, df, cubes, tag=ingest_tag())
+    except WRITE_ERRORS as e:
+        # e.g. a read-only folder; the next open simply parses the source again
+        log.warning("Could not write the snapshot of %s: %s", file_path, e)
+
+
+def load_ledger(file_path, report=_no_progress):
+    """Returns (df, warmed AggregateCache, budgets or None) for a ledger file.
+
+    report(fraction, text, partial=...) receives progress; Task.report fits directly.
+    Parsed chunks are auto-categorized with the saved rules (see app_categorize).
+    """
+    categorizer = active_categorizer()
+    report(0.0, "Checking snapshot…")
+    with profiler.span('load.snapshot'):
+        cached = load_snapshot(file_path, tag=ingest_tag(categorizer))
+    if cached is not None:
+        df, cubes = cached
+        aggregates = AggregateCache.from_cubes(cubes)
+    else:
+        report(0.0, "Reading file…")
+        chunks, rows = [], 0
+        aggregates = AggregateCache()
+        with profiler.span('load.parse'):
+            for chunk, fraction in iter_ledger_chunks(file_path):
+                with profiler.span('load.categorize'):
+                    chunk = categorizer.apply(chunk)
+                chunks.append(chunk)
+                aggregates.accumulate(chunk)
+                rows += len(chunk)
+                report(0.8 * fraction, f"Reading file… {rows:,} rows",
+                       partial=(rows, *aggregates.totals(None)))
+        report(0.8, "Building aggregates…")
+        with profiler.span('load.aggregates'):
+            df = concat_typed(chunks)
+            del chunks
+            aggregates.warm(df)
+        report(0.85, "Writing snapshot…")
+        with profiler.span('load.write_snapshot'):
+            try_write_snapshot(file_path, df, aggregates.cubes())
+
+    # Records saved to the journal since the last compaction of the source.
+    with profiler.span('load.journal'):
+        journal = Journal(file_path)
+        records, budgets, exclusions = journal.replay()
+        stale = journal.stale()
+        if stale:
+            log.warning("%s: %d saved change(s) belong to an earlier version of the file and are not applied",
+                        file_path, stale)
+        if records:
+            start = len(df)
+            df = append_transactions(df, records)
+            aggregates.apply(df.iloc[start:].to_dict('records'))
+        excluded = excluded_positions(df, exclusions)
+        if len(excluded):
+            aggregates.accumulate(df.iloc[excluded], sign=-1)
+            df = remove_rows(df, excluded)
+        aggregates.warm(df)
+    return df, aggregates, budgets
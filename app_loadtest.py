@@ -0,0 +1,110 @@
+"""Load test for the JSON query service (app_server.py).
+
+    python app_loadtest.py --port 8765 --clients 32 --requests 5000
+    python app_loadtest.py --ledger ledger.csv --clients 64      # starts its own server
+
+Each client keeps one HTTP/1.1 keep-alive connection open and cycles through a mix
+of endpoints. Reports throughput and p50/p99/max latency overall and per endpoint.
+"""
+import argparse
+import asyncio
+import os
+import re
+import subprocess
+import sys
+import time
+
+from app_server import DEFAULT_PORT
+
+DEFAULT_PATHS = ['/totals', '/categories', '/series/monthly', '/series/yearly',
+                 '/top?n=10', '/top?n=5&by=category', '/top?n=3&by=month', '/budgets']
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * q / 100), len(ordered) - 1)] if ordered else 0.0
+
+
+async def _request(reader, writer, host, path):
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = int(re.search(rb'Content-Length: (\d+)', head).group(1))
+    await reader.readexactly(length)
+    return status
+
+
+async def _client(host, port, paths, count, offset, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(count):
+            path = paths[(offset + i) % len(paths)]
+            start = time.perf_counter()
+            status = await _request(reader, writer, host, path)
+            latencies.setdefault(path, []).append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                errors.append((path, status))
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, clients, requests, paths):
+    """Returns ({path: [latency ms]}, [(path, status)] errors, elapsed seconds)."""
+    latencies, errors = {}, []
+    per_client = [requests // clients + (1 if i < requests % clients else 0) for i in range(clients)]
+    started = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, paths, count, i, latencies, errors)
+                           for i, count in enumerate(per_client) if count))
+    return latencies, errors, time.perf_counter() - started
+
+
+def _start_server(ledger):
+    """Starts app_server.py on a free port; returns (process, port)."""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app_server.py')
+    proc = subprocess.Popen([sys.executable, script, ledger, '--port', '0'],
+                            stdout=subprocess.PIPE, text=True)
+    for line in proc.stdout:
+        match = re.search(r'Serving on http://[^:]+:(\d+)/', line)
+        if match:
+            return proc, int(match.group(1))
+    proc.wait()
+    raise RuntimeError("query server exited before it started serving")
+
+
+def report(latencies, errors, elapsed):
+    everything = [ms for samples in latencies.values() for ms in samples]
+    print(f"{len(everything):,} requests in {elapsed:.2f} s = {len(everything) / elapsed:,.0f} req/s, "
+          f"{len(errors)} errors")
+    print(f"{'endpoint':<24}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for path, samples in sorted(latencies.items()) + [('ALL', everything)]:
+        print(f"{path:<24}{len(samples):>8}{percentile(samples, 50):>10.2f}"
+              f"{percentile(samples, 99):>10.2f}{max(samples, default=0.0):>10.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the ledger query service.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--ledger', help="start a server for this ledger instead of using a running one")
+    parser.add_argument('--clients', type=int, default=32, help="concurrent connections")
+    parser.add_argument('--requests', type=int, default=5000, help="total requests")
+    parser.add_argument('--path', action='append', dest='paths', help="endpoint to request (repeatable)")
+    args = parser.parse_args(argv)
+
+    proc, port = (None, args.port)
+    if args.ledger:
+        proc, port = _start_server(args.ledger)
+    try:
+        latencies, errors, elapsed = asyncio.run(
+            run_load(args.host, port, max(args.clients, 1), args.requests, args.paths or DEFAULT_PATHS))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    report(latencies, errors, elapsed)
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
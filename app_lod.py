@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+# --- 🔭 Level-of-Detail Time Series 🔭 ---
+# Long histories make one-point-per-month charts slow to lay out and unreadable.
+# The trend charts instead start from the daily (Day x Type) cube and re-aggregate
+# it for the visible date range: daily points when zoomed in close (downsampled with
+# LTTB so the point count stays capped), otherwise month/quarter/year buckets,
+# whichever is the finest resolution that keeps the bucket count under MAX_BUCKETS.
+
+MAX_POINTS = 150        # cap for daily line series (LTTB)
+MAX_BUCKETS = 60        # cap for aggregated buckets (bars / markers)
+DAILY_MAX_DAYS = 366    # line spans up to this many days are shown at daily resolution
+
+RESOLUTIONS = [
+    # name, pandas rule, approx days per bucket
+    ('Monthly', 'MS', 30.4),
+    ('Quarterly', 'QS', 91.3),
+    ('Yearly', 'YS', 365.25),
+]
+
+
+def choose_resolution(start, end, allow_daily=True):
+    """(name, rule, days per bucket) for a visible range [start, end]."""
+    span_days = max((pd.Timestamp(end) - pd.Timestamp(start)).days, 1)
+    if allow_daily and span_days <= DAILY_MAX_DAYS:
+        return 'Daily', 'D', 1.0
+    for resolution in RESOLUTIONS:
+        if span_days / resolution[2] <= MAX_BUCKETS:
+            return resolution
+    return RESOLUTIONS[-1]
+
+
+PERIOD_FOR_RULE = {'MS': 'M', 'QS': 'Q', 'YS': 'Y'}
+
+
+def resample(daily, rule, start=None, end=None):
+    """Sums a Day x Type frame into rule-sized buckets covering [start, end].
+
+    The window is widened to whole buckets so edge buckets are never partial sums.
+    """
+    if rule != 'D':
+        period = PERIOD_FOR_RULE[rule]
+        if start is not None:
+            start = pd.Timestamp(start).to_period(period).start_time
+        if end is not None:
+            end = pd.Timestamp(end).to_period(period).end_time
+    window = daily.loc[start:end]
+    if window.empty or rule == 'D':
+        return window
+    return window.resample(rule).sum()
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets downsampling; returns the indices to keep."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+
+    prev = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_lo, nxt_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[nxt_lo:nxt_hi].mean() if nxt_hi > nxt_lo else x[-1]
+        avg_y = y[nxt_lo:nxt_hi].mean() if nxt_hi > nxt_lo else y[-1]
+        area = np.abs((x[prev] - avg_x) * (y[lo:hi] - y[prev]) -
+                      (x[prev] - x[lo:hi]) * (avg_y - y[prev]))
+        prev = lo + int(np.argmax(area)) if hi > lo else lo
+        keep[i + 1] = prev
+    return keep
+
+
+def downsample(series, max_points=MAX_POINTS):
+    """LTTB-downsamples a datetime-indexed series to at most max_points points."""
+    if len(series) <= max_points:
+        return series
+    keep = lttb(series.index.asi8, series.to_numpy(), max_points)
+    return series.iloc[keep]
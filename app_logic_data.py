@@ -0,0 +1,957 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox, Toplevel
+from datetime import datetime
+import os
+import re
+
+from app_currency import display_currency, money
+from app_perf import instrument
+from app_watch import APPEND, POLL_MS
+from app_theme import (COLOR_BG, COLOR_CARD, COLOR_CONTENT_BG, COLOR_GREEN, COLOR_RED,
+                       COLOR_TEXT_SUBTLE, FONT_H2)
+
+
+# --- ⚙️ Background Task Methods ⚙️ ---
+
+def show_task_progress(self, task):
+    """Shows the running task's progress under the file status in the sidebar."""
+    fraction, text = task.progress
+    if not self.task_frame.winfo_ismapped():
+        self.task_frame.pack(fill='x', after=self.file_status)
+    self.task_progress['value'] = fraction * 100
+    self.task_cancel_btn.config(state='normal' if task.cancellable else 'disabled')
+    self.file_status.config(text=f"⏳ {text}", foreground=COLOR_TEXT_SUBTLE)
+    if task.partial is not None and task.partial is not self.loading_partial:
+        self.show_loading_kpis(task.partial)
+
+
+def show_loading_kpis(self, partial):
+    """Shows running KPI totals while a ledger is still streaming in."""
+    self.loading_partial = partial
+    rows, income, expenses = partial
+    balance = income - expenses
+    self.clear_content_frame()
+    self.chart_views.hide()
+    if self.filter_bar is not None:
+        self.filter_bar.hide()
+
+    kpi_frame = ttk.Frame(self.content_frame, style='Content.TFrame')
+    kpi_frame.pack(fill='x', padx=10, pady=10)
+    self.create_kpi_card(kpi_frame, "Total Income", money(income), COLOR_GREEN)
+    self.create_kpi_card(kpi_frame, "Total Expenses", money(expenses), COLOR_RED)
+    self.create_kpi_card(kpi_frame, "Net Balance", money(balance),
+                         COLOR_GREEN if balance >= 0 else COLOR_RED)
+
+    ttk.Label(self.content_frame, text=f"⏳ Loading… {rows:,} transactions read so far",
+              font=FONT_H2, background=COLOR_CONTENT_BG,
+              foreground=COLOR_TEXT_SUBTLE).pack(pady=20)
+
+
+def hide_task_progress(self):
+    self.task_frame.pack_forget()
+    self.upload_btn.config(state='normal')
+
+
+def cancel_tasks(self):
+    self.tasks.cancel_all()
+    self.file_status.config(text="Cancelled", foreground=COLOR_TEXT_SUBTLE)
+    self.hide_task_progress()
+    self.discard_loading_view()
+
+
+def discard_loading_view(self):
+    """Replaces the partial-totals view after a streaming load was cancelled or failed."""
+    if self.loading_partial is None:
+        return
+    self.loading_partial = None
+    if self.df is None:
+        self.show_welcome()
+    else:
+        self.active_view_func()
+
+
+def _build_indexes(task, df):
+    """Worker: (search, filter, top-N) indexes over a freshly loaded frame."""
+    from app_filter import FilterIndex
+    from app_search import SearchIndex
+    from app_topn import TopExpenseIndex
+
+    task.report(0.9, "Indexing for search…")
+    search_index = SearchIndex(df)
+    task.report(0.93, "Indexing dates…")
+    filter_index = FilterIndex(df)
+    task.report(0.96, "Ranking expenses…")
+    return search_index, filter_index, TopExpenseIndex(df)
+
+
+def _in_currency(task, df, aggregates, currency):
+    """Worker: the store and its aggregates with Amount in currency (see app_currency)."""
+    from app_aggregates import AggregateCache
+    from app_currency import convert
+
+    df, changed = convert(df, currency)
+    if changed:
+        task.report(0.86, f"Converting amounts to {currency}…")
+        aggregates = AggregateCache().warm(df)
+    return df, aggregates
+
+
+@instrument('task.load_ledger')
+def _load_ledger_task(task, file_path, currency):
+    """Worker: streams the ledger in and precomputes everything the views need."""
+    from app_loader import load_ledger
+
+    from app_watch import LedgerWatcher
+
+    df, aggregates, budgets = load_ledger(file_path, task.report)
+    watcher = LedgerWatcher(file_path)  # baseline right after the read, before the indexing
+    df, aggregates = _in_currency(task, df, aggregates, currency)
+    task.report(0.87, "Checking for duplicates…")
+    aggregates.duplicates(df)
+    return (df, aggregates, *_build_indexes(task, df), budgets, watcher)
+
+
+@instrument('task.restore_ledger')
+def _restore_ledger_task(task, workspace, ledger):
+    """Worker: maps a spilled ledger's frame back in and rebuilds its indexes."""
+    task.report(0.1, f"Reopening {ledger.name}…")
+    df = workspace.read_spill(ledger)
+    return (df, *_build_indexes(task, df))
+
+
+@instrument('task.spill_ledger')
+def _spill_ledger_task(task, workspace, ledger, df):
+    task.report(0.1, f"Spilling {ledger.name} to disk…")
+    return workspace.write_spill(ledger, df)
+
+
+@instrument('task.watch')
+def _watch_ledger_task(task, watcher, journal, currency):
+    """Worker: reads rows appended to the watched file (see app_watch), in the ledger's currency."""
+    task.report(0.1, f"Reading new rows from {os.path.basename(watcher.file_path)}…")
+    from app_categorize import active_categorizer
+    from app_currency import convert
+
+    result = watcher.poll()
+    if result is not None and result[0] == APPEND:
+        journal.rebase(watcher.base, watcher.base_of(result[2]))  # saved edits still apply to the grown file
+        if result[1] is not None:
+            rows, _ = convert(active_categorizer().apply(result[1]), currency)
+            result = (APPEND, rows, result[2])
+    return result
+
+
+@instrument('task.recategorize')
+def _recategorize_task(task, df, categorizer):
+    """Worker: re-applies the categorization rules to a loaded ledger (None if nothing changes)."""
+    from app_aggregates import AggregateCache
+
+    task.report(0.1, "Applying categorization rules…")
+    categorized = categorizer.apply(df)
+    if categorized is df:
+        return None
+    task.report(0.5, "Rebuilding aggregates…")
+    aggregates = AggregateCache().warm(categorized)
+    return (categorized, aggregates, *_build_indexes(task, categorized))
+
+
+@instrument('task.find_duplicates')
+def _find_duplicates_task(task, df):
+    from app_dedupe import find_duplicates
+
+    task.report(0.1, "Checking for duplicates…")
+    return find_duplicates(df)
+
+
+@instrument('task.exclude_duplicates')
+def _exclude_rows_task(task, df, cubes, positions, keys):
+    """Worker: drops confirmed duplicates (given by position or by saved key) and rebuilds
+    everything that depends on row positions. None if no row matched."""
+    from app_aggregates import AggregateCache
+    from app_dedupe import exclusion_keys, excluded_positions
+    from app_store import remove_rows
+
+    task.report(0.1, "Excluding duplicates…")
+    if positions is None:
+        positions = excluded_positions(df, keys)
+    else:
+        keys = exclusion_keys(df, positions)
+    if not len(positions):
+        return None
+    aggregates = AggregateCache.from_cubes(cubes)
+    aggregates.accumulate(df.iloc[positions], sign=-1)
+    df = remove_rows(df, positions)
+    task.report(0.5, "Rebuilding aggregates…")
+    aggregates.warm(df)
+    aggregates.duplicates(df)  # whatever is still flagged
+    return (df, aggregates, *_build_indexes(task, df), keys)
+
+
+@instrument('task.convert')
+def _convert_ledger_task(task, df, currency):
+    """Worker: the ledger's amounts, aggregates and amount-based indexes in another currency."""
+    from app_aggregates import AggregateCache
+    from app_currency import convert
+    from app_filter import FilterIndex
+    from app_topn import TopExpenseIndex
+
+    task.report(0.1, f"Converting amounts to {currency}…")
+    df, _ = convert(df, currency)
+    task.report(0.4, "Aggregating…")
+    aggregates = AggregateCache().warm(df)
+    aggregates.duplicates(df)
+    task.report(0.7, "Indexing…")
+    return df, aggregates, FilterIndex(df), TopExpenseIndex(df)
+
+
+@instrument('task.compact')
+def _compact_ledger_task(task, journal, df, budgets, cubes, offset):
+    from app_aggregates import AggregateCache
+    from app_loader import try_write_snapshot
+    from app_store import native_frame
+
+    task.report(0.1, "Compacting ledger…")
+    journal.compact(df, budgets, offset)
+    task.report(0.8, "Writing snapshot…")
+    snapshot = native_frame(df)  # snapshots hold amounts in each row's own currency
+    if not snapshot['Amount'].equals(df['Amount']):
+        cubes = AggregateCache().warm(snapshot).cubes()
+    try_write_snapshot(journal.file_path, snapshot, cubes)
+    return journal.file_path
+
+
+# --- 🔎 Filter Methods 🔎 ---
+
+def setup_filter(self, filter_index):
+    """Resets the shared filter (and its bar) to a freshly loaded or activated ledger."""
+    from app_filter import FilterIndex, LedgerFilter
+    from app_filter_bar import FilterBar
+
+    if self.ledger_filter is None:
+        self.ledger_filter = LedgerFilter()
+        self.filter_bar = FilterBar(self.root, self.apply_filter)
+    if filter_index is None:
+        filter_index = FilterIndex(self.df)
+    self.ledger_filter.reset()
+    self.ledger_filter.attach(filter_index, self.aggregates.version)
+    self.filter_bar.set_ledger(filter_index.date_range, list(self.df['Category'].cat.categories))
+    self.filter_bar.set_summary(*self.ledger_filter.summary(self.df, self.aggregates))
+
+
+def apply_filter(self, start, end, category):
+    """Filter bar callback: narrows every view to the range/category and refreshes."""
+    self.ledger_filter.set(start, end, category)
+    self.filter_bar.set_summary(*self.ledger_filter.summary(self.df, self.aggregates))
+    self.active_view_func()
+
+
+def show_filter_bar(self):
+    self.filter_bar.show(self.content_frame)
+
+
+def view_data(self):
+    """(df, aggregates) the views draw from: the whole ledger or the filtered slice."""
+    return self.ledger_filter.apply(self.df, self.aggregates)
+
+
+def view_aggregate(self, name):
+    """One AggregateCache lookup (e.g. 'daily') over the filtered data."""
+    df, aggregates = self.view_data()
+    return getattr(aggregates, name)(df)
+
+
+def view_version(self):
+    """Chart cache key covering both data edits and filter changes."""
+    return self.ledger_filter.version(self.aggregates)
+
+
+# --- 🗂️ Workspace Methods 🗂️ ---
+
+def stash_ledger(self):
+    """Writes the active ledger's state (replaced on every edit) back into the workspace."""
+    from app_workspace import LEDGER_STATE
+
+    ledger = self.workspace.active
+    if ledger is None:
+        return
+    for name in LEDGER_STATE:
+        if name != 'filter_index':
+            setattr(ledger, name, getattr(self, name))
+    ledger.filter_index = self.ledger_filter.current_index(self.aggregates)
+
+
+def activate_ledger(self, ledger):
+    """Makes a loaded ledger the one every view, edit and save works on.
+
+    A ledger last shown in another currency is converted to the chosen one afterwards.
+    """
+    from app_currency import set_display_currency
+    from app_workspace import LEDGER_STATE
+
+    self.stash_ledger()
+    self.workspace.activate(ledger)
+    for name in LEDGER_STATE:
+        if name != 'filter_index':
+            setattr(self, name, getattr(ledger, name))
+    self.file_path = ledger.file_path
+    set_display_currency(ledger.fx.currency)  # what its amounts are in until converted
+    self.setup_filter(ledger.filter_index)
+    self.file_status.config(
+        text=f"✅ Loaded: {ledger.name}\n{len(self.df):,} transactions",
+        foreground=COLOR_GREEN
+    )
+    self.add_trans_btn.config(state='normal')
+    self.save_btn.config(state='normal')
+    self.spill_cold_ledgers()
+    self.update_ledger_switcher()
+    if ledger.fx.currency != self.currency_var.get():
+        self.convert_active_ledger()
+
+
+def update_ledger_switcher(self):
+    """Lists the open ledgers (💤 = spilled to disk) in the sidebar switcher."""
+    ledgers = list(self.workspace.ledgers.values())
+    self.ledger_paths = [ledger.file_path for ledger in ledgers]
+    self.ledger_combo['values'] = [f"{'' if ledger.loaded else '💤 '}{ledger.name} · {ledger.rows:,}"
+                                   for ledger in ledgers]
+    if self.workspace.active is not None:
+        self.ledger_combo.current(self.ledger_paths.index(self.workspace.active.file_path))
+    if not self.ledger_combo.winfo_ismapped():
+        self.ledger_combo.pack(fill='x', padx=10, pady=(0, 10), after=self.file_status)
+
+
+def on_ledger_selected(self, event=None):
+    index = self.ledger_combo.current()
+    if index >= 0:
+        self.switch_ledger(self.ledger_paths[index])
+
+
+def switch_ledger(self, file_path):
+    """Activates another open ledger, mapping it back in first if it was spilled."""
+    ledger = self.workspace.get(file_path)
+    if ledger is None or ledger is self.workspace.active:
+        return
+
+    def refresh():
+        if self.active_view_func in (self.show_welcome, self.show_consolidated):
+            self.show_overview()
+        else:
+            self.active_view_func()
+
+    if ledger.loaded:
+        self.activate_ledger(ledger)
+        refresh()
+        return
+
+    def on_restored(result):
+        self.workspace.restore(ledger, *result)
+        self.activate_ledger(ledger)
+        refresh()
+
+    def on_failed(error):
+        self.update_ledger_switcher()
+        messagebox.showerror("Error", f"Could not reopen {ledger.name}:\n{error}")
+
+    self.tasks.submit(f"Reopening {ledger.name}…", _restore_ledger_task, self.workspace, ledger,
+                      on_done=on_restored, on_error=on_failed,
+                      on_cancel=self.update_ledger_switcher)  # show the still-active ledger again
+
+
+def spill_cold_ledgers(self):
+    """Spills least recently used ledgers to disk while the workspace is over its memory budget."""
+    self.stash_ledger()
+    for ledger in self.workspace.to_spill():
+        ledger.spilling = True
+
+        def on_spilled(result, ledger=ledger):
+            self.workspace.drop(ledger, *result)
+            self.update_ledger_switcher()
+
+        def on_failed(error=None, ledger=ledger):
+            ledger.spilling = False  # stays in memory; the next activation retries
+
+        self.tasks.submit(f"Spilling {ledger.name}…", _spill_ledger_task, self.workspace, ledger,
+                          ledger.df, on_done=on_spilled, on_error=on_failed, on_cancel=on_failed,
+                          cancellable=False)
+
+
+# --- 📁 File I/O Methods 📁 ---
+
+@instrument()
+def load_file(self):
+    """Asks for a ledger file and loads it into the typed store on a worker thread."""
+    file_path = filedialog.askopenfilename(
+        title="Select Transaction File",
+        filetypes=[("Excel/CSV files", "*.xlsx *.xls *.csv"), ("All files", "*.*")]
+    )
+    if not file_path:
+        return
+    if file_path in self.workspace:
+        self.switch_ledger(file_path)  # already open; keep its unsaved edits
+        return
+    self.open_ledger(file_path)
+
+
+def open_ledger(self, file_path, replaces=None):
+    """Loads a ledger on a worker and makes it the active one.
+
+    replaces is the open Ledger being re-read (watch-mode fallback); its unsaved
+    transactions and budgets are carried over onto the fresh copy.
+    """
+    currency = self.currency_var.get()
+
+    def on_loaded(result):
+        from app_currency import DisplayConversions
+        from app_journal import Journal
+        from app_workspace import Ledger
+
+        df, aggregates, search_index, filter_index, top_index, budgets, watcher = result
+        self.loading_partial = None
+        if replaces is not None:
+            budgets, budgets_dirty = replaces.budgets, replaces.budgets_dirty
+        else:
+            budgets, budgets_dirty = dict(self.budgets if budgets is None else budgets), False
+        ledger = self.workspace.add(Ledger(
+            file_path, df=df, aggregates=aggregates, search_index=search_index,
+            filter_index=filter_index, top_index=top_index, journal=Journal(file_path),
+            pending_records=[], pending_exclusions=[], budgets=budgets, budgets_dirty=budgets_dirty,
+            watcher=watcher, fx=DisplayConversions(currency)))
+        self.activate_ledger(ledger)
+        self.report_duplicates(aggregates.duplicates(df))
+        stale = ledger.journal.stale()
+        if stale:
+            messagebox.showwarning(
+                "Saved Changes Not Applied",
+                f"{stale:,} saved change(s) were made to an earlier version of {ledger.name}, which has "
+                f"since been rewritten, so they are not applied. They are kept in the journal.")
+        if replaces is None:
+            self.show_overview()
+        elif replaces.pending_records:
+            self.add_transactions(replaces.pending_records)
+        else:
+            self.active_view_func()
+        if replaces is not None and replaces.pending_exclusions:
+            self.exclude_duplicates(None, replaces.pending_exclusions)
+
+    def on_failed(error):
+        self.file_status.config(text="❌ Load failed", foreground=COLOR_RED)
+        self.discard_loading_view()
+        messagebox.showerror("Error", f"Could not load file:\n{error}")
+
+    self.upload_btn.config(state='disabled')
+    self.tasks.submit(f"Loading {os.path.basename(file_path)}…", _load_ledger_task, file_path, currency,
+                      on_done=on_loaded, on_error=on_failed)
+
+
+# --- 👁️ Watch Mode Methods 👁️ ---
+
+def check_watched_file(self):
+    """Timer: picks up rows appended to the active ledger's file while watch mode is on."""
+    self.root.after(POLL_MS, self.check_watched_file)
+    watcher = self.watcher
+    busy = [task for task in (self.watch_task, self.compaction_task)
+            if task is not None and not task.future.done()]
+    if not self.watch_var.get() or watcher is None or busy or not watcher.changed():
+        return  # a running compaction rewrites the file itself; it resets the watcher when done
+    ledger, currency = self.workspace.active, self.fx.currency
+
+    def on_polled(result):
+        self.watch_task = None
+        if result is None or ledger is not self.workspace.active or currency != self.fx.currency:
+            return  # switched away (or converted): the rows are read again on the next poll
+        action, rows, position = result
+        if action == APPEND:
+            watcher.advance(position)
+            if rows is not None and len(rows):
+                self.ingest_appended_rows(rows)
+        else:
+            self.stash_ledger()
+            self.watcher = ledger.watcher = None  # until the fresh copy brings its own
+            self.file_status.config(text=f"🔄 {ledger.name} changed, reloading…", foreground=COLOR_TEXT_SUBTLE)
+            self.open_ledger(ledger.file_path, replaces=ledger)
+
+    def on_failed(error):
+        self.watch_task = None
+        self.file_status.config(text=f"⚠️ Watch failed: {error}", foreground=COLOR_RED)
+
+    def on_cancelled():
+        self.watch_task = None
+
+    self.watch_task = self.tasks.submit(f"Checking {ledger.name}…", _watch_ledger_task, watcher,
+                                        self.journal, currency, on_done=on_polled, on_error=on_failed,
+                                        on_cancel=on_cancelled, cancellable=False)
+
+
+def ingest_appended_rows(self, rows):
+    """Folds typed rows appended to the source file into the store, aggregates and indexes."""
+    from app_store import concat_typed
+
+    start = len(self.df)
+    self.df = concat_typed([self.df, rows])
+    self.aggregates.accumulate(self.df.iloc[start:])
+    self.fx.clear()
+    self.index_appended_rows(start)
+    self.file_status.config(
+        text=f"🔄 {len(rows):,} new row(s) from {os.path.basename(self.file_path)}\n{len(self.df):,} transactions",
+        foreground=COLOR_GREEN
+    )
+    self.active_view_func()
+    self.flag_duplicates()
+
+
+@instrument()
+def save_to_excel(self):
+    """Appends unsaved changes to the journal, then compacts the source file in the background."""
+    if self.df is None or not self.file_path:
+        messagebox.showwarning("Warning", "No file loaded to save.")
+        return
+
+    try:
+        offset = self.journal.append(self.pending_records,
+                                     dict(self.budgets) if self.budgets_dirty else None,
+                                     self.pending_exclusions)
+    except OSError as e:
+        messagebox.showerror("Error", f"Could not save changes:\n{e}")
+        return
+    saved, excluded = len(self.pending_records), len(self.pending_exclusions)
+    self.pending_records = []
+    self.pending_exclusions = []
+    self.budgets_dirty = False
+    self.file_status.config(text=f"✅ Saved {saved:,} new transaction(s)"
+                                 + (f", {excluded:,} duplicate(s) excluded" if excluded else ""),
+                            foreground=COLOR_GREEN)
+    messagebox.showinfo("Saved", f"Changes saved to {os.path.basename(self.file_path)}")
+
+    if self.compaction_task is not None and not self.compaction_task.future.done():
+        return  # the running compaction leaves newer entries in the journal for the next save
+
+    watcher = self.watcher
+
+    def on_compacted(file_path):
+        self.compaction_task = None
+        if watcher is not None:
+            watcher.reset()  # the rewrite is ours, not an external change
+        self.file_status.config(text=f"✅ Saved: {os.path.basename(file_path)}", foreground=COLOR_GREEN)
+
+    def on_failed(error):
+        # The journal still holds every change, so nothing is lost; the next save retries.
+        self.compaction_task = None
+        self.file_status.config(text=f"⚠️ Compaction failed: {error}", foreground=COLOR_RED)
+
+    def on_cancelled():
+        self.compaction_task = None
+        if watcher is not None:
+            watcher.reset()  # the worker may have rewritten the file before it stopped
+
+    # The frame is replaced (never mutated) on add, so the worker can read this snapshot safely.
+    self.compaction_task = self.tasks.submit(
+        "Compacting ledger…", _compact_ledger_task, self.journal, self.df, dict(self.budgets),
+        self.aggregates.cubes(), offset, on_done=on_compacted, on_error=on_failed,
+        on_cancel=on_cancelled, cancellable=False)
+
+
+def add_transaction(self, record):
+    """Appends a single transaction record to the store and refreshes the active view."""
+    self.add_transactions([record])
+
+
+def add_transactions(self, records):
+    """Appends unsaved transaction records to the store and refreshes the active view.
+
+    Raises ValueError (before changing anything) for a currency without FX rates.
+    """
+    from app_currency import convert
+    from app_store import concat_typed, public_columns, typed_records
+
+    rows, _ = convert(typed_records(records), self.fx.currency)
+    start = len(self.df)
+    self.df = concat_typed([self.df, rows])
+    self.aggregates.apply(self.df.iloc[start:].to_dict('records'))
+    self.fx.clear()
+    self.pending_records.extend(public_columns(self.df.iloc[start:]).to_dict('records'))
+    self.index_appended_rows(start)
+    self.active_view_func()
+
+
+def index_appended_rows(self, start):
+    """Brings the search/top-N indexes and the filter bar up to date with rows from start on."""
+    self.search_index.extend(self.df, start)
+    self.top_index.extend(self.df, start)
+    added = self.df.iloc[start:]
+    if len(added):
+        first, last = added['Date'].min(), added['Date'].max()
+        for category in added['Category'].astype(str).unique():
+            self.filter_bar.include(first, category)
+        self.filter_bar.include(last, str(added['Category'].iat[-1]))
+    self.filter_bar.set_summary(*self.ledger_filter.summary(self.df, self.aggregates))
+
+
+def open_add_transaction_window(self):
+    """Modal window for entering a new transaction."""
+    if self.df is None:
+        return
+    from tkcalendar import DateEntry
+    from app_store import TRANSACTION_TYPES
+
+    win = Toplevel(self.root)
+    win.title("➕ Add Transaction")
+    win.configure(bg=COLOR_BG)
+    win.transient(self.root)
+    win.grab_set()
+
+    form = ttk.Frame(win, style='Card.TFrame')
+    form.pack(fill='both', expand=True, padx=20, pady=20)
+
+    ttk.Label(form, text="Date:", background=COLOR_CARD).grid(row=0, column=0, sticky='w', padx=10, pady=8)
+    date_entry = DateEntry(form, date_pattern='yyyy-mm-dd', width=18)
+    date_entry.grid(row=0, column=1, sticky='ew', padx=10, pady=8)
+
+    ttk.Label(form, text="Type:", background=COLOR_CARD).grid(row=1, column=0, sticky='w', padx=10, pady=8)
+    type_combo = ttk.Combobox(form, values=TRANSACTION_TYPES, state='readonly', width=18)
+    type_combo.set('Expense')
+    type_combo.grid(row=1, column=1, sticky='ew', padx=10, pady=8)
+
+    ttk.Label(form, text="Category:", background=COLOR_CARD).grid(row=2, column=0, sticky='w', padx=10, pady=8)
+    # Left blank, the category comes from the categorization rules.
+    category_combo = ttk.Combobox(form, values=sorted(self.df['Category'].cat.categories), width=18)
+    category_combo.grid(row=2, column=1, sticky='ew', padx=10, pady=8)
+
+    ttk.Label(form, text="Description:", background=COLOR_CARD).grid(row=3, column=0, sticky='w', padx=10, pady=8)
+    desc_entry = ttk.Entry(form, width=30)
+    desc_entry.grid(row=3, column=1, sticky='ew', padx=10, pady=8)
+
+    ttk.Label(form, text="Amount:", background=COLOR_CARD).grid(row=4, column=0, sticky='w', padx=10, pady=8)
+    amount_entry = ttk.Entry(form, width=20)
+    amount_entry.grid(row=4, column=1, sticky='ew', padx=10, pady=8)
+    currencies = sorted(set(self.currency_choices()) | set(self.df['Currency'].cat.categories))
+    currency_combo = ttk.Combobox(form, values=currencies, state='readonly', width=6)
+    currency_combo.set(display_currency())
+    currency_combo.grid(row=4, column=2, sticky='w', padx=(0, 10), pady=8)
+
+    def submit():
+        from app_categorize import UNCATEGORIZED, active_categorizer
+
+        category = category_combo.get().strip()
+        try:
+            amount = float(amount_entry.get())
+        except ValueError:
+            messagebox.showerror("Error", "Amount must be a number.", parent=win)
+            return
+        if amount <= 0:
+            messagebox.showerror("Error", "A positive amount is required.", parent=win)
+            return
+        if not category:  # left blank: the categorization rules decide
+            category = active_categorizer().category_for(desc_entry.get().strip(), amount) or UNCATEGORIZED
+
+        try:
+            self.add_transaction({
+                'Date': datetime.combine(date_entry.get_date(), datetime.min.time()),
+                'Category': category,
+                'Description': desc_entry.get().strip(),
+                'Type': type_combo.get(),
+                'Amount': amount,
+                'Currency': currency_combo.get(),
+            })
+        except ValueError as e:  # no FX rates for the chosen currency
+            messagebox.showerror("Error", str(e), parent=win)
+            return
+        win.destroy()
+
+    ttk.Button(form, text="Add", command=submit, style='Accent.TButton',
+               cursor='hand2').grid(row=5, column=0, columnspan=3, sticky='ew', padx=10, pady=(15, 10))
+
+
+# --- 🧹 Duplicate Review Methods 🧹 ---
+
+def report_duplicates(self, found):
+    """Notes flagged duplicates under the file status so they get reviewed."""
+    if len(found):
+        self.file_status.config(
+            text=f"{self.file_status.cget('text')}\n🧹 {len(found):,} likely duplicate(s) to review")
+
+
+def flag_duplicates(self):
+    """Re-checks the active ledger for duplicates in the background (after rows were appended)."""
+    df, aggregates = self.df, self.aggregates
+
+    def on_done(found):
+        if self.df is not df:
+            return  # edited meanwhile; the Duplicate Review view re-checks lazily
+        aggregates.duplicates(df, found)
+        self.report_duplicates(found)
+        if self.active_view_func == self.show_duplicates:
+            self.show_duplicates()
+
+    def on_failed(error):
+        self.file_status.config(text=f"⚠️ Duplicate check failed: {error}", foreground=COLOR_RED)
+
+    self.tasks.submit("Checking for duplicates…", _find_duplicates_task, df,
+                      on_done=on_done, on_error=on_failed)
+
+
+def exclude_duplicates(self, positions, keys=None):
+    """Removes confirmed duplicates from the store and every aggregate in the background.
+
+    Rows are given by position, or by exclusion keys (carried over from a reloaded copy).
+    The exclusions are journaled with the next save.
+    """
+    before, ledger = self.df, self.workspace.active
+
+    def on_done(result):
+        if result is None:
+            return
+        if ledger is not self.workspace.active or self.df is not before:
+            self.file_status.config(text="⚠️ Ledger changed meanwhile; review the duplicates again",
+                                    foreground=COLOR_RED)
+            return
+        df, aggregates, search_index, filter_index, top_index, keys = result
+        aggregates.version = self.workspace.next_version()
+        self.df, self.aggregates = df, aggregates
+        self.search_index, self.top_index = search_index, top_index
+        self.setup_filter(filter_index)
+        self.fx.clear()
+        self.pending_exclusions.extend(keys)
+        self.stash_ledger()
+        self.update_ledger_switcher()
+        self.file_status.config(
+            text=f"🧹 Excluded {len(keys):,} duplicate(s)\n{len(self.df):,} transactions (save to keep)",
+            foreground=COLOR_GREEN)
+        self.active_view_func()
+
+    def on_failed(error):
+        messagebox.showerror("Error", f"Could not exclude duplicates:\n{error}")
+
+    self.tasks.submit("Excluding duplicates…", _exclude_rows_task, before, self.aggregates.cubes(),
+                      positions, keys, on_done=on_done, on_error=on_failed)
+
+
+# --- 💱 Currency Methods 💱 ---
+
+def currency_choices(self):
+    """Currencies the local rate table can convert between."""
+    from app_currency import active_rates
+
+    return active_rates().currencies
+
+
+def refresh_currency_choices(self):
+    self.currency_combo['values'] = self.currency_choices()
+
+
+def on_currency_selected(self, event=None):
+    self.convert_active_ledger()
+
+
+def convert_active_ledger(self, force=False):
+    """Brings the active ledger's amounts into the chosen display currency.
+
+    A currency shown before is swapped back in from the ledger's DisplayConversions;
+    otherwise the conversion runs on a worker. force re-converts after the rates changed.
+    """
+    from app_currency import set_display_currency
+
+    currency = self.currency_var.get()
+    if self.df is None:
+        set_display_currency(currency)
+        return
+    if self.fx.currency == currency and not force:
+        return
+    if not force:
+        self.fx.stash(self.df['Amount'].to_numpy(), self.aggregates,
+                      self.ledger_filter.current_index(self.aggregates), self.top_index)
+        cached = self.fx.get(currency)
+        if cached is not None:
+            amounts, aggregates, filter_index, top_index = cached
+            self.use_conversion(currency, self.df.assign(Amount=amounts), aggregates, filter_index, top_index)
+            return
+
+    before, ledger = self.df, self.workspace.active
+
+    def on_done(result):
+        if ledger is not self.workspace.active:
+            return  # converted when it is activated again
+        if self.df is not before:
+            self.convert_active_ledger(force)  # edited meanwhile; convert the current rows
+            return
+        self.use_conversion(currency, *result)
+
+    def on_failed(error):
+        self.currency_var.set(self.fx.currency)
+        messagebox.showerror("Error", f"Could not convert amounts to {currency}:\n{error}")
+
+    def on_cancelled():
+        if ledger is self.workspace.active:
+            self.currency_var.set(self.fx.currency)  # the picker shows what is on screen again
+
+    self.tasks.submit(f"Converting to {currency}…", _convert_ledger_task, self.df, currency,
+                      on_done=on_done, on_error=on_failed, on_cancel=on_cancelled)
+
+
+def use_conversion(self, currency, df, aggregates, filter_index, top_index):
+    """Makes a converted copy of the active ledger current and redraws the view."""
+    from app_currency import set_display_currency
+
+    aggregates.version = self.workspace.next_version()
+    self.df, self.aggregates, self.top_index = df, aggregates, top_index
+    self.fx.currency = currency
+    set_display_currency(currency)
+    self.setup_filter(filter_index)
+    self.stash_ledger()
+    self.active_view_func()
+
+
+def budget_factor(self):
+    """Multiplier from the budgets' currency (BASE_CURRENCY) to the display currency."""
+    from app_currency import BASE_CURRENCY, active_rates
+
+    currency = display_currency()
+    return 1.0 if currency == BASE_CURRENCY else active_rates().latest_factor(BASE_CURRENCY, currency)
+
+
+def import_fx_rates(self):
+    """Merges a CSV of daily rates (Date, Currency, Rate in BASE_CURRENCY) into the local table."""
+    import pandas as pd
+    from app_currency import active_rates
+
+    path = filedialog.askopenfilename(
+        title="Select FX Rate File",
+        filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+    )
+    if not path:
+        return
+    try:
+        table = active_rates().merged(pd.read_csv(path))
+        table.save()
+    except (OSError, ValueError) as e:
+        messagebox.showerror("Error", f"Could not import FX rates:\n{e}")
+        return
+    self.refresh_currency_choices()
+    self.file_status.config(text=f"💱 {len(table.rates):,} FX rates for {', '.join(table.currencies)}",
+                            foreground=COLOR_GREEN)
+    for ledger in self.workspace.ledgers.values():
+        ledger.fx.clear()  # converted with the old rates
+    if self.df is not None:
+        self.convert_active_ledger(force=True)
+
+
+# --- 🏷️ Categorization Rule Methods 🏷️ ---
+
+def open_rules_window(self):
+    """Window for editing the auto-categorization rules and re-applying them to the open ledger."""
+    from app_categorize import Rule, load_rules, save_rules
+
+    rules = load_rules()
+    win = Toplevel(self.root)
+    win.title("🏷️ Categorization Rules")
+    win.configure(bg=COLOR_BG)
+    win.transient(self.root)
+
+    frame = ttk.Frame(win, style='Card.TFrame')
+    frame.pack(fill='both', expand=True, padx=20, pady=20)
+    ttk.Label(frame, text="First matching rule wins. Rules fill blank categories unless "
+                          "'override' is set.", background=COLOR_CARD,
+              foreground=COLOR_TEXT_SUBTLE).grid(row=0, column=0, columnspan=4, sticky='w', padx=10, pady=(10, 5))
+
+    tree = ttk.Treeview(frame, columns=('Category', 'When', 'Override'), show='headings', height=10,
+                        style='Treeview')
+    for column, width in (('Category', 160), ('When', 320), ('Override', 80)):
+        tree.heading(column, text=column)
+        tree.column(column, width=width, anchor='w')
+    tree.grid(row=1, column=0, columnspan=4, sticky='nsew', padx=10, pady=5)
+
+    def refresh():
+        tree.delete(*tree.get_children())
+        for i, rule in enumerate(rules):
+            tree.insert('', 'end', iid=str(i), values=(rule.category, rule.describe(),
+                                                      'yes' if rule.override else ''))
+
+    entries = {}
+    for row, (label, key) in enumerate((("Category:", 'category'), ("Description contains:", 'contains'),
+                                        ("Description regex:", 'regex'), ("Min amount:", 'min_amount'),
+                                        ("Max amount:", 'max_amount')), start=2):
+        ttk.Label(frame, text=label, background=COLOR_CARD).grid(row=row, column=0, sticky='w', padx=10, pady=4)
+        entries[key] = ttk.Entry(frame, width=30)
+        entries[key].grid(row=row, column=1, columnspan=3, sticky='ew', padx=10, pady=4)
+    override_var = tk.BooleanVar(value=False)
+    ttk.Checkbutton(frame, text="Override existing categories", variable=override_var) \
+        .grid(row=7, column=1, columnspan=3, sticky='w', padx=10, pady=4)
+
+    def add_rule():
+        values = {key: entry.get().strip() for key, entry in entries.items()}
+        try:
+            amounts = {key: float(values[key]) if values[key] else None for key in ('min_amount', 'max_amount')}
+            if not values['category']:
+                raise ValueError("A category is required.")
+            rule = Rule(values['category'], contains=values['contains'], regex=values['regex'],
+                        override=override_var.get(), **amounts)
+        except (ValueError, re.error) as e:
+            messagebox.showerror("Error", f"Invalid rule:\n{e}", parent=win)
+            return
+        rules.append(rule)
+        for entry in entries.values():
+            entry.delete(0, 'end')
+        refresh()
+
+    def remove_rule():
+        for iid in sorted(tree.selection(), key=int, reverse=True):
+            del rules[int(iid)]
+        refresh()
+
+    def move_up():
+        selected = [int(iid) for iid in tree.selection()]
+        if len(selected) == 1 and selected[0] > 0:
+            i = selected[0]
+            rules[i - 1], rules[i] = rules[i], rules[i - 1]
+            refresh()
+            tree.selection_set(str(i - 1))
+
+    def save_and_apply():
+        try:
+            save_rules(rules)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not save rules:\n{e}", parent=win)
+            return
+        win.destroy()
+        self.apply_categorization_rules()
+
+    buttons = ttk.Frame(frame, style='Card.TFrame')
+    buttons.grid(row=8, column=0, columnspan=4, sticky='ew', padx=10, pady=(10, 10))
+    for text, command, style in (("➕ Add Rule", add_rule, 'TButton'), ("⬆ Move Up", move_up, 'TButton'),
+                                 ("🗑 Remove", remove_rule, 'TButton'),
+                                 ("💾 Save & Apply", save_and_apply, 'Accent.TButton')):
+        ttk.Button(buttons, text=text, command=command, style=style, cursor='hand2').pack(side='left', padx=5)
+    frame.columnconfigure(1, weight=1)
+    refresh()
+
+
+def apply_categorization_rules(self):
+    """Re-applies the saved rules to the open ledger in the background."""
+    from app_categorize import active_categorizer
+
+    if self.df is None:
+        return
+    ledger = self.workspace.active
+
+    def on_done(result):
+        if result is None:
+            self.file_status.config(text="🏷️ Rules changed no categories", foreground=COLOR_TEXT_SUBTLE)
+            return
+        if ledger is not self.workspace.active or len(self.df) != len(result[0]):
+            self.file_status.config(text="⚠️ Ledger changed meanwhile; apply the rules again",
+                                    foreground=COLOR_RED)
+            return
+        df, aggregates, search_index, filter_index, top_index = result
+        aggregates.version = self.workspace.next_version()
+        self.df, self.aggregates = df, aggregates
+        self.search_index, self.top_index = search_index, top_index
+        self.setup_filter(filter_index)
+        self.fx.clear()
+        self.stash_ledger()
+        self.file_status.config(text="🏷️ Categories updated from rules", foreground=COLOR_GREEN)
+        self.active_view_func()
+
+    def on_failed(error):
+        messagebox.showerror("Error", f"Could not apply rules:\n{error}")
+
+    self.tasks.submit("Applying categorization rules…", _recategorize_task, self.df, active_categorizer(),
+                      on_done=on_done, on_error=on_failed)
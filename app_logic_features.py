@@ -1,268 +1,235 @@
     # --- 📊 Visualization Methods 📊 ---
 
+    @instrument()
     def show_overview(self):
         if self.df is None: return
         self.clear_content_frame()
+        self.show_filter_bar()
         self.set_active_button(self.show_overview)
-
-        kpi_frame = ttk.Frame(self.content_frame, style='Content.TFrame')
-        kpi_frame.pack(fill='x', padx=10, pady=10)
-        
-        income = self.df[self.df['Type'] == 'Income']['Amount'].sum()
-        expenses = self.df[self.df['Type'] == 'Expense']['Amount'].sum()
-        balance = income - expenses
-        
-        self.create_kpi_card(kpi_frame, "Total Income", f"₹{income:,.2f}", COLOR_GREEN)
-        self.create_kpi_card(kpi_frame, "Total Expenses", f"₹{expenses:,.2f}", COLOR_RED)
-        self.create_kpi_card(kpi_frame, "Net Balance", f"₹{balance:,.2f}", 
-                             COLOR_GREEN if balance >= 0 else COLOR_RED)
-
-        # Use the scrollable container
-        charts_frame = self.create_scrollable_container()
-
-        # --- Pie Chart: Spending by Category ---
-        fig1 = Figure(figsize=(10, 6), dpi=100)
-        ax1 = fig1.add_subplot(111)
-        expense_data = self.df[self.df['Type'] == 'Expense'].groupby('Category')['Amount'].sum()
-        colors = plt.cm.Pastel2(np.linspace(0, 1, len(expense_data)))
-        
-        if not expense_data.empty:
-            wedges, texts, autotexts = ax1.pie(
-                expense_data.values, 
-                autopct='%1.1f%%',
-                startangle=90, 
-                colors=colors, 
-                pctdistance=0.85,
-                wedgeprops={'edgecolor': COLOR_TEXT, 'linewidth': 1}
-            )
-            for autotext in autotexts:
-                autotext.set_color(COLOR_BG)
-                autotext.set_fontweight('bold')
-            ax1.legend(expense_data.index, loc='center left', bbox_to_anchor=(1, 0, 0.5, 1), fontsize=9)
-        else:
-            ax1.text(0.5, 0.5, "No Expense Data", horizontalalignment='center', verticalalignment='center', 
-                     transform=ax1.transAxes, color=COLOR_TEXT_SUBTLE, fontsize=15)
-            
-        ax1.set_title('Spending by Category')
-        self.style_matplotlib_fig(fig1, ax1)
-        
-        canvas1 = FigureCanvasTkAgg(fig1, charts_frame)
-        canvas1.draw()
-        canvas1.get_tk_widget().pack(fill='x', expand=True, padx=10, pady=10)
-
-        # --- Bar Chart: Income vs Expense ---
-        fig2 = Figure(figsize=(10, 6), dpi=100)
-        ax2 = fig2.add_subplot(111)
-        
-        bar_colors = [COLOR_GREEN, COLOR_RED]
-        bars = ax2.bar(['Income', 'Expenses'], [income, expenses], color=bar_colors)
-        
-        for bar in bars:
-            height = bar.get_height()
-            ax2.text(bar.get_x() + bar.get_width()/2., height,
-                    f'₹{height:,.0f}',
-                    ha='center', va='bottom', color=COLOR_TEXT, fontweight='bold')
-                    
-        ax2.set_title('Total Income vs Expenses')
-        ax2.set_ylabel('Amount (₹)')
-        self.style_matplotlib_fig(fig2, ax2)
-        
-        canvas2 = FigureCanvasTkAgg(fig2, charts_frame)
-        canvas2.draw()
-        canvas2.get_tk_widget().pack(fill='x', expand=True, padx=10, pady=10)
-
-        self.root.update_idletasks()
-        self.on_scrollframe_configure()
-
+        from app_charts import OverviewPie, TotalsBars
+
+        def render(view):
+            with profiler.span('prep.overview'):
+                df, aggregates = self.view_data()
+                income, expenses = self.ledger_filter.totals(self.df, self.aggregates)
+                by_category = aggregates.expense_by_category(df)
+            balance = income - expenses
+
+            for widget in view.header.winfo_children():
+                widget.destroy()
+            self.create_kpi_card(view.header, "Total Income", money(income), COLOR_GREEN)
+            self.create_kpi_card(view.header, "Total Expenses", money(expenses), COLOR_RED)
+            self.create_kpi_card(view.header, "Net Balance", money(balance), 
+                                 COLOR_GREEN if balance >= 0 else COLOR_RED)
+
+            pie, bars = view.charts
+            pie.render(by_category)
+            bars.render((income, expenses))
+
+        self.chart_views.show('overview', self.content_frame,
+                              lambda: [OverviewPie(self.style_matplotlib_fig), TotalsBars(self.style_matplotlib_fig)],
+                              self.view_version(), render, scrollable=True)
+
+    @instrument()
+    def show_consolidated(self):
+        if self.df is None: return
+        self.clear_content_frame()
+        self.filter_bar.hide()
+        self.set_active_button(self.show_consolidated)
+        self.stash_ledger()
+        from app_charts import OverviewPie, YearlyBars
+
+        def render(view):
+            with profiler.span('prep.consolidated'):
+                aggregates = self.workspace.combined()
+                income, expenses = aggregates.totals(None)
+                by_category = aggregates.expense_by_category(None)
+                ledgers = list(self.workspace.ledgers.values())
+                summed = len(self.workspace.in_display_currency())
+                rows = [(ledger, ledger.aggregates.totals(ledger.df)) for ledger in ledgers]
+            balance = income - expenses
+
+            for widget in view.header.winfo_children():
+                widget.destroy()
+            kpis = ttk.Frame(view.header, style='Content.TFrame')
+            kpis.pack(fill='x')
+            self.create_kpi_card(kpis, f"Income · {summed} ledgers", money(income), COLOR_GREEN)
+            self.create_kpi_card(kpis, "Expenses", money(expenses), COLOR_RED)
+            self.create_kpi_card(kpis, "Net Balance", money(balance),
+                                 COLOR_GREEN if balance >= 0 else COLOR_RED)
+
+            tree = ttk.Treeview(view.header, columns=('Ledger', 'Transactions', 'Income', 'Expenses', 'Memory'),
+                                show='headings', height=min(len(ledgers), 8), style='Treeview')
+            for column, width, anchor in (('Ledger', 260, 'w'), ('Transactions', 120, 'e'),
+                                          ('Income', 150, 'e'), ('Expenses', 150, 'e'), ('Memory', 140, 'e')):
+                tree.heading(column, text=column)
+                tree.column(column, width=width, anchor=anchor)
+            for ledger, (ledger_income, ledger_expenses) in rows:
+                memory = f"{ledger.memory_bytes() / 2**20:,.1f} MB" if ledger.loaded else "💤 on disk"
+                tree.insert('', 'end', values=(
+                    f"{'▶ ' if ledger is self.workspace.active else ''}{ledger.name}",
+                    f"{ledger.rows:,}", money(ledger_income, currency=ledger.fx.currency),
+                    money(ledger_expenses, currency=ledger.fx.currency), memory))
+            tree.pack(fill='x', padx=10, pady=(10, 0))
+            if summed < len(ledgers):
+                ttk.Label(view.header, text=f"ℹ️ Totals include only the ledgers shown in {display_currency()}; "
+                                            f"open the others once to convert them.",
+                          background=COLOR_CONTENT_BG, foreground=COLOR_TEXT_SUBTLE).pack(anchor='w', padx=10)
+
+            pie, bars = view.charts
+            pie.render(by_category)
+            bars.render(aggregates.yearly(None))
+
+        self.chart_views.show('consolidated', self.content_frame,
+                              lambda: [OverviewPie(self.style_matplotlib_fig), YearlyBars(self.style_matplotlib_fig)],
+                              self.workspace.key(), render, scrollable=True)
+
+    @instrument()
     def show_category_pie(self):
         if self.df is None: return
         self.clear_content_frame()
+        self.show_filter_bar()
         self.set_active_button(self.show_category_pie)
+        from app_charts import CategoryPie
 
-        fig = Figure(figsize=(12, 8), dpi=100)
-        ax = fig.add_subplot(111)
-        
-        expense_data = self.df[self.df['Type'] == 'Expense'].groupby('Category')['Amount'].sum().sort_values(ascending=False)
-        
-        if not expense_data.empty:
-            colors = plt.cm.Set3(np.linspace(0, 1, len(expense_data)))
-            wedges, texts, autotexts = ax.pie(
-                expense_data.values, 
-                autopct='%1.1f%%', 
-                startangle=90,
-                colors=colors, 
-                pctdistance=0.85,
-                wedgeprops={'edgecolor': COLOR_TEXT, 'linewidth': 1}
-            )
-            for autotext in autotexts:
-                autotext.set_color(COLOR_BG)
-                autotext.set_fontweight('bold')
-            legend_labels = [f'{cat}: ₹{amt:,.2f}' for cat, amt in expense_data.items()]
-            ax.legend(legend_labels, loc='center left', bbox_to_anchor=(1, 0, 0.5, 1), fontsize=10)
-        else:
-            ax.text(0.5, 0.5, "No Expense Data", horizontalalignment='center', verticalalignment='center', 
-                     transform=ax.transAxes, color=COLOR_TEXT_SUBTLE, fontsize=15)
-            
-        ax.set_title('Spending Breakdown by Category', fontsize=18, fontweight='bold')
-        self.style_matplotlib_fig(fig, ax)
-        
-        canvas = FigureCanvasTkAgg(fig, self.content_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True, padx=20, pady=20)
+        self.chart_views.show(
+            'category_pie', self.content_frame, lambda: [CategoryPie(self.style_matplotlib_fig)],
+            self.view_version(),
+            lambda view: view.charts[0].render(self.view_aggregate('expense_by_category').sort_values(ascending=False)))
 
+    @instrument()
     def show_income_expense(self):
         if self.df is None: return
         self.clear_content_frame()
+        self.show_filter_bar()
         self.set_active_button(self.show_income_expense)
+        from app_charts import IncomeExpenseBars
 
-        fig = Figure(figsize=(12, 7), dpi=100)
-        ax = fig.add_subplot(111)
-        
-        monthly = self.df.copy()
-        monthly['Month'] = monthly['Date'].dt.to_period('M').astype(str)
-        monthly_summary = monthly.groupby(['Month', 'Type'])['Amount'].sum().unstack(fill_value=0)
-        
-        if not monthly_summary.empty:
-            x = np.arange(len(monthly_summary))
-            width = 0.35
-            
-            if 'Income' in monthly_summary.columns:
-                ax.bar(x - width/2, monthly_summary['Income'],
-                       width, label='Income', color=COLOR_GREEN)
-            if 'Expense' in monthly_summary.columns:
-                ax.bar(x + width/2, monthly_summary['Expense'],
-                       width, label='Expenses', color=COLOR_RED)
-                
-            ax.set_xticks(x)
-            ax.set_xticklabels(monthly_summary.index, rotation=45, ha='right')
-            ax.legend()
-        else:
-            ax.text(0.5, 0.5, "No Data to Display", horizontalalignment='center', verticalalignment='center', 
-                     transform=ax.transAxes, color=COLOR_TEXT_SUBTLE, fontsize=15)
-            
-        ax.set_title('Monthly Income vs Expenses', fontsize=18)
-        ax.set_xlabel('Month')
-        ax.set_ylabel('Amount (₹)')
-        self.style_matplotlib_fig(fig, ax)
-        
-        canvas = FigureCanvasTkAgg(fig, self.content_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True, padx=20, pady=20)
+        self.chart_views.show(
+            'income_expense', self.content_frame, lambda: [IncomeExpenseBars(self.style_matplotlib_fig)],
+            self.view_version(), lambda view: view.charts[0].render(self.view_aggregate('daily')))
 
+    @instrument()
     def show_monthly_trends(self):
         if self.df is None: return
         self.clear_content_frame()
+        self.show_filter_bar()
         self.set_active_button(self.show_monthly_trends)
+        from app_charts import MonthlyTrend
 
-        fig = Figure(figsize=(12, 7), dpi=100)
-        ax = fig.add_subplot(111)
-        
-        monthly = self.df.copy()
-        monthly['Month'] = monthly['Date'].dt.to_period('M').astype(str)
-        monthly_summary = monthly.groupby(['Month', 'Type'])['Amount'].sum().unstack(fill_value=0)
-        
-        if not monthly_summary.empty:
-            if 'Income' in monthly_summary.columns:
-                ax.plot(monthly_summary.index, monthly_summary['Income'],
-                        marker='o', linewidth=3, label='Income', color=COLOR_GREEN, markersize=8)
-            if 'Expense' in monthly_summary.columns:
-                ax.plot(monthly_summary.index, monthly_summary['Expense'],
-                        marker='s', linewidth=3, label='Expenses', color=COLOR_RED, markersize=8)
-            ax.legend(fontsize=12)
-            plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
-        else:
-            ax.text(0.5, 0.5, "No Data to Display", horizontalalignment='center', verticalalignment='center', 
-                     transform=ax.transAxes, color=COLOR_TEXT_SUBTLE, fontsize=15)
-            
-        ax.set_title('Monthly Financial Trends', fontsize=18)
-        ax.set_xlabel('Month')
-        ax.set_ylabel('Amount (₹)')
-        ax.grid(True, alpha=0.3, color=COLOR_BORDER, linestyle='--')
-        
-        self.style_matplotlib_fig(fig, ax)
-        
-        canvas = FigureCanvasTkAgg(fig, self.content_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True, padx=20, pady=20)
+        self.chart_views.show(
+            'monthly_trends', self.content_frame, lambda: [MonthlyTrend(self.style_matplotlib_fig)],
+            self.view_version(), lambda view: view.charts[0].render(self.view_aggregate('daily')))
 
+    @instrument()
     def show_yearly_summary(self):
         if self.df is None: return
         self.clear_content_frame()
+        self.show_filter_bar()
         self.set_active_button(self.show_yearly_summary)
+        from app_charts import YearlyBars
 
-        fig = Figure(figsize=(12, 7), dpi=100)
-        ax = fig.add_subplot(111)
-        
-        yearly_df = self.df.copy()
-        yearly_df['Year'] = yearly_df['Date'].dt.year
-        yearly_summary = yearly_df.groupby(['Year', 'Type'])['Amount'].sum().unstack(fill_value=0)
-        
-        if not yearly_summary.empty:
-            x = np.arange(len(yearly_summary))
-            width = 0.35
-            
-            if 'Income' in yearly_summary.columns:
-                ax.bar(x - width/2, yearly_summary['Income'],
-                       width, label='Income', color=COLOR_GREEN)
-            if 'Expense' in yearly_summary.columns:
-                ax.bar(x + width/2, yearly_summary['Expense'],
-                       width, label='Expenses', color=COLOR_RED)
-            
-            ax.set_xticks(x)
-            ax.set_xticklabels(yearly_summary.index)
-            ax.legend()
-        else:
-            ax.text(0.5, 0.5, "No Data to Display", horizontalalignment='center', verticalalignment='center', 
-                     transform=ax.transAxes, color=COLOR_TEXT_SUBTLE, fontsize=15)
-            
-        ax.set_title('Yearly Income vs Expenses', fontsize=18)
-        ax.set_xlabel('Year')
-        ax.set_ylabel('Amount (₹)')
-        
-        self.style_matplotlib_fig(fig, ax)
-        
-        canvas = FigureCanvasTkAgg(fig, self.content_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True, padx=20, pady=20)
+        self.chart_views.show(
+            'yearly_summary', self.content_frame, lambda: [YearlyBars(self.style_matplotlib_fig)],
+            self.view_version(), lambda view: view.charts[0].render(self.view_aggregate('yearly')))
 
+    @instrument()
     def show_top_expenses(self):
         if self.df is None: return
         self.clear_content_frame()
+        self.show_filter_bar()
+        self.chart_views.hide()
         self.set_active_button(self.show_top_expenses)
+        import numpy as np
+
+        with profiler.span('prep.top_expenses'):
+            allowed = None
+            positions = self.ledger_filter.positions(self.df, self.aggregates)
+            if positions is not None:
+                allowed = np.zeros(len(self.df), dtype=bool)
+                allowed[positions] = True
+            if self.top_group == 'Per Category':
+                groups = self.top_index.top_by(self.df, 'category', self.top_n, allowed)
+            elif self.top_group == 'Per Month':
+                groups = {month.strftime('%B %Y'): rows for month, rows in
+                          reversed(self.top_index.top_by(self.df, 'month', self.top_n, allowed).items())}
+            else:
+                groups = {None: self.top_index.top(self.df, self.top_n, allowed)}
 
-        top_5 = self.df[self.df['Type'] == 'Expense'].nlargest(5, 'Amount')
-        
         table_frame = ttk.Frame(self.content_frame, style='Content.TFrame')
         table_frame.pack(fill='both', expand=True, padx=40, pady=20)
-        
-        title = ttk.Label(table_frame, text="🏆 Top 5 Highest Expenses",
-                          font=FONT_H1, style='TLabel', background=COLOR_CONTENT_BG)
-        title.pack(pady=20)
 
-        tree = ttk.Treeview(table_frame, columns=('Date', 'Category', 'Description', 'Amount'),
-                            show='headings', height=6, style='Treeview')
-        
+        header = ttk.Frame(table_frame, style='Content.TFrame')
+        header.pack(fill='x', pady=20)
+        title = ttk.Label(header, text=f"🏆 Top {self.top_n} Highest Expenses",
+                          font=FONT_H1, style='TLabel', background=COLOR_CONTENT_BG)
+        title.pack(side='left')
+
+        group_combo = ttk.Combobox(header, values=['Overall', 'Per Category', 'Per Month'],
+                                   state='readonly', width=14)
+        group_combo.set(self.top_group)
+        group_combo.pack(side='right', padx=5)
+        n_spin = ttk.Spinbox(header, from_=1, to=1000, width=6)
+        n_spin.set(self.top_n)
+        n_spin.pack(side='right', padx=5)
+        ttk.Label(header, text="Show top", font=FONT_BOLD,
+                  background=COLOR_CONTENT_BG).pack(side='right', padx=5)
+
+        def on_settings_changed(event=None):
+            try:
+                self.top_n = min(max(int(n_spin.get()), 1), 1000)
+            except ValueError:
+                pass
+            self.top_group = group_combo.get()
+            self.show_top_expenses()
+
+        group_combo.bind('<<ComboboxSelected>>', on_settings_changed)
+        n_spin.bind('<Return>', on_settings_changed)
+        n_spin.configure(command=on_settings_changed)
+
+        tree_frame = ttk.Frame(table_frame)
+        tree_frame.pack(fill='both', expand=True, pady=10)
+        grouped = self.top_group != 'Overall'
+        tree = ttk.Treeview(tree_frame, columns=('Date', 'Category', 'Description', 'Amount'),
+                            show='tree headings' if grouped else 'headings',
+                            height=min(self.top_n + 1, 20), style='Treeview')
+
+        tree.heading('#0', text=self.top_group.replace('Per ', ''))
         tree.heading('Date', text='Date')
         tree.heading('Category', text='Category')
         tree.heading('Description', text='Description')
         tree.heading('Amount', text='Amount')
-        
+
+        tree.column('#0', width=180 if grouped else 0, stretch=grouped)
         tree.column('Date', width=150, anchor='center')
         tree.column('Category', width=200, anchor='center')
         tree.column('Description', width=350, anchor='w')
         tree.column('Amount', width=150, anchor='e')
-        
-        for idx, row in top_5.iterrows():
-            tree.insert('', 'end', values=(
-                row['Date'].strftime('%Y-%m-%d'),
-                row['Category'],
-                row.get('Description', 'N/A'),
-                f"₹{row['Amount']:,.2f}"
-            ))
-            
-        tree.pack(fill='x', expand=True, pady=10)
-        
-        total = top_5['Amount'].sum()
-        total_label = ttk.Label(table_frame, text=f"💰 Total of Top 5: ₹{total:,.2f}",
+
+        total = 0.0
+        with profiler.span('treeview.fill'):
+            for label, rows in groups.items():
+                window = self.df.iloc[rows]
+                parent = ''
+                if grouped:
+                    parent = tree.insert('', 'end', text=label, open=True,
+                                         values=('', '', '', money(window['Amount'].sum())))
+                for date, category, description, amount in zip(
+                        window['Date'], window['Category'], window['Description'], window['Amount']):
+                    tree.insert(parent, 'end', values=(
+                        date.strftime('%Y-%m-%d'),
+                        category,
+                        description or 'N/A',
+                        money(amount)
+                    ))
+                total += window['Amount'].sum()
+
+        scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+
+        total_label = ttk.Label(table_frame, text=f"💰 Total of Top {self.top_n}: {money(total)}"
+                                if not grouped else f"💰 Total across {len(groups)} groups: {money(total)}",
                                font=FONT_H2, background=COLOR_CONTENT_BG, foreground=COLOR_YELLOW)
         total_label.pack(pady=10)
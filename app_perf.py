@@ -0,0 +1,147 @@
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+try:
+    import psutil
+except ImportError:  # memory readings fall back to /proc or resource
+    psutil = None
+
+# --- ⏱️ Hot-Path Instrumentation ⏱️ ---
+# Views, load_file and save_to_excel are wrapped with @instrument, and the expensive
+# stages inside them (pandas prep, chart render, canvas.draw, Treeview fill, Tk layout)
+# with profiler.span(...). While the profiler is disabled a wrapped call costs one
+# attribute check and span() hands back a shared no-op context manager. When enabled,
+# every span lands in a latency histogram per stage and in a bounded event buffer
+# that export_chrome_trace writes in the Chrome trace format (chrome://tracing,
+# Perfetto, speedscope).
+
+BUCKET_EDGES_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+MAX_EVENTS = 50_000
+RECENT_SAMPLES = 512
+
+_NULL_SPAN = nullcontext()
+
+
+class StageStats:
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKET_EDGES_MS) + 1)
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def add(self, ms):
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.buckets[bisect.bisect_left(BUCKET_EDGES_MS, ms)] += 1
+        self.recent.append(ms)
+
+    def percentile(self, q):
+        """q-th percentile (0-100) over the most recent samples."""
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(int(len(ordered) * q / 100), len(ordered) - 1)]
+
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class Profiler:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.stats = {}
+        self.events = deque(maxlen=MAX_EVENTS)
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+
+    def span(self, name):
+        """Context manager timing one stage; a shared no-op while disabled."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, start_ns, end_ns):
+        ms = (end_ns - start_ns) / 1e6
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = StageStats()
+            stats.add(ms)
+            self.events.append((name, start_ns, end_ns, threading.get_ident()))
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+            self.events.clear()
+
+    def snapshot(self):
+        """(name, StageStats) pairs sorted by total time, safe to read from the UI thread."""
+        with self._lock:
+            return sorted(self.stats.items(), key=lambda item: item[1].total_ms, reverse=True)
+
+    def export_chrome_trace(self, path):
+        """Writes recorded spans as Chrome trace 'complete' events; returns the event count."""
+        with self._lock:
+            events = list(self.events)
+        pid = os.getpid()
+        trace = [{'name': name, 'cat': name.split('.')[0], 'ph': 'X', 'pid': pid, 'tid': tid,
+                  'ts': (start - self._origin) / 1000, 'dur': (end - start) / 1000}
+                 for name, start, end, tid in events]
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, fh)
+        return len(trace)
+
+
+profiler = Profiler(enabled=bool(os.environ.get('DASHBOARD_PROFILE')))
+
+
+def instrument(name=None):
+    """Decorator timing every call of a function as one stage (default: its name)."""
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return fn(*args, **kwargs)
+            with _Span(profiler, label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def memory_rss():
+    """Resident set size of this process in bytes, or None when it can't be read."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as fh:
+            return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # peak, in KiB on Linux
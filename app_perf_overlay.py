@@ -0,0 +1,135 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from app_perf import BUCKET_EDGES_MS, memory_rss, profiler
+from app_theme import (COLOR_BG, COLOR_BORDER, COLOR_CARD, COLOR_PRIMARY, COLOR_TEXT,
+                       COLOR_TEXT_SUBTLE, FONT_BOLD, FONT_FAMILY, FONT_H2)
+
+# --- 📈 Performance Overlay 📈 ---
+# A small always-on-top window (toggled with F12) listing every instrumented stage
+# with its call count, p50/p95/max latency and a latency histogram over
+# BUCKET_EDGES_MS, plus process and ledger memory. Showing it turns the profiler on;
+# hiding it restores the previous state, so the hot paths go back to their no-op
+# fast path unless DASHBOARD_PROFILE is collecting for the whole session.
+
+REFRESH_MS = 500
+ROW_HEIGHT = 22
+NAME_WIDTH = 190
+STATS_WIDTH = 250
+BAR_WIDTH = 9
+
+
+def _format_bytes(n):
+    if n is None:
+        return "n/a"
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if n < 1024 or unit == 'GB':
+            return f"{n:,.0f} {unit}" if unit == 'B' else f"{n:,.1f} {unit}"
+        n /= 1024
+
+
+class PerfOverlay:
+    def __init__(self, root, ledger_bytes):
+        """ledger_bytes() returns the in-memory size of the loaded ledger (or None)."""
+        self.root = root
+        self.ledger_bytes = ledger_bytes
+        self.window = None
+        self._after_id = None
+        self._was_enabled = False   # profiler state before the overlay was shown
+
+    @property
+    def visible(self):
+        return self.window is not None
+
+    def toggle(self):
+        if self.visible:
+            self.hide()
+        else:
+            self.show()
+
+    def show(self):
+        self._was_enabled = profiler.enabled
+        profiler.enabled = True
+        win = self.window = tk.Toplevel(self.root)
+        win.title("⏱️ Performance")
+        win.configure(bg=COLOR_BG)
+        win.attributes('-topmost', True)
+        win.geometry('760x420')
+        win.protocol('WM_DELETE_WINDOW', self.hide)
+
+        toolbar = ttk.Frame(win, style='Card.TFrame')
+        toolbar.pack(fill='x', padx=10, pady=10)
+        self.memory_label = ttk.Label(toolbar, text="", style='Card.TLabel', font=FONT_BOLD)
+        self.memory_label.pack(side='left', padx=10, pady=8)
+        ttk.Button(toolbar, text="Export Trace…", command=self.export_trace,
+                   style='TButton', cursor='hand2').pack(side='right', padx=(5, 10), pady=8)
+        ttk.Button(toolbar, text="Reset", command=self.reset,
+                   style='TButton', cursor='hand2').pack(side='right', padx=5, pady=8)
+
+        self.canvas = tk.Canvas(win, bg=COLOR_CARD, highlightthickness=0)
+        self.canvas.pack(fill='both', expand=True, padx=10, pady=(0, 10))
+        self.refresh()
+
+    def hide(self):
+        profiler.enabled = self._was_enabled
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self.window is not None:
+            self.window.destroy()
+            self.window = None
+
+    def reset(self):
+        profiler.reset()
+        self.refresh()
+
+    def export_trace(self):
+        path = filedialog.asksaveasfilename(parent=self.window, title="Export Trace",
+                                            defaultextension='.json',
+                                            filetypes=[("Chrome trace", "*.json")])
+        if not path:
+            return
+        try:
+            count = profiler.export_chrome_trace(path)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not write trace:\n{e}", parent=self.window)
+            return
+        messagebox.showinfo("Exported", f"{count:,} spans written.\nOpen in chrome://tracing or Perfetto.",
+                            parent=self.window)
+
+    def refresh(self):
+        self._after_id = None
+        if self.window is None or not self.window.winfo_exists():
+            return
+        self.memory_label.config(text=f"Process: {_format_bytes(memory_rss())}    "
+                                      f"Ledger: {_format_bytes(self.ledger_bytes())}")
+        self._draw(profiler.snapshot())
+        self._after_id = self.root.after(REFRESH_MS, self.refresh)
+
+    def _draw(self, stages):
+        c = self.canvas
+        c.delete('all')
+        font = (FONT_FAMILY, 9)
+        hist_x = NAME_WIDTH + STATS_WIDTH
+        c.create_text(10, 12, text="Stage", anchor='w', fill=COLOR_TEXT, font=FONT_BOLD)
+        c.create_text(NAME_WIDTH, 12, text="calls    p50    p95    max (ms)", anchor='w',
+                      fill=COLOR_TEXT, font=FONT_BOLD)
+        c.create_text(hist_x, 12, text=f"histogram ≤{BUCKET_EDGES_MS[0]} … >{BUCKET_EDGES_MS[-1]} ms",
+                      anchor='w', fill=COLOR_TEXT, font=FONT_BOLD)
+        if not stages:
+            c.create_text(10, 40, text="No samples yet — use the dashboard.", anchor='w',
+                          fill=COLOR_TEXT_SUBTLE, font=FONT_H2)
+            return
+
+        for row, (name, stats) in enumerate(stages):
+            y = 30 + row * ROW_HEIGHT
+            c.create_text(10, y + ROW_HEIGHT / 2, text=name, anchor='w', fill=COLOR_TEXT, font=font)
+            c.create_text(NAME_WIDTH, y + ROW_HEIGHT / 2, anchor='w', fill=COLOR_TEXT_SUBTLE, font=font,
+                          text=f"{stats.count:>5} {stats.percentile(50):>7.1f}"
+                               f"{stats.percentile(95):>7.1f}{stats.max_ms:>8.1f}")
+            peak = max(stats.buckets) or 1
+            for i, count in enumerate(stats.buckets):
+                x = hist_x + i * (BAR_WIDTH + 2)
+                height = (ROW_HEIGHT - 6) * count / peak
+                c.create_rectangle(x, y + ROW_HEIGHT - 3, x + BAR_WIDTH, y + ROW_HEIGHT - 3 - height,
+                                   fill=COLOR_PRIMARY if count else COLOR_BORDER, width=0)
@@ -1,21 +1,18 @@
+from app_perf import instrument, profiler
+
+
+@instrument()
 def show_subscriptions(self):
     if self.df is None:
         return
     self.clear_content_frame()
+    self.show_filter_bar()
+    self.chart_views.hide()
     self.set_active_button(self.show_subscriptions)
 
-    subscription_keywords = [
-        'subscription', 'netflix', 'spotify', 'amazon prime',
-        'youtube', 'hulu', 'disney', 'apple', 'gym', 'membership'
-    ]
-
-    subs = self.df[
-        (self.df['Type'] == 'Expense') &
-        (
-            self.df['Category'].str.lower().str.contains('|'.join(subscription_keywords), na=False) |
-            self.df.get('Description', pd.Series(dtype=str)).str.lower().str.contains('|'.join(subscription_keywords), na=False)
-        )
-    ]
+    with profiler.span('prep.recurring'):
+        found = self.view_aggregate('recurring')
+        subs = found[found['Active']]
 
     display_frame = ttk.Frame(self.content_frame, style='Content.TFrame')
     display_frame.pack(fill='both', expand=True, padx=40, pady=20)
@@ -31,16 +28,16 @@ def show_subscriptions(self):
         no_subs.pack(pady=50)
         return
 
-    total = subs['Amount'].sum()
+    total = subs['Annual Cost'].sum()
     total_frame = ttk.Frame(display_frame, style='Card.TFrame')
     total_frame.pack(pady=10, fill='x')
 
-    title_lbl = ttk.Label(total_frame, text="Total Subscription Cost",
+    title_lbl = ttk.Label(total_frame, text="Annual Subscription Cost",
                           style='CardSubtle.TLabel', anchor='center')
     title_lbl.pack(pady=(15, 5), padx=20, fill='x')
 
     total_label = ttk.Label(total_frame,
-                            text=f"₹{total:,.2f}",
+                            text=money(total),
                             font=FONT_KPI,
                             background=COLOR_CARD,
                             foreground=COLOR_RED,
@@ -50,24 +47,36 @@ def show_subscriptions(self):
     tree_frame = ttk.Frame(display_frame)
     tree_frame.pack(fill='both', expand=True, pady=10)
 
-    tree = ttk.Treeview(tree_frame, columns=('Service', 'Category', 'Amount', 'Date'),
-                        show='headings', height=15, style='Treeview')
+    columns = ('Service', 'Category', 'Period', 'Amount', 'Date', 'Next', 'Annual')
+    tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=15, style='Treeview')
     tree.heading('Service', text='Service')
     tree.heading('Category', text='Category')
+    tree.heading('Period', text='Every')
     tree.heading('Amount', text='Cost')
     tree.heading('Date', text='Last Charged')
-    tree.column('Service', width=250)
-    tree.column('Category', width=200)
-    tree.column('Amount', width=150, anchor='e')
-    tree.column('Date', width=150, anchor='center')
-
-    for idx, row in subs.iterrows():
-        tree.insert('', 'end', values=(
-            row.get('Description', row['Category']),
-            row['Category'],
-            f"₹{row['Amount']:,.2f}",
-            row['Date'].strftime('%Y-%m-%d')
-        ))
+    tree.heading('Next', text='Next Expected')
+    tree.heading('Annual', text='Per Year')
+    tree.column('Service', width=220)
+    tree.column('Category', width=160)
+    tree.column('Period', width=100, anchor='center')
+    tree.column('Amount', width=120, anchor='e')
+    tree.column('Date', width=130, anchor='center')
+    tree.column('Next', width=130, anchor='center')
+    tree.column('Annual', width=130, anchor='e')
+
+    with profiler.span('treeview.fill'):
+        for merchant, category, period, amount, last, upcoming, annual in zip(
+                subs['Merchant'], subs['Category'], subs['Period'], subs['Amount'],
+                subs['Last Charged'], subs['Next Expected'], subs['Annual Cost']):
+            tree.insert('', 'end', values=(
+                merchant,
+                category,
+                period,
+                money(amount),
+                last.strftime('%Y-%m-%d'),
+                upcoming.strftime('%Y-%m-%d'),
+                money(annual)
+            ))
 
     scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=tree.yview)
     tree.configure(yscrollcommand=scrollbar.set)
@@ -76,11 +85,16 @@ def show_subscriptions(self):
     scrollbar.pack(side='right', fill='y')
 
 
+@instrument()
 def show_all_transactions(self):
     if self.df is None:
         return
     self.clear_content_frame()
+    self.show_filter_bar()
+    self.chart_views.hide()
     self.set_active_button(self.show_all_transactions)
+    import numpy as np
+    from app_virtual_table import VirtualTable
 
     table_frame = ttk.Frame(self.content_frame, style='Content.TFrame')
     table_frame.pack(fill='both', expand=True, padx=40, pady=20)
@@ -102,10 +116,26 @@ def show_all_transactions(self):
     tree_frame.grid_rowconfigure(0, weight=1)
     tree_frame.grid_columnconfigure(0, weight=1)
 
-    tree = ttk.Treeview(
-        tree_frame, columns=('Date', 'Category', 'Description', 'Type', 'Amount'),
-        show='headings', style='Treeview'
-    )
+    with profiler.span('prep.date_order'):
+        allowed = self.ledger_filter.positions(self.df, self.aggregates)
+        if allowed is None:
+            order = self.aggregates.date_order(self.df)
+        else:
+            order = allowed[::-1]  # filter positions are oldest first
+            in_filter = np.zeros(len(self.df), dtype=bool)
+            in_filter[allowed] = True
+
+    def fetch_rows(positions):
+        window = self.df.iloc[positions]
+        return [
+            ((date.strftime('%Y-%m-%d'), category, description, type_, money(amount)), (type_,))
+            for date, category, description, type_, amount in zip(
+                window['Date'], window['Category'], window['Description'],
+                window['Type'], window['Amount'])
+        ]
+
+    table = VirtualTable(tree_frame, ('Date', 'Category', 'Description', 'Type', 'Amount'), fetch_rows)
+    tree = table.tree
     tree.heading('Date', text='Date', anchor='w')
     tree.heading('Category', text='Category', anchor='w')
     tree.heading('Description', text='Description', anchor='w')
@@ -120,30 +150,26 @@ def show_all_transactions(self):
     tree.tag_configure('Income', foreground=COLOR_GREEN)
     tree.tag_configure('Expense', foreground=COLOR_RED)
 
-    def populate_tree(df_data):
-        for item in tree.get_children():
-            tree.delete(item)
-        df_data_sorted = df_data.sort_values('Date', ascending=False)
-        for idx, row in df_data_sorted.iterrows():
-            tag = row['Type']
-            tree.insert('', 'end', values=(
-                row['Date'].strftime('%Y-%m-%d'),
-                row['Category'],
-                row.get('Description', 'N/A'),
-                row['Type'],
-                f"₹{row['Amount']:,.2f}"
-            ), tags=(tag,))
-
     def search_transactions():
-        query = search_entry.get().lower()
-        if not query:
-            filtered = self.df
+        self.search_after_id = None
+        if not table.tree.winfo_exists():
+            return  # the view was switched while a debounced search was pending
+        with profiler.span('prep.search'):
+            matches = self.search_index.search(search_entry.get())
+            if matches is not None and allowed is not None:
+                matches = matches[in_filter[matches]]
+        if matches is None:
+            table.set_rows(order)
         else:
-            filtered = self.df[
-                self.df['Category'].str.lower().str.contains(query, na=False) |
-                self.df.get('Description', pd.Series(dtype=str)).str.lower().str.contains(query, na=False)
-            ]
-        populate_tree(filtered)
+            dates = self.df['Date'].to_numpy()[matches].astype('int64')
+            table.set_rows(matches[np.argsort(-dates, kind='stable')])
+
+    def schedule_search(event=None):
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, search_transactions)
+
+    search_entry.bind('<KeyRelease>', schedule_search)
 
     search_btn = ttk.Button(search_frame, text="Search",
                             command=search_transactions,
@@ -155,14 +181,104 @@ def show_all_transactions(self):
                            style='TButton', cursor='hand2')
     clear_btn.pack(side='left', padx=5)
 
-    vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=tree.yview)
-    hsb = ttk.Scrollbar(tree_frame, orient="horizontal", command=tree.xview)
-    tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
-    tree.grid(row=0, column=0, sticky='nsew')
-    vsb.grid(row=0, column=1, sticky='ns')
-    hsb.grid(row=1, column=0, sticky='ew')
+    table.grid(row=0, column=0)
+    table.set_rows(order)
+
+
+@instrument()
+def show_duplicates(self):
+    if self.df is None:
+        return
+    self.clear_content_frame()
+    self.filter_bar.hide()  # review covers the whole ledger; exclusions are by row position
+    self.chart_views.hide()
+    self.set_active_button(self.show_duplicates)
+    from app_dedupe import WINDOW_DAYS
+
+    with profiler.span('prep.duplicates'):
+        found = self.aggregates.duplicates(self.df)
+
+    display_frame = ttk.Frame(self.content_frame, style='Content.TFrame')
+    display_frame.pack(fill='both', expand=True, padx=40, pady=20)
+
+    title = ttk.Label(display_frame, text="🧹 Duplicate Review",
+                      font=FONT_H1, background=COLOR_CONTENT_BG)
+    title.pack(pady=20)
+
+    if len(found) == 0:
+        ttk.Label(display_frame, text="No likely duplicates found.",
+                  font=FONT_H2, background=COLOR_CONTENT_BG,
+                  foreground=COLOR_TEXT_SUBTLE).pack(pady=50)
+        return
+
+    counted = found['Amount'].groupby(found['Type']).sum()
+    summary = "   ·   ".join(f"{kind}: {money(amount)} counted twice" for kind, amount in counted.items())
+    ttk.Label(display_frame,
+              text=f"{len(found):,} likely duplicate(s) (same type and amount within {WINDOW_DAYS} days, "
+                   f"similar description)\n{summary}",
+              font=FONT_NORMAL, background=COLOR_CONTENT_BG, foreground=COLOR_TEXT_SUBTLE,
+              justify='center').pack(pady=(0, 10))
+
+    tree_frame = ttk.Frame(display_frame)
+    tree_frame.pack(fill='both', expand=True, pady=10)
 
-    populate_tree(self.df)
+    columns = ('Date', 'Type', 'Amount', 'Description', 'Original', 'Similarity')
+    tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=15,
+                        style='Treeview', selectmode='extended')
+    tree.heading('Date', text='Date')
+    tree.heading('Type', text='Type')
+    tree.heading('Amount', text='Amount')
+    tree.heading('Description', text='Likely Duplicate')
+    tree.heading('Original', text='Kept Original')
+    tree.heading('Similarity', text='Match')
+    tree.column('Date', width=110, anchor='center')
+    tree.column('Type', width=90, anchor='center')
+    tree.column('Amount', width=120, anchor='e')
+    tree.column('Description', width=260)
+    tree.column('Original', width=320)
+    tree.column('Similarity', width=80, anchor='center')
+
+    shown = found.head(MAX_REVIEW_ROWS)
+    with profiler.span('treeview.fill'):
+        for row, date, kind, amount, description, original_date, original, score in zip(
+                shown['Row'], shown['Date'], shown['Type'], shown['Amount'], shown['Description'],
+                shown['Original Date'], shown['Original Description'], shown['Similarity']):
+            tree.insert('', 'end', iid=str(row), values=(
+                date.strftime('%Y-%m-%d'),
+                kind,
+                money(amount),
+                description,
+                f"{original_date.strftime('%Y-%m-%d')} · {original}",
+                f"{score:.0%}"
+            ))
+
+    scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=tree.yview)
+    tree.configure(yscrollcommand=scrollbar.set)
+    tree.pack(side='left', fill='both', expand=True)
+    scrollbar.pack(side='right', fill='y')
+
+    button_frame = ttk.Frame(display_frame, style='Content.TFrame')
+    button_frame.pack(fill='x', pady=10)
+    if len(found) > len(shown):
+        ttk.Label(button_frame, text=f"Showing the first {len(shown):,} of {len(found):,}",
+                  background=COLOR_CONTENT_BG, foreground=COLOR_TEXT_SUBTLE).pack(side='left')
+
+    def exclude_selected():
+        positions = [int(iid) for iid in tree.selection()]
+        if not positions:
+            messagebox.showinfo("Duplicate Review", "Select the rows that are duplicates first.")
+            return
+        self.exclude_duplicates(positions)
+
+    def exclude_all():
+        if messagebox.askyesno("Duplicate Review",
+                               f"Exclude all {len(found):,} likely duplicates from the ledger?"):
+            self.exclude_duplicates(found['Row'].tolist())
+
+    ttk.Button(button_frame, text="🗑 Exclude All", command=exclude_all,
+               style='TButton', cursor='hand2').pack(side='right', padx=5)
+    ttk.Button(button_frame, text="🗑 Exclude Selected", command=exclude_selected,
+               style='Accent.TButton', cursor='hand2').pack(side='right', padx=5)
 
 
 # --- Budget Page Functions ---
@@ -182,36 +298,38 @@ def set_category_budget(self):
     if not category:
         return
 
-    amount = simpledialog.askfloat("Set Budget", f"Enter monthly budget for '{category}':", parent=self.root)
+    amount = simpledialog.askfloat("Set Budget", f"Enter monthly budget for '{category}' ({display_currency()}):",
+                                   parent=self.root)
     if amount is not None and amount >= 0:
-        self.budgets[category] = amount
+        self.budgets[category] = amount / self.budget_factor()  # budgets are kept in BASE_CURRENCY
+        self.budgets_dirty = True
         self.show_budgets_page()  # Refresh the view
     elif amount is not None:
         messagebox.showerror("Error", "Budget must be a positive number.")
 
 
+@instrument()
 def show_budgets_page(self):
     if self.df is None:
         return
     self.clear_content_frame()
+    self.filter_bar.hide()  # budgets are per month; the page has its own month picker
+    self.chart_views.hide()
     self.set_active_button(self.show_budgets_page)
+    from app_budgets import STATUS_AT_RISK, STATUS_OVER, evaluate_budgets, history_summary
 
-    if self.df.empty:
-        latest_month = "N/A"
-        current_month_df = pd.DataFrame()
-    else:
-        latest_date_in_data = self.df['Date'].max()
-        latest_month = latest_date_in_data.strftime('%B %Y')
-        current_month_df = self.df[
-            (self.df['Date'].dt.year == latest_date_in_data.year) &
-            (self.df['Date'].dt.month == latest_date_in_data.month) &
-            (self.df['Type'] == 'Expense')
-        ]
+    with profiler.span('prep.budgets'):
+        matrix = self.aggregates.spend_matrix(self.df)
+        latest_date_in_data = self.aggregates.latest_date(self.df)
+    months = list(matrix.index[::-1])  # newest first
+    if self.budget_month not in months:
+        self.budget_month = months[0] if months else None
+    month = self.budget_month
 
     header_frame = ttk.Frame(self.content_frame, style='Content.TFrame')
     header_frame.pack(fill='x', padx=40, pady=20)
 
-    title = ttk.Label(header_frame, text=f"💰 Monthly Budgets ({latest_month})",
+    title = ttk.Label(header_frame, text="💰 Monthly Budgets",
                       font=FONT_H1, background=COLOR_CONTENT_BG)
     title.pack(side='left')
 
@@ -220,6 +338,18 @@ def show_budgets_page(self):
                                 style='Accent.TButton', cursor='hand2')
     set_budget_btn.pack(side='right')
 
+    if months:
+        labels = [m.strftime('%B %Y') for m in months]
+        month_combo = ttk.Combobox(header_frame, values=labels, state='readonly', width=16)
+        month_combo.set(month.strftime('%B %Y'))
+        month_combo.pack(side='right', padx=15)
+
+        def on_month_selected(event=None):
+            self.budget_month = months[month_combo.current()]
+            self.show_budgets_page()
+
+        month_combo.bind('<<ComboboxSelected>>', on_month_selected)
+
     budgets_frame = self.create_scrollable_container()
 
     if not self.budgets:
@@ -229,13 +359,19 @@ def show_budgets_page(self):
         no_budgets.pack(pady=50, padx=20)
         return
 
-    for category, budget_amount in self.budgets.items():
-        spending = current_month_df[current_month_df['Category'] == category]['Amount'].sum()
-        percentage = (spending / budget_amount) * 100 if budget_amount > 0 else 0
+    with profiler.span('prep.budgets'):
+        factor = self.budget_factor()
+        budgets = {category: budget * factor for category, budget in self.budgets.items()}
+        report = evaluate_budgets(matrix, budgets, month, as_of=latest_date_in_data)
+        history = history_summary(matrix, budgets)
 
-        if percentage > 100:
+    for category, row in report.iterrows():
+        if row['Status'] == STATUS_OVER:
             style_name = 'Red.Horizontal.TProgressbar'
             text_color = COLOR_RED
+        elif row['Status'] == STATUS_AT_RISK:
+            style_name = 'Green.Horizontal.TProgressbar'
+            text_color = COLOR_YELLOW
         else:
             style_name = 'Green.Horizontal.TProgressbar'
             text_color = COLOR_GREEN
@@ -249,16 +385,28 @@ def show_budgets_page(self):
         ttk.Label(title_frame, text=category, font=FONT_H2,
                   background=COLOR_CARD, foreground=COLOR_TEXT).pack(side='left')
 
-        ttk.Label(title_frame, text=f"₹{spending:,.0f} / ₹{budget_amount:,.0f}",
+        ttk.Label(title_frame, text=f"{money(row['Spent'], 0)} / {money(row['Budget'], 0)}",
                   font=FONT_H2, background=COLOR_CARD, foreground=text_color).pack(side='right')
 
         pb = ttk.Progressbar(card, orient='horizontal', length=300,
                              mode='determinate', style=style_name)
-        pb.pack(fill='x', padx=20, pady=(5, 20))
-        pb['value'] = min(percentage, 100)
-
-    self.root.update_idletasks()
-    self.on_scrollframe_configure()
+        pb.pack(fill='x', padx=20, pady=(5, 5))
+        pb['value'] = min(row['Percent'], 100)
+
+        notes = []
+        if row['Status'] == STATUS_AT_RISK:
+            notes.append(f"⚠️ On track to overshoot: {money(row['Projected'], 0)} projected by month end")
+        past = history.loc[category]
+        if past['Months']:
+            notes.append(f"Over budget in {past['Over']:.0f} of {past['Months']:.0f} months "
+                         f"(avg {past['Average']:.0%} of budget)")
+        ttk.Label(card, text="   ·   ".join(notes), font=FONT_NORMAL, background=COLOR_CARD,
+                  foreground=COLOR_YELLOW if row['Status'] == STATUS_AT_RISK else COLOR_TEXT_SUBTLE
+                  ).pack(anchor='w', padx=20, pady=(0, 15))
+
+    with profiler.span('tk.layout'):
+        self.root.update_idletasks()
+        self.on_scrollframe_configure()
 
 
 # --- Main execution ---
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+
+# --- 🔁 Recurring Charge Detection 🔁 ---
+# Subscriptions are found from the data rather than a keyword list: expenses are
+# grouped by a normalized merchant (the description with reference numbers, card
+# noise and punctuation stripped), sorted by (merchant, date) once, and every group's
+# charge intervals and amounts are summarized with flat NumPy reductions. A merchant
+# is recurring when most of its intervals sit on a weekly, monthly or yearly period
+# and its amounts are stable. Normalization runs over the categories only, so the
+# per-row work is integer code look-ups and one lexsort.
+
+PERIODS = [
+    # name, period in days, allowed deviation of one interval in days
+    ('Weekly', 7.0, 1.0),
+    ('Monthly', 30.44, 4.0),
+    ('Yearly', 365.25, 15.0),
+]
+MIN_CHARGES = {'Weekly': 4, 'Monthly': 3, 'Yearly': 2}
+MIN_ON_PERIOD = 0.75    # share of intervals that must match the period
+MAX_AMOUNT_CV = 0.2     # max coefficient of variation of the charged amounts
+MISSED_PERIODS = 2      # a subscription not charged for this many periods is lapsed
+
+_NOISE = r'\b(?:pos|ach|debit|credit|card|payment|purchase|recurring|autopay|www|com|inc|ltd|llc)\b'
+
+RECURRING_COLUMNS = ['Merchant', 'Category', 'Period', 'Charges', 'Amount',
+                     'Last Charged', 'Next Expected', 'Annual Cost', 'Active']
+
+
+def normalize_merchants(descriptions, categories):
+    """Integer merchant codes and names for lower-cased Description/Category categoricals."""
+    names = pd.Series(descriptions.cat.categories, dtype='string') \
+        .str.replace(r'[^a-z& ]+', ' ', regex=True) \
+        .str.replace(_NOISE, ' ', regex=True) \
+        .str.replace(r'\s+', ' ', regex=True).str.strip()
+    desc_codes, merchants = pd.factorize(names.to_numpy(dtype=object))
+    desc_codes = desc_codes[descriptions.cat.codes.to_numpy()]
+
+    # Rows without a usable description fall back to their category as the merchant.
+    fallback = (desc_codes < 0) | (np.asarray(merchants, dtype=object)[desc_codes] == '')
+    if fallback.any():
+        cat_codes = categories.cat.codes.to_numpy()[fallback]
+        cat_names = np.asarray(categories.cat.categories, dtype=object)
+        merchants = np.concatenate([np.asarray(merchants, dtype=object), cat_names])
+        desc_codes = desc_codes.copy()
+        desc_codes[fallback] = len(merchants) - len(cat_names) + cat_codes
+    return desc_codes, np.asarray(merchants, dtype=object)
+
+
+def detect_recurring(df):
+    """One row per detected recurring charge (see RECURRING_COLUMNS), costliest first."""
+    expenses = df[(df['Type'] == 'Expense') & df['Date'].notna()]
+    if expenses.empty:
+        return pd.DataFrame(columns=RECURRING_COLUMNS)
+
+    merchant, names = normalize_merchants(expenses['_description_lower'], expenses['_category_lower'])
+    days = expenses['Date'].to_numpy().astype('datetime64[D]').astype('int64')
+    amounts = expenses['Amount'].to_numpy()
+    order = np.lexsort((days, merchant))
+    merchant, days, amounts = merchant[order], days[order], amounts[order]
+    category_codes = expenses['Category'].cat.codes.to_numpy()[order]
+
+    # Group boundaries over the (merchant, date)-sorted rows.
+    starts = np.flatnonzero(np.r_[True, merchant[1:] != merchant[:-1]])
+    ends = np.r_[starts[1:], len(merchant)]
+    charges = ends - starts
+    group = np.repeat(np.arange(len(starts)), charges)
+
+    # Intervals between consecutive charges of the same merchant; each group's median.
+    same = group[1:] == group[:-1]
+    intervals = np.diff(days)[same].astype('float64')
+    interval_group = group[1:][same]
+    n_intervals = np.bincount(interval_group, minlength=len(starts))
+    by_group = np.lexsort((intervals, interval_group))
+    first = np.r_[0, np.cumsum(n_intervals)[:-1]]
+    has_intervals = n_intervals > 0
+    median = np.full(len(starts), np.nan)
+    median[has_intervals] = intervals[by_group][first[has_intervals] + (n_intervals[has_intervals] - 1) // 2]
+
+    # Period closest to the median interval, and the share of intervals on that period.
+    period_days = np.array([p[1] for p in PERIODS])
+    tolerance = np.array([p[2] for p in PERIODS])
+    nearest = np.abs(np.nan_to_num(median, nan=-1e9)[:, None] - period_days[None, :]).argmin(axis=1)
+    on_period = np.abs(intervals - period_days[nearest][interval_group]) <= tolerance[nearest][interval_group]
+    on_share = np.bincount(interval_group, weights=on_period, minlength=len(starts)) / np.maximum(n_intervals, 1)
+
+    # Amount stability from per-group sums of x and x^2.
+    total = np.add.reduceat(amounts, starts)
+    mean = total / charges
+    variance = np.maximum(np.add.reduceat(amounts * amounts, starts) / charges - mean * mean, 0)
+    cv = np.sqrt(variance) / np.where(mean > 0, mean, np.inf)
+
+    min_charges = np.array([MIN_CHARGES[p[0]] for p in PERIODS])[nearest]
+    recurring = has_intervals & (charges >= min_charges) & (on_share >= MIN_ON_PERIOD) & (cv <= MAX_AMOUNT_CV)
+    idx = np.flatnonzero(recurring)
+    if not len(idx):
+        return pd.DataFrame(columns=RECURRING_COLUMNS)
+
+    period = period_days[nearest[idx]]
+    last = days[ends[idx] - 1]
+    last_amount = amounts[ends[idx] - 1]
+    next_expected = last + np.rint(period).astype('int64')
+    latest = days.max()
+    categories = np.asarray(expenses['Category'].cat.categories, dtype=object)
+
+    result = pd.DataFrame({
+        'Merchant': pd.Series(names[merchant[starts[idx]]]).str.title(),
+        'Category': categories[category_codes[ends[idx] - 1]],
+        'Period': np.array([p[0] for p in PERIODS], dtype=object)[nearest[idx]],
+        'Charges': charges[idx],
+        'Amount': last_amount,
+        'Last Charged': pd.to_datetime(last.astype('datetime64[D]')),
+        'Next Expected': pd.to_datetime(next_expected.astype('datetime64[D]')),
+        'Annual Cost': last_amount * 365.25 / period,
+        'Active': latest - last <= MISSED_PERIODS * period,
+    })
+    return result.sort_values(['Active', 'Annual Cost'], ascending=False, ignore_index=True)
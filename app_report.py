@@ -0,0 +1,122 @@
+"""Headless batch renderer for the dashboard charts.
+
+    python app_report.py ledgers/*.xlsx --out reports --format pdf --workers 8
+    python app_report.py ledgers/*.csv --currency USD
+
+Renders the same charts as the Overview, Spending by Category, Income vs Expense,
+Monthly Trends and Yearly Summary views with the Agg backend, one ledger per
+worker process. Amounts are converted to --currency (default: the base currency)
+with the dashboard's FX rate table. Nothing here imports Tk.
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+
+from app_charts import (OverviewPie, TotalsBars, CategoryPie, IncomeExpenseBars, MonthlyTrend,
+                        YearlyBars, style_figure)
+from app_aggregates import AggregateCache
+from app_currency import BASE_CURRENCY, convert, set_display_currency
+from app_loader import load_ledger
+from app_theme import FONT_FAMILY
+
+REPORT_VIEWS = [
+    ('overview_pie', OverviewPie, lambda agg, df: agg.expense_by_category(df)),
+    ('overview_totals', TotalsBars, lambda agg, df: agg.totals(df)),
+    ('category_pie', CategoryPie, lambda agg, df: agg.expense_by_category(df).sort_values(ascending=False)),
+    ('income_expense', IncomeExpenseBars, lambda agg, df: agg.daily(df)),
+    ('monthly_trends', MonthlyTrend, lambda agg, df: agg.daily(df)),
+    ('yearly_summary', YearlyBars, lambda agg, df: agg.yearly(df)),
+]
+
+# Per-process chart instances; created once by _init_worker and re-rendered per ledger.
+_charts = None
+
+
+def _init_worker():
+    """Process initializer: font cache, rcParams and chart figures are set up once."""
+    global _charts
+    from matplotlib import font_manager
+    matplotlib.rcParams['font.family'] = 'sans-serif'
+    matplotlib.rcParams['font.sans-serif'] = [FONT_FAMILY] + matplotlib.rcParams['font.sans-serif']
+    font_manager.findfont(font_manager.FontProperties(family=['sans-serif']))
+
+    _charts = []
+    for name, chart_type, select in REPORT_VIEWS:
+        chart = chart_type(style_figure)
+        chart.hint = ''  # no zoom hint on static output
+        FigureCanvasAgg(chart.figure)
+        _charts.append((name, chart, select))
+
+
+def render_ledger(file_path, out_dir, fmt='pdf', currency=BASE_CURRENCY):
+    """Renders every report chart for one ledger in currency; returns the written paths."""
+    if _charts is None:
+        _init_worker()
+    df, aggregates, _ = load_ledger(file_path)
+    df, changed = convert(df, currency)
+    if changed:
+        aggregates = AggregateCache().warm(df)
+    set_display_currency(currency)  # chart labels
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    written = []
+
+    def rendered():
+        for name, chart, select in _charts:
+            chart.reset_view()
+            chart.render(select(aggregates, df))
+            yield name, chart.figure
+
+    if fmt == 'pdf':
+        path = os.path.join(out_dir, f'{stem}.pdf')
+        with PdfPages(path, metadata={'Title': f'{stem} budget report'}) as pdf:
+            for name, figure in rendered():
+                pdf.savefig(figure, facecolor=figure.get_facecolor())
+        written.append(path)
+    else:
+        for name, figure in rendered():
+            path = os.path.join(out_dir, f'{stem}_{name}.{fmt}')
+            figure.savefig(path, facecolor=figure.get_facecolor())
+            written.append(path)
+    return written
+
+
+def render_many(paths, out_dir, fmt='pdf', workers=None, currency=BASE_CURRENCY):
+    """Renders many ledgers in parallel; yields (path, written paths or exception)."""
+    os.makedirs(out_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {pool.submit(render_ledger, path, out_dir, fmt, currency): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render dashboard chart reports without a window.")
+    parser.add_argument('ledgers', nargs='+', help="XLSX/CSV ledger files")
+    parser.add_argument('--out', default='reports', help="output folder (default: reports)")
+    parser.add_argument('--format', default='pdf', choices=['pdf', 'png', 'svg'])
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--currency', type=str.upper, default=BASE_CURRENCY,
+                        help=f"currency to report amounts in (default: {BASE_CURRENCY})")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for path, result in render_many(args.ledgers, args.out, args.format, args.workers, args.currency):
+        if isinstance(result, Exception):
+            failed += 1
+            print(f"FAILED {path}: {result}", file=sys.stderr)
+        else:
+            print(f"ok     {path} -> {', '.join(result)}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import bisect
+import re
+
+import numpy as np
+
+# --- 🔍 Transaction Search Index 🔍 ---
+# Built once when a ledger loads, over the unique lower-cased Category/Description
+# strings of the typed store (far fewer than rows). A trigram index narrows a
+# substring query to a handful of candidate strings, a sorted token list answers
+# short (1-2 character) queries as word prefixes, and per-string row postings turn
+# the matching strings back into row positions without touching the whole frame.
+
+NGRAM = 3
+TOKEN_RE = re.compile(r'\w+')
+
+
+class _Field:
+    """Index over one categorical text column."""
+
+    def __init__(self, column):
+        self.strings = []
+        self.ngrams = {}        # trigram -> set of string ids
+        self.tokens = []        # sorted (token, string_id) pairs for prefix lookups
+        self.extra_rows = {}    # string_id -> positions of rows appended after the build
+
+        for value in column.cat.categories:
+            self.tokens.extend(self._add_string(str(value)))
+        self.tokens.sort()
+
+        codes = column.cat.codes.to_numpy()
+        self.row_order = np.argsort(codes, kind='stable')
+        self.row_offsets = np.searchsorted(codes[self.row_order], np.arange(len(self.strings) + 1))
+
+    def _add_string(self, text):
+        """Registers a unique string and returns its (token, string_id) pairs."""
+        string_id = len(self.strings)
+        self.strings.append(text)
+        for i in range(len(text) - NGRAM + 1):
+            self.ngrams.setdefault(text[i:i + NGRAM], set()).add(string_id)
+        return [(token, string_id) for token in set(TOKEN_RE.findall(text))]
+
+    def extend(self, column, start):
+        """Indexes rows appended to the store at positions >= start."""
+        codes = column.cat.codes.to_numpy()[start:]
+        categories = column.cat.categories
+        for offset, code in enumerate(codes):
+            if code < 0:
+                continue
+            while code >= len(self.strings):
+                for pair in self._add_string(str(categories[len(self.strings)])):
+                    bisect.insort(self.tokens, pair)
+            self.extra_rows.setdefault(int(code), []).append(start + offset)
+
+    def matching_strings(self, query):
+        if len(query) >= NGRAM:
+            grams = {query[i:i + NGRAM] for i in range(len(query) - NGRAM + 1)}
+            postings = sorted((self.ngrams.get(g, set()) for g in grams), key=len)
+            candidates = postings[0].intersection(*postings[1:])
+            return sorted(i for i in candidates if query in self.strings[i])
+
+        start = bisect.bisect_left(self.tokens, (query, -1))
+        found = set()
+        for token, string_id in self.tokens[start:]:
+            if not token.startswith(query):
+                break
+            found.add(string_id)
+        return sorted(found)
+
+    def rows(self, string_ids):
+        parts = []
+        for string_id in string_ids:
+            if string_id + 1 < len(self.row_offsets):
+                parts.append(self.row_order[self.row_offsets[string_id]:self.row_offsets[string_id + 1]])
+            if string_id in self.extra_rows:
+                parts.append(np.array(self.extra_rows[string_id], dtype=np.int64))
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+
+class SearchIndex:
+    def __init__(self, df, columns=('_category_lower', '_description_lower')):
+        self.columns = columns
+        self._fields = [_Field(df[col]) for col in columns]
+
+    def extend(self, df, start):
+        """Keeps the index current after rows were appended to the store."""
+        for col, field in zip(self.columns, self._fields):
+            field.extend(df[col], start)
+
+    def search(self, query):
+        """Row positions (ascending) whose Category or Description contains the query."""
+        query = query.strip().lower()
+        if not query:
+            return None
+        parts = [field.rows(field.matching_strings(query)) for field in self._fields]
+        return np.unique(np.concatenate(parts))
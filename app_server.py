@@ -0,0 +1,299 @@
+"""Headless JSON query service over one ledger's aggregates (loopback only).
+
+    python app_server.py ledger.xlsx --port 8765 --budget Food=8000 --budget Rent=20000
+    python app_server.py ledger.csv --currency USD
+
+Endpoints (GET, JSON responses):
+
+    /health                         rows, data version and currency
+    /totals                         income, expenses, balance, transactions
+    /categories                     income / expense sums and counts per category
+    /series/monthly  /series/yearly income and expense per month or year
+    /top?n=10&by=category|month     largest expenses, overall or per group
+    /budgets?month=2024-05          budget status for a month (default: latest)
+
+The ledger is loaded once through the same pipeline as the dashboard (snapshot,
+streamed parse, journal replay). Answers come from the shared AggregateCache and
+TopExpenseIndex and are cached as encoded bodies keyed on (data version, path,
+query), so a repeated query is a dictionary lookup. Amounts are in --currency
+(default: the base currency), converted with the dashboard's FX rate table.
+Nothing here imports Tk.
+"""
+import argparse
+import asyncio
+import ipaddress
+import json
+import math
+import socket
+import sys
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlsplit
+
+import pandas as pd
+
+from app_aggregates import AggregateCache
+from app_budgets import evaluate_budgets
+from app_currency import BASE_CURRENCY, active_rates, convert, display_currency, set_display_currency
+from app_loader import load_ledger
+from app_topn import TopExpenseIndex
+
+DEFAULT_PORT = 8765
+CACHE_ENTRIES = 512
+MAX_TOP_N = 1000
+MAX_HEADER_BYTES = 16 * 1024
+KEEPALIVE_SECONDS = 30
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            500: 'Internal Server Error'}
+
+
+class QueryError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _number(value):
+    value = float(value)
+    return None if math.isnan(value) else round(value, 2)
+
+
+def _series_rows(frame, label):
+    return [{label: str(key),
+             'income': _number(row.get('Income', 0.0)),
+             'expenses': _number(row.get('Expense', 0.0))}
+            for key, row in frame.iterrows()]
+
+
+# --- 🔌 Ledger Queries 🔌 ---
+class LedgerQueries:
+    """The dashboard's KPI, category, series, top-N and budget numbers as plain JSON data."""
+
+    def __init__(self, df, aggregates, budgets=None, top_index=None):
+        self.df = df
+        self.aggregates = aggregates
+        self.budgets = dict(budgets or {})
+        self.top_index = top_index if top_index is not None else TopExpenseIndex(df)
+        self.routes = {
+            '/health': self.health,
+            '/totals': self.totals,
+            '/categories': self.categories,
+            '/series/monthly': self.monthly,
+            '/series/yearly': self.yearly,
+            '/top': self.top,
+            '/budgets': self.budget_status,
+        }
+
+    @property
+    def version(self):
+        return self.aggregates.version
+
+    def run(self, path, params):
+        handler = self.routes.get(path.rstrip('/') or '/')
+        if handler is None:
+            raise QueryError(404, f"unknown endpoint {path!r}")
+        return handler(params)
+
+    def health(self, params):
+        return {'rows': len(self.df), 'version': self.version, 'currency': display_currency()}
+
+    def totals(self, params):
+        income, expenses = self.aggregates.totals(self.df)
+        return {'income': _number(income), 'expenses': _number(expenses),
+                'balance': _number(income - expenses), 'transactions': len(self.df)}
+
+    def categories(self, params):
+        sums, counts = self.aggregates.by_category(self.df)
+        return [{'category': str(category),
+                 'income': _number(sums.at[category, 'Income']) if 'Income' in sums else 0.0,
+                 'expenses': _number(sums.at[category, 'Expense']) if 'Expense' in sums else 0.0,
+                 'transactions': int(counts.loc[category].sum())}
+                for category in sums.index]
+
+    def monthly(self, params):
+        return _series_rows(self.aggregates.monthly(self.df), 'month')
+
+    def yearly(self, params):
+        return _series_rows(self.aggregates.yearly(self.df), 'year')
+
+    def _records(self, positions):
+        window = self.df.iloc[positions]
+        return [{'date': date.strftime('%Y-%m-%d'), 'category': str(category),
+                 'description': description or '', 'amount': _number(amount)}
+                for date, category, description, amount in zip(
+                    window['Date'], window['Category'], window['Description'], window['Amount'])]
+
+    def top(self, params):
+        try:
+            n = int(params.get('n', 10))
+        except ValueError:
+            raise QueryError(400, "n must be an integer") from None
+        n = min(max(n, 1), MAX_TOP_N)
+        by = params.get('by')
+        if by is None:
+            return self._records(self.top_index.top(self.df, n))
+        if by not in ('category', 'month'):
+            raise QueryError(400, "by must be 'category' or 'month'")
+        return {str(label): self._records(rows)
+                for label, rows in self.top_index.top_by(self.df, by, n).items()}
+
+    def budget_status(self, params):
+        latest = self.aggregates.latest_date(self.df)
+        try:
+            month = pd.Period(params['month'], freq='M') if 'month' in params else \
+                (None if pd.isna(latest) else latest.to_period('M'))
+        except ValueError:
+            raise QueryError(400, "month must look like YYYY-MM") from None
+        if month is None or not self.budgets:
+            return {'month': None if month is None else str(month), 'budgets': []}
+        status = evaluate_budgets(self.aggregates.spend_matrix(self.df), self.budgets, month, latest)
+        return {'month': str(month),
+                'budgets': [{'category': category, 'budget': _number(row['Budget']),
+                             'spent': _number(row['Spent']), 'percent': _number(row['Percent']),
+                             'projected': _number(row['Projected']), 'status': row['Status']}
+                            for category, row in status.iterrows()]}
+
+
+# --- 🌐 HTTP Front End 🌐 ---
+class QueryServer:
+    """Minimal HTTP/1.1 (keep-alive) server answering LedgerQueries from a version-keyed cache."""
+
+    def __init__(self, queries, cache_entries=CACHE_ENTRIES):
+        self.queries = queries
+        self.cache = OrderedDict()      # (version, path, query) -> encoded JSON body
+        self.cache_entries = cache_entries
+        self.hits = 0
+        self.misses = 0
+
+    def respond(self, target):
+        """(status, body bytes) for a request target such as '/top?n=5'."""
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        key = (self.queries.version, url.path, tuple(sorted(params.items())))
+        body = self.cache.get(key)
+        if body is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return 200, body
+        self.misses += 1
+        try:
+            result = self.queries.run(url.path, params)
+        except QueryError as e:
+            return e.status, json.dumps({'error': str(e)}).encode()
+        body = json.dumps(result, separators=(',', ':')).encode()
+        self.cache[key] = body
+        if len(self.cache) > self.cache_entries:
+            self.cache.popitem(last=False)
+        return 200, body
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEPALIVE_SECONDS)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, asyncio.LimitOverrunError):
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    await self._send(writer, 400, b'{"error":"malformed request line"}', False)
+                    break
+                headers = {name.strip().lower(): value.strip() for name, _, value in
+                           (line.partition(':') for line in lines[1:] if line)}
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+
+                if method != 'GET':
+                    status, body = 405, b'{"error":"only GET is supported"}'
+                else:
+                    try:
+                        status, body = self.respond(target)
+                    except Exception as e:  # keep serving other clients
+                        status, body = 500, json.dumps({'error': str(e)}).encode()
+                await self._send(writer, status, body, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _send(writer, status, body, keep_alive):
+        writer.write(f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\n"
+                     f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body)
+        await writer.drain()
+
+    async def serve(self, host='127.0.0.1', port=DEFAULT_PORT, ready=None):
+        await _check_loopback(host, port)
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[1])
+        async with server:
+            await server.serve_forever()
+
+
+async def _check_loopback(host, port):
+    """Raises ValueError unless every address host resolves to (e.g. localhost) is loopback."""
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror as e:
+        raise ValueError(f"cannot resolve {host}: {e}") from None
+    addresses = {info[4][0].split('%')[0] for info in infos}  # drop IPv6 scope ids
+    if not addresses or not all(ipaddress.ip_address(address).is_loopback for address in addresses):
+        raise ValueError(f"refusing to listen on non-loopback address {host}")
+
+
+def _parse_budget(text):
+    category, _, amount = text.partition('=')
+    try:
+        return category.strip(), float(amount)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected CATEGORY=AMOUNT, got {text!r}") from None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a ledger's aggregates as JSON on localhost.")
+    parser.add_argument('ledger', help="XLSX/CSV ledger file")
+    parser.add_argument('--host', default='127.0.0.1', help="loopback address to bind (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--budget', type=_parse_budget, action='append', default=[],
+                        metavar='CATEGORY=AMOUNT', help="monthly budget (overrides saved budgets)")
+    parser.add_argument('--currency', type=str.upper, default=BASE_CURRENCY,
+                        help=f"currency to report amounts in (default: {BASE_CURRENCY})")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    df, aggregates, budgets = load_ledger(args.ledger)
+    try:
+        df, changed = convert(df, args.currency)
+        factor = active_rates().latest_factor(BASE_CURRENCY, args.currency)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    if changed:
+        aggregates = AggregateCache().warm(df)
+    set_display_currency(args.currency)
+    # Saved budgets are in the base currency; --budget amounts are in --currency
+    budgets = {category: budget * factor for category, budget in (budgets or {}).items()}
+    budgets.update(args.budget)
+    queries = LedgerQueries(df, aggregates, budgets)
+    print(f"Loaded {len(df):,} transactions in {time.perf_counter() - started:.1f} s")
+
+    server = QueryServer(queries)
+    try:
+        asyncio.run(server.serve(args.host, args.port,
+                                 ready=lambda port: print(f"Serving on http://{args.host}:{port}/", flush=True)))
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
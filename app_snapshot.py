@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import pickle
+
+try:
+    import pyarrow
+    import pyarrow.feather as feather
+except ImportError:  # snapshots are an optimization; without pyarrow we always parse
+    feather = None
+
+# What a snapshot/spill write can fail with besides I/O (e.g. a column Arrow can't type)
+WRITE_ERRORS = (OSError, ValueError, TypeError) + ((pyarrow.ArrowException,) if feather is not None else ())
+
+# --- 💾 Ledger Snapshot Cache 💾 ---
+# Parsing a large XLSX with openpyxl dominates startup. After a ledger is loaded the
+# typed store is written next to it as an uncompressed Feather file (memory-mapped on
+# the next open) plus a pickle of the precomputed aggregate cubes. The snapshot is
+# keyed on the source path, size and mtime; when only the mtime moved, a content hash
+# decides whether the source really changed before falling back to a full parse.
+
+SNAPSHOT_VERSION = 2
+HASH_BLOCK = 1 << 20
+
+
+def snapshot_paths(file_path):
+    """(data, meta, aggregates) sidecar paths for a source ledger."""
+    folder, name = os.path.split(os.path.abspath(file_path))
+    base = os.path.join(folder, f".{name}.snapshot")
+    return base + '.feather', base + '.json', base + '.aggregates.pkl'
+
+
+def file_hash(file_path):
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as fh:
+        for block in iter(lambda: fh.read(HASH_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_key(file_path):
+    stat = os.stat(file_path)
+    return {'path': os.path.abspath(file_path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _write_atomic(path, write):
+    tmp = path + '.tmp'
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def load_snapshot(file_path, tag=None):
+    """Returns (df, aggregate cubes) from a still-valid snapshot, or None.
+
+    tag identifies ingest settings baked into the data (e.g. the categorization
+    rules); a snapshot written under another tag is not reused.
+    """
+    if feather is None:
+        return None
+    data_path, meta_path, aggs_path = snapshot_paths(file_path)
+    try:
+        with open(meta_path, encoding='utf-8') as fh:
+            meta = json.load(fh)
+        key = _source_key(file_path)
+    except (OSError, ValueError):
+        return None
+
+    if meta.get('version') != SNAPSHOT_VERSION or meta.get('path') != key['path'] \
+            or meta.get('size') != key['size'] or meta.get('tag') != tag:
+        return None
+    if meta.get('mtime_ns') != key['mtime_ns']:
+        if meta.get('hash') != file_hash(file_path):
+            return None
+        meta['mtime_ns'] = key['mtime_ns']  # touched but unchanged: keep the snapshot
+        _write_atomic(meta_path, lambda p: _dump_json(meta, p))
+
+    try:
+        df = feather.read_table(data_path, memory_map=True).to_pandas()
+        with open(aggs_path, 'rb') as fh:
+            cubes = pickle.load(fh)
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+        return None
+    return df, cubes
+
+
+def _arrow_safe(df):
+    """df with mixed-type object columns (e.g. an extra column typed differently per
+    parsed chunk) as strings, which Arrow can store."""
+    import pandas as pd
+
+    mixed = [c for c in df.columns if df[c].dtype == object
+             and pd.api.types.infer_dtype(df[c], skipna=True).startswith('mixed')]
+    if not mixed:
+        return df
+    return df.assign(**{c: df[c].map(lambda v: None if pd.isna(v) else str(v)) for c in mixed})
+
+
+def write_snapshot(file_path, df, cubes, tag=None):
+    """Writes the typed store and its aggregate cubes next to the source ledger."""
+    if feather is None:
+        return
+    data_path, meta_path, aggs_path = snapshot_paths(file_path)
+    meta = dict(_source_key(file_path), version=SNAPSHOT_VERSION, hash=file_hash(file_path), tag=tag)
+
+    # Uncompressed so the next open can memory-map the columns instead of decoding them.
+    df = _arrow_safe(df)
+    _write_atomic(data_path, lambda p: feather.write_feather(df, p, compression='uncompressed'))
+    _write_atomic(aggs_path, lambda p: _dump_pickle(cubes, p))
+    _write_atomic(meta_path, lambda p: _dump_json(meta, p))
+
+
+def write_frame(path, df):
+    """Writes a typed store on its own (e.g. a spilled workspace ledger); returns the path used."""
+    if feather is None:
+        path += '.pkl'
+        _write_atomic(path, lambda p: df.to_pickle(p))
+    else:
+        df = _arrow_safe(df)
+        _write_atomic(path, lambda p: feather.write_feather(df, p, compression='uncompressed'))
+    return path
+
+
+def read_frame(path):
+    """Reads a frame written by write_frame, memory-mapping it when it is Feather."""
+    if path.endswith('.pkl'):
+        import pandas as pd
+        return pd.read_pickle(path)
+    return feather.read_table(path, memory_map=True).to_pandas()
+
+
+def _dump_json(obj, path):
+    with open(path, 'w', encoding='utf-8') as fh:
+        json.dump(obj, fh)
+
+
+def _dump_pickle(obj, path):
+    with open(path, 'wb') as fh:
+        pickle.dump(obj, fh, protocol=pickle.HIGHEST_PROTOCOL)
@@ -0,0 +1,78 @@
+import subprocess
+import sys
+import threading
+
+# --- 🚀 Cold Start 🚀 ---
+# The sidebar and welcome view only need Tkinter, so the entry modules import nothing
+# heavier: pandas, numpy, Matplotlib and tkcalendar are imported inside the functions
+# that first need them (file load, chart views, the Add Transaction popup). Once the
+# window is up, warm_imports loads them on a daemon thread so the first load or chart
+# view usually finds them already in sys.modules.
+#
+# `python app_startup.py` measures a cold import of the entry modules in a fresh
+# interpreter and fails when it exceeds STARTUP_BUDGET_MS or pulls in a heavy module;
+# test_startup.py runs the same check under pytest.
+
+ENTRY_MODULES = ('app_styles', 'app_logic_data', 'app_plotting')
+HEAVY_MODULES = ('numpy', 'pandas', 'matplotlib', 'tkcalendar', 'pyarrow')
+WARM_MODULES = ('numpy', 'pandas', 'matplotlib.figure', 'matplotlib.dates', 'tkcalendar',
+                'app_loader', 'app_search', 'app_charts', 'app_virtual_table')
+STARTUP_BUDGET_MS = 250
+
+
+def _import_all(modules):
+    for name in modules:
+        try:
+            __import__(name)
+        except ImportError:
+            pass  # reported properly when the feature that needs it is used
+
+
+def warm_imports(modules=WARM_MODULES):
+    """Imports the deferred modules on a background thread; returns the thread."""
+    thread = threading.Thread(target=_import_all, args=(modules,), name='warm-imports', daemon=True)
+    thread.start()
+    return thread
+
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+for name in {entry!r}:
+    __import__(name)
+elapsed = (time.perf_counter() - start) * 1000
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(elapsed, ','.join(heavy))
+"""
+
+
+def measure_startup(runs=3):
+    """(best import time in ms, eagerly imported heavy modules) over fresh interpreters."""
+    code = _PROBE.format(entry=ENTRY_MODULES, heavy=HEAVY_MODULES)
+    best, eager = None, []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        elapsed, _, heavy = out.stdout.strip().partition(' ')
+        best = float(elapsed) if best is None else min(best, float(elapsed))
+        eager = [name for name in heavy.split(',') if name]
+    return best, eager
+
+
+def check_startup_budget(budget_ms=STARTUP_BUDGET_MS, measured=None):
+    """Returns a list of budget violations (empty when startup is within budget)."""
+    elapsed, eager = measured or measure_startup()
+    problems = []
+    if elapsed > budget_ms:
+        problems.append(f"entry modules took {elapsed:.0f} ms to import (budget {budget_ms} ms)")
+    if eager:
+        problems.append(f"heavy modules imported at startup: {', '.join(eager)}")
+    return problems
+
+
+if __name__ == '__main__':
+    measured = measure_startup()
+    print(f"Cold import of {', '.join(ENTRY_MODULES)}: {measured[0]:.0f} ms (budget {STARTUP_BUDGET_MS} ms)")
+    problems = check_startup_budget(measured=measured)
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,226 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from app_currency import BASE_CURRENCY
+
+# --- 🗃️ Typed Transaction Store 🗃️ ---
+# Every view filters on Type/Category and lower-cases Category/Description, so the
+# loader normalizes the ledger once: categoricals for the repeated string columns
+# (masks become integer-code comparisons), float64 amounts, datetime64 dates and
+# pre-lowered text columns kept under a leading underscore (never saved to disk).
+# Amount is in the row's Currency; see app_currency for the display conversion.
+
+TRANSACTION_COLUMNS = ['Date', 'Category', 'Description', 'Type', 'Amount', 'Currency']
+TRANSACTION_TYPES = ['Income', 'Expense']
+CATEGORICAL_COLUMNS = ['Type', 'Category', 'Description', 'Currency']
+LOWER_COLUMNS = {'Category': '_category_lower', 'Description': '_description_lower'}
+CHUNK_ROWS = 100_000  # Rows parsed per chunk while streaming a file in
+
+
+def _lowered_categorical(series):
+    """Lower-cases a categorical over its categories only and re-maps the codes."""
+    lowered = series.cat.categories.str.lower()
+    inverse, uniques = pd.factorize(lowered)
+    codes = series.cat.codes.to_numpy()
+    new_codes = np.where(codes >= 0, inverse[np.maximum(codes, 0)], -1) if len(inverse) else codes
+    return pd.Series(pd.Categorical.from_codes(new_codes, categories=uniques), index=series.index)
+
+
+def _attach_lower_columns(df):
+    """(Re)builds the cached lower-case text columns from the categorical sources."""
+    for col, lower_col in LOWER_COLUMNS.items():
+        df[lower_col] = _lowered_categorical(df[col])
+    return df
+
+
+def refresh_lower_columns(df):
+    """Rebuilds the lower-case columns after Category/Description were replaced (in place)."""
+    return _attach_lower_columns(df)
+
+
+def normalize_transactions(df):
+    """Returns a typed copy of a raw ledger frame ready to be used as self.df."""
+    return _attach_lower_columns(_typed_columns(df))
+
+
+def _typed_columns(df):
+    """Converts a raw frame to the typed public columns (no cached lower-case columns)."""
+    df = df.rename(columns=lambda c: str(c).strip().title())
+    missing = [c for c in ('Date', 'Type', 'Amount') if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+
+    store = pd.DataFrame(index=pd.RangeIndex(len(df)))
+    store['Date'] = pd.to_datetime(df['Date'].to_numpy(), errors='coerce')
+
+    category = df['Category'] if 'Category' in df.columns else pd.Series('Uncategorized', index=df.index)
+    store['Category'] = pd.Series(category.to_numpy(), dtype='string').str.strip() \
+        .fillna('Uncategorized').astype('category')
+
+    description = df['Description'] if 'Description' in df.columns else pd.Series('', index=df.index)
+    store['Description'] = pd.Series(description.to_numpy(), dtype='string').fillna('').astype('category')
+
+    types = pd.Series(df['Type'].to_numpy(), dtype='string').str.strip().str.title()
+    others = sorted(set(types.dropna()) - set(TRANSACTION_TYPES))
+    store['Type'] = pd.Categorical(types, categories=TRANSACTION_TYPES + others)
+
+    store['Amount'] = pd.to_numeric(df['Amount'].to_numpy(), errors='coerce').astype('float64')
+
+    currency = df['Currency'] if 'Currency' in df.columns else pd.Series(BASE_CURRENCY, index=df.index)
+    store['Currency'] = pd.Series(currency.to_numpy(), dtype='string').str.strip().str.upper() \
+        .replace('', pd.NA).fillna(BASE_CURRENCY).astype('category')
+
+    extra = [c for c in df.columns if c not in TRANSACTION_COLUMNS and not str(c).startswith('_')]
+    for col in extra:
+        store[col] = df[col].to_numpy()
+
+    return store.dropna(subset=['Date', 'Amount']).reset_index(drop=True)
+
+
+def _same_category_dtype(arrays):
+    """Recasts categories to one dtype (a Feather snapshot reads them back as str, a parse as string)."""
+    dtype = arrays[0].categories.dtype
+    return [a if a.categories.dtype == dtype else
+            pd.Categorical.from_codes(a.codes, categories=a.categories.astype(dtype)) for a in arrays]
+
+
+def concat_typed(frames):
+    """Concatenates typed frames, unioning categoricals so no column falls back to object."""
+    frames = [f for f in frames if f is not None and len(f)]
+    if not frames:
+        return normalize_transactions(pd.DataFrame(columns=TRANSACTION_COLUMNS))
+    if len(frames) == 1:
+        return _attach_lower_columns(frames[0].drop(columns=list(LOWER_COLUMNS.values()), errors='ignore'))
+
+    columns = []
+    for frame in frames:
+        columns += [c for c in frame.columns if c not in columns and c not in LOWER_COLUMNS.values()]
+    combined = {}
+    for col in columns:
+        if col in CATEGORICAL_COLUMNS:
+            combined[col] = pd.api.types.union_categoricals(_same_category_dtype([f[col].array for f in frames]),
+                                                            ignore_order=True)
+        else:
+            combined[col] = np.concatenate([
+                f[col].to_numpy() if col in f.columns else np.full(len(f), None) for f in frames
+            ])
+    return _attach_lower_columns(pd.DataFrame(combined))
+
+
+def typed_records(records):
+    """Typed rows (no cached lower-case columns) for raw transaction records."""
+    return _typed_columns(pd.DataFrame.from_records(records))
+
+
+def append_transactions(df, records):
+    """Appends raw records to a typed store, keeping every categorical column typed."""
+    return concat_typed([df, typed_records(records)])
+
+
+def remove_rows(df, positions):
+    """Returns the store without the rows at positions (renumbered from 0)."""
+    keep = np.ones(len(df), dtype=bool)
+    keep[positions] = False
+    return df[keep].reset_index(drop=True)
+
+
+def native_amounts(df):
+    """Amounts in each row's own Currency (Amount may hold display-currency values)."""
+    return df['_native_amount'] if '_native_amount' in df.columns else df['Amount']
+
+
+def public_columns(df):
+    """Drops the internal cached columns before the frame is written or exported.
+
+    Amount goes back to the row's own currency if the store was converted for display.
+    """
+    if '_native_amount' in df.columns:
+        df = df.assign(Amount=df['_native_amount'])
+    return df[[c for c in df.columns if not str(c).startswith('_')]]
+
+
+def native_frame(df):
+    """The store with Amount in each row's own currency (as the loader builds it)."""
+    if '_native_amount' not in df.columns:
+        return df
+    return df.assign(Amount=df['_native_amount']).drop(columns='_native_amount')
+
+
+def _raw_ledger_chunks(file_path, chunk_rows=CHUNK_ROWS):
+    """Streams a ledger's untyped rows as (raw chunk, fraction of the file read) pairs."""
+    lower = file_path.lower()
+    if lower.endswith('.csv'):
+        total = os.path.getsize(file_path) or 1
+        with open(file_path, 'rb') as fh:
+            for raw in pd.read_csv(fh, chunksize=chunk_rows):
+                yield raw, min(fh.tell() / total, 1.0)
+        return
+
+    if lower.endswith('.xls'):
+        # Legacy workbooks have no streaming reader; parse them in one go.
+        yield pd.read_excel(file_path), 1.0
+        return
+
+    from openpyxl import load_workbook
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        keep = [i for i, name in enumerate(header) if name is not None]
+        columns = [header[i] for i in keep]
+        total = max((sheet.max_row or 0) - 1, 1)
+        batch, done = [], 0
+        for row in rows:
+            batch.append([row[i] if i < len(row) else None for i in keep])
+            if len(batch) >= chunk_rows:
+                done += len(batch)
+                yield pd.DataFrame(batch, columns=columns), min(done / total, 1.0)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns), 1.0
+    finally:
+        workbook.close()
+
+
+def iter_ledger_chunks(file_path, chunk_rows=CHUNK_ROWS):
+    """Streams a ledger as (typed chunk, fraction of the file read) pairs.
+
+    CSV is read with a chunked parser and XLSX with openpyxl's read-only row
+    iterator, so only one raw chunk is ever held in memory at a time.
+    """
+    for raw, fraction in _raw_ledger_chunks(file_path, chunk_rows):
+        yield _typed_columns(raw), fraction
+
+
+def count_unparseable_rows(file_path):
+    """Non-blank rows of a ledger file the loader skips (no valid Date or Amount)."""
+    skipped = 0
+    for raw, _ in _raw_ledger_chunks(file_path):
+        raw = raw.dropna(how='all')
+        skipped += len(raw) - len(_typed_columns(raw))
+    return skipped
+
+
+def parse_csv_rows(header, data):
+    """Typed rows from a slice of CSV lines, parsed under the file's header line."""
+    import io
+    return _typed_columns(pd.read_csv(io.BytesIO(header + data)))
+
+
+def read_ledger(file_path):
+    """Reads an XLSX/CSV ledger from disk into the typed store."""
+    return concat_typed([chunk for chunk, _ in iter_ledger_chunks(file_path)])
+
+
+def write_ledger_file(out, file_path):
+    """Writes an already-public frame to an XLSX/CSV path as-is."""
+    if file_path.lower().endswith('.csv'):
+        out.to_csv(file_path, index=False, date_format='%Y-%m-%d')
+    else:
+        out.to_excel(file_path, index=False)
+
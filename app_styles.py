@@ -1,33 +1,22 @@
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, Toplevel, simpledialog
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-from datetime import datetime
-import numpy as np
-from tkcalendar import DateEntry  # Still needed for the 'Add Transaction' popup
-
-# --- 🎨 Color & Font Definitions 🎨 ---
-COLOR_BG = '#1e1e2e'
-COLOR_CONTENT_BG = '#181825'
-COLOR_CARD = '#313244'
-COLOR_TEXT = '#cdd6f4'
-COLOR_TEXT_SUBTLE = '#a6adc8'
-COLOR_PRIMARY = '#89b4fa'
-COLOR_GREEN = '#a6e3a1'
-COLOR_RED = '#f38ba8'
-COLOR_YELLOW = '#f9e2af'
-COLOR_BORDER = '#45475a'
-
-FONT_FAMILY = 'Arial'
-FONT_NORMAL = (FONT_FAMILY, 11)
-FONT_BOLD = (FONT_FAMILY, 11, 'bold')
-FONT_TITLE = (FONT_FAMILY, 24, 'bold')
-FONT_H1 = (FONT_FAMILY, 18, 'bold')
-FONT_H2 = (FONT_FAMILY, 14, 'bold')
-FONT_KPI = (FONT_FAMILY, 28, 'bold')
+
+from app_theme import (COLOR_BG, COLOR_CONTENT_BG, COLOR_CARD, COLOR_TEXT, COLOR_TEXT_SUBTLE,
+                       COLOR_PRIMARY, COLOR_GREEN, COLOR_RED, COLOR_YELLOW, COLOR_BORDER,
+                       FONT_FAMILY, FONT_NORMAL, FONT_BOLD, FONT_TITLE, FONT_H1, FONT_H2, FONT_KPI)
+# pandas, numpy, Matplotlib and tkcalendar are imported on first use (see app_startup)
+from app_currency import display_currency, money, symbol
+from app_perf import instrument, profiler
+from app_perf_overlay import PerfOverlay
+from app_startup import warm_imports
+from app_workers import TaskRunner
+from app_view_cache import ChartViewCache
+from app_watch import POLL_MS
+from app_workspace import Workspace
+
+SEARCH_DEBOUNCE_MS = 150  # Delay after the last keystroke before searching
+MAX_REVIEW_ROWS = 5000    # Duplicate Review: rows listed at once
 
 
 class BudgetDashboard:
@@ -43,6 +32,29 @@ class BudgetDashboard:
         self.df = None          # The one and only dataframe
         self.file_path = None   # Path to the loaded file for saving
         self.budgets = {}       # Dictionary to store category budgets
+        self.aggregates = None              # Shared month/year/category cubes, built on load
+        self.search_index = None            # Built on load for the All Transactions search box
+        self.top_index = None               # Amount-sorted expense index for the Top Expenses view
+        self.top_n = 5                      # Top Expenses: rows per list
+        self.top_group = 'Overall'          # Top Expenses: 'Overall', 'Per Category' or 'Per Month'
+        self.search_after_id = None         # Pending debounced search-as-you-type callback
+        self.loading_partial = None         # Last partial totals shown while a file streams in
+        self.journal = None                 # Append-only save journal for the loaded file
+        self.pending_records = []           # Transactions added since the last save
+        self.pending_exclusions = []        # Keys of rows confirmed as duplicates since the last save
+        self.budgets_dirty = False          # Budgets changed since the last save
+        self.budget_month = None            # Month shown on the Budgets page (None = latest)
+        self.compaction_task = None         # Background full rewrite of the source file
+        self.chart_views = ChartViewCache(self.root)  # Figures/canvases kept alive between views
+        self.ledger_filter = None           # Date/category filter shared by all views
+        self.filter_bar = None              # Its bar above the content area (built on first load)
+        self.workspace = Workspace()        # Every open ledger, LRU-spilled under a memory budget
+        self.ledger_paths = []              # File paths in the order of the ledger switcher
+        self.watcher = None                 # Tracks bytes appended to the active ledger's file
+        self.watch_task = None              # Pending read of appended rows (one at a time)
+        self.fx = None                      # Active ledger's converted state per display currency
+        self.currency_var = tk.StringVar(value=display_currency())  # Requested display currency
+        self.perf_overlay = PerfOverlay(self.root, self.ledger_memory)  # F12: stage timings
         self.active_view_func = self.show_welcome # Function to refresh
         
         # --- Main Content Canvas ---
@@ -52,7 +64,20 @@ class BudgetDashboard:
         
         self.setup_styles()
         self.setup_ui()
+        self.tasks = TaskRunner(self.root, on_progress=self.show_task_progress,
+                                on_idle=self.hide_task_progress)
         self.populate_default_budgets() # Pre-fill some budgets
+        self.root.after_idle(warm_imports)  # Load the heavy modules once the window is up
+        self.root.bind('<F12>', lambda e: self.perf_overlay.toggle())
+        self.root.after(POLL_MS, self.check_watched_file)  # Watch mode timer
+
+    def ledger_memory(self):
+        """In-memory size of the open ledgers in bytes (None before a file is loaded)."""
+        if self.df is None:
+            return None
+        active = self.workspace.active
+        others = self.workspace.memory_bytes() - (active.memory_bytes() if active else 0)
+        return others + int(self.df.memory_usage(deep=False).sum())
 
     def setup_styles(self):
         """Centralized TTK styling for a modern, consistent look."""
@@ -205,6 +230,7 @@ class BudgetDashboard:
                                 style='Accent.TButton',
                                 cursor='hand2')
         upload_btn.pack(pady=(10, 5), padx=10, fill='x')
+        self.upload_btn = upload_btn # Save reference
 
         self.file_status = ttk.Label(upload_frame, 
                                      text="No file loaded\nSupports: .xlsx, .csv",
@@ -214,6 +240,21 @@ class BudgetDashboard:
                                      wraplength=300, 
                                      justify='center')
         self.file_status.pack(pady=5, padx=10)
+
+        # Open-ledger switcher (packed once the first file is loaded)
+        self.ledger_combo = ttk.Combobox(upload_frame, state='readonly')
+        self.ledger_combo.bind('<<ComboboxSelected>>', self.on_ledger_selected)
+
+        # Background task progress (packed only while a load/save is running)
+        self.task_frame = ttk.Frame(upload_frame, style='Card.TFrame')
+        self.task_progress = ttk.Progressbar(self.task_frame, orient='horizontal',
+                                             mode='determinate', maximum=100,
+                                             style='Green.Horizontal.TProgressbar')
+        self.task_progress.pack(side='left', fill='x', expand=True, padx=(10, 5), pady=(0, 10))
+        self.task_cancel_btn = ttk.Button(self.task_frame, text="✖ Cancel",
+                                          command=self.cancel_tasks,
+                                          style='TButton', cursor='hand2')
+        self.task_cancel_btn.pack(side='right', padx=(5, 10), pady=(0, 10))
         
         # --- Sidebar Data Controls ---
         controls_frame = ttk.Frame(self.sidebar_frame, style='Card.TFrame')
@@ -231,6 +272,29 @@ class BudgetDashboard:
         save_btn.pack(pady=5, padx=10, fill='x')
         self.save_btn = save_btn # Save reference
 
+        rules_btn = ttk.Button(controls_frame, text="🏷️ Categorization Rules",
+                               command=self.open_rules_window,
+                               style='TButton', cursor='hand2')
+        rules_btn.pack(pady=5, padx=10, fill='x')
+
+        self.watch_var = tk.BooleanVar(value=False)
+        watch_check = ttk.Checkbutton(controls_frame, text="👁️ Watch file for new rows",
+                                      variable=self.watch_var, cursor='hand2')
+        watch_check.pack(pady=5, padx=10, anchor='w')
+
+        currency_label = ttk.Label(controls_frame, text="💱 Display currency", style='Card.TLabel')
+        currency_label.pack(pady=(10, 0), padx=10, anchor='w')
+        # Choices come from the FX rate file, read when the list is first opened
+        self.currency_combo = ttk.Combobox(controls_frame, textvariable=self.currency_var, state='readonly',
+                                           values=[display_currency()], postcommand=self.refresh_currency_choices)
+        self.currency_combo.bind('<<ComboboxSelected>>', self.on_currency_selected)
+        self.currency_combo.pack(pady=5, padx=10, fill='x')
+
+        fx_btn = ttk.Button(controls_frame, text="📥 Import FX Rates",
+                            command=self.import_fx_rates,
+                            style='TButton', cursor='hand2')
+        fx_btn.pack(pady=5, padx=10, fill='x')
+
         # --- Sidebar: Visualizations (FIXED: Scrollbar removed) ---
         view_frame = ttk.Frame(self.sidebar_frame, style='Card.TFrame')
         view_frame.pack(pady=10, padx=15, fill='both', expand=True)
@@ -245,8 +309,10 @@ class BudgetDashboard:
             ("📈 Income vs Expense", self.show_income_expense),
             ("📅 Monthly Trends", self.show_monthly_trends),
             ("✨ Yearly Summary", self.show_yearly_summary), 
-            ("🏆 Top 5 Expenses", self.show_top_expenses),
+            ("🏆 Top Expenses", self.show_top_expenses),
             ("🔔 Subscription Tracker", self.show_subscriptions),
-            ("📋 All Transactions", self.show_all_transactions)
+            ("📋 All Transactions", self.show_all_transactions),
+            ("🧹 Duplicate Review", self.show_duplicates),
+            ("🗂️ All Ledgers", self.show_consolidated)
         ]
         self.view_buttons = {}
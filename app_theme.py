@@ -0,0 +1,19 @@
+# --- 🎨 Color & Font Definitions 🎨 ---
+COLOR_BG = '#1e1e2e'
+COLOR_CONTENT_BG = '#181825'
+COLOR_CARD = '#313244'
+COLOR_TEXT = '#cdd6f4'
+COLOR_TEXT_SUBTLE = '#a6adc8'
+COLOR_PRIMARY = '#89b4fa'
+COLOR_GREEN = '#a6e3a1'
+COLOR_RED = '#f38ba8'
+COLOR_YELLOW = '#f9e2af'
+COLOR_BORDER = '#45475a'
+
+FONT_FAMILY = 'Arial'
+FONT_NORMAL = (FONT_FAMILY, 11)
+FONT_BOLD = (FONT_FAMILY, 11, 'bold')
+FONT_TITLE = (FONT_FAMILY, 24, 'bold')
+FONT_H1 = (FONT_FAMILY, 18, 'bold')
+FONT_H2 = (FONT_FAMILY, 14, 'bold')
+FONT_KPI = (FONT_FAMILY, 28, 'bold')
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+# --- 🏆 Top-N Expense Index 🏆 ---
+# Built once when a ledger loads: expense row positions sorted by amount (largest
+# first), plus the same order grouped by category and by month. The top N overall
+# is then the first N entries, and the top N of every group is the first N of each
+# group's segment, so neither large N nor per-group lists rescan the ledger. With
+# the filter bar active the sorted order is walked in chunks until N rows pass the
+# filter mask. Transactions added later go to a small pending list that is merged
+# into each answer and folded into the sorted orders once it grows past MERGE_ROWS.
+
+GROUPS = ('category', 'month')
+MERGE_ROWS = 4096
+
+
+def _group_keys(df, positions, by):
+    """Integer group keys and their labels for the given row positions."""
+    if by == 'category':
+        codes = df['Category'].cat.codes.to_numpy()[positions].astype('int64')
+        return codes, list(df['Category'].cat.categories)
+    months = df['Date'].to_numpy()[positions].astype('datetime64[M]').astype('int64')
+    return months, None
+
+
+def _month_label(key):
+    return pd.Period(np.datetime64(int(key), 'M'), freq='M')
+
+
+class TopExpenseIndex:
+    def __init__(self, df):
+        self._build(df, np.flatnonzero((df['Type'] == 'Expense').to_numpy() & df['Amount'].notna().to_numpy()))
+
+    def _build(self, df, positions):
+        amounts = df['Amount'].to_numpy()[positions]
+        self.by_amount = positions[np.lexsort((positions, -amounts))]
+        self.groups = {}
+        for by in GROUPS:
+            keys, labels = _group_keys(df, positions, by)
+            order = np.lexsort((positions, -amounts, keys))
+            sorted_keys = keys[order]
+            unique, starts = np.unique(sorted_keys, return_index=True)
+            ends = np.append(starts[1:], len(order))
+            self.groups[by] = (positions[order], unique, starts, ends)
+        self.pending = []
+
+    def extend(self, df, start):
+        """Indexes expense rows appended to the store at positions >= start."""
+        types = df['Type'].to_numpy()[start:]
+        self.pending.extend(start + i for i, t in enumerate(types) if t == 'Expense')
+        if len(self.pending) > MERGE_ROWS:
+            self._build(df, np.sort(np.concatenate([self.by_amount, self.pending])))
+
+    @staticmethod
+    def _take(order, n, allowed):
+        """First n positions of order that pass the allowed mask (scanning in chunks)."""
+        if allowed is None:
+            return order[:n]
+        found, step, i = [], max(4 * n, 1024), 0
+        count = 0
+        while count < n and i < len(order):
+            chunk = order[i:i + step]
+            hits = chunk[allowed[chunk]]
+            found.append(hits)
+            count += len(hits)
+            i += step
+            step *= 2
+        return np.concatenate(found)[:n] if found else order[:0]
+
+    @staticmethod
+    def _merge(df, positions, extra, n):
+        """Merges pending positions into an amount-ordered list and keeps the top n."""
+        if not len(extra):
+            return positions
+        merged = np.concatenate([positions, np.asarray(extra, dtype='int64')])
+        amounts = df['Amount'].to_numpy()[merged]
+        return merged[np.lexsort((merged, -amounts))][:n]
+
+    def _pending(self, allowed):
+        if allowed is None:
+            return self.pending
+        return [p for p in self.pending if p < len(allowed) and allowed[p]]
+
+    def top(self, df, n, allowed=None):
+        """Positions of the n largest expenses (optionally within an allowed-row mask)."""
+        return self._merge(df, self._take(self.by_amount, n, allowed), self._pending(allowed), n)
+
+    def top_by(self, df, by, n, allowed=None):
+        """{group label: positions of its n largest expenses}, groups in ascending key order.
+
+        by is 'category' (labels are category names, in category code order) or
+        'month' (monthly Periods). Pending rows are merged in by key, so the order
+        is the same with or without them.
+        """
+        order, keys, starts, ends = self.groups[by]
+        found = {}
+        for key, lo, hi in zip(keys, starts, ends):
+            rows = self._take(order[lo:hi], n, allowed)
+            if len(rows):
+                found[int(key)] = rows
+
+        pending = self._pending(allowed)
+        if pending:
+            extra_keys, _ = _group_keys(df, np.asarray(pending, dtype='int64'), by)
+            extra = {}
+            for key, position in zip(extra_keys.tolist(), pending):
+                extra.setdefault(key, []).append(position)
+            for key, positions in extra.items():
+                current = found.get(key, np.zeros(0, dtype='int64'))
+                found[key] = self._merge(df, current, positions, n)
+
+        labels = list(df['Category'].cat.categories) if by == 'category' else None
+        return {labels[key] if labels else _month_label(key): found[key] for key in sorted(found)}
@@ -0,0 +1,90 @@
+import tkinter as tk
+from tkinter import ttk
+
+from app_perf import profiler
+from app_theme import COLOR_CONTENT_BG
+
+# --- 🖼️ Chart View Cache 🖼️ ---
+# Rebuilding a Figure + FigureCanvasTkAgg on every sidebar click re-runs the whole
+# Matplotlib layout and Agg rasterization. Each chart view is instead built once into
+# a frame owned by the root window and packed into the content area on demand; it is
+# re-rendered only when the aggregate version it was drawn from is out of date.
+# Frames are children of root (an ancestor of the content area) so that
+# clear_content_frame, which destroys content children, leaves them alive.
+
+
+class ChartView:
+    def __init__(self, root, charts, scrollable):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.charts = charts
+        self.version = None
+        self.frame = ttk.Frame(root, style='Content.TFrame')
+        self.header = ttk.Frame(self.frame, style='Content.TFrame')
+        self.header.pack(fill='x', padx=10, pady=10)
+
+        if scrollable:
+            body = self._scrollable_body()
+            pack = {'fill': 'x', 'expand': True, 'padx': 10, 'pady': 10}
+        else:
+            body = self.frame
+            pack = {'fill': 'both', 'expand': True, 'padx': 20, 'pady': 20}
+
+        self.canvases = []
+        for chart in charts:
+            canvas = FigureCanvasTkAgg(chart.figure, body)
+            chart.attach(canvas)
+            canvas.get_tk_widget().pack(**pack)
+            self.canvases.append(canvas)
+
+    def _scrollable_body(self):
+        canvas = tk.Canvas(self.frame, bg=COLOR_CONTENT_BG, highlightthickness=0)
+        scrollbar = ttk.Scrollbar(self.frame, orient='vertical', command=canvas.yview)
+        inner = ttk.Frame(canvas, style='Content.TFrame')
+        window = canvas.create_window((0, 0), window=inner, anchor='nw')
+
+        inner.bind('<Configure>', lambda e: canvas.configure(scrollregion=canvas.bbox('all')))
+        canvas.bind('<Configure>', lambda e: canvas.itemconfigure(window, width=e.width))
+        canvas.bind_all('<MouseWheel>',
+                        lambda e: canvas.yview_scroll(-1 if e.delta > 0 else 1, 'units')
+                        if canvas.winfo_ismapped() else None, add='+')
+        canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+        canvas.pack(side='left', fill='both', expand=True)
+        return inner
+
+    def redraw(self):
+        with profiler.span('canvas.draw'):
+            for canvas in self.canvases:
+                canvas.draw()
+
+
+class ChartViewCache:
+    def __init__(self, root):
+        self.root = root
+        self._views = {}
+
+    def hide(self):
+        """Unpacks every cached view; called before another view fills the content area."""
+        for view in self._views.values():
+            view.frame.pack_forget()
+
+    def clear(self):
+        for view in self._views.values():
+            view.frame.destroy()
+        self._views.clear()
+
+    def show(self, name, parent, make_charts, version, render, scrollable=False):
+        """Packs the cached view into parent, calling render(view) first if it is stale."""
+        self.hide()
+        view = self._views.get(name)
+        if view is None:
+            view = self._views[name] = ChartView(self.root, make_charts(), scrollable)
+        if view.version != version:
+            with profiler.span('chart.render'):
+                render(view)
+            view.version = version
+            view.redraw()
+        view.frame.pack(in_=parent, fill='both', expand=True)
+        view.frame.lift()
+        return view
@@ -0,0 +1,146 @@
+from tkinter import ttk
+
+import numpy as np
+
+from app_perf import profiler
+
+# --- 📋 Virtual Scrolling Table 📋 ---
+# A plain Treeview holds one Tk item per row, which freezes the main loop on large
+# ledgers. VirtualTable keeps a fixed pool of items (visible rows + a small overscan)
+# and re-fills their values from an array of row positions as the scrollbar moves,
+# so memory and render time stay flat regardless of how many rows there are.
+# The pool also holds OVERSCAN rows above the offset, and the tree is scrolled so
+# the offset row sits at the top; arrow and page keys move the cursor through the
+# source rows and shift the offset when it reaches the window edge.
+
+
+class VirtualTable:
+    OVERSCAN = 5
+    DEFAULT_ROW_HEIGHT = 20
+
+    def __init__(self, parent, columns, fetch_rows):
+        """fetch_rows(positions) -> list of (values, tags) for the given row positions."""
+        self.fetch_rows = fetch_rows
+        self.positions = np.empty(0, dtype=np.int64)
+        self.offset = 0
+        self.start = 0  # source index of the first pooled item (offset minus the overscan above)
+        self.visible = 20
+
+        self.tree = ttk.Treeview(parent, columns=columns, show='headings',
+                                 style='Treeview', height=self.visible)
+        self.vsb = ttk.Scrollbar(parent, orient='vertical', command=self._on_scrollbar)
+        self.hsb = ttk.Scrollbar(parent, orient='horizontal', command=self.tree.xview)
+        self.tree.configure(xscrollcommand=self.hsb.set)
+
+        style = ttk.Style()
+        self.row_height = int(style.lookup('Treeview', 'rowheight') or self.DEFAULT_ROW_HEIGHT)
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self.scroll_by(-3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll_by(3))
+        self.tree.bind('<Up>', lambda e: self.move_cursor(-1))
+        self.tree.bind('<Down>', lambda e: self.move_cursor(1))
+        self.tree.bind('<Prior>', lambda e: self.move_cursor(-self.visible))
+        self.tree.bind('<Next>', lambda e: self.move_cursor(self.visible))
+
+    def grid(self, row=0, column=0):
+        """Lays out the table and its scrollbars like the plain Treeview it replaces."""
+        self.tree.grid(row=row, column=column, sticky='nsew')
+        self.vsb.grid(row=row, column=column + 1, sticky='ns')
+        self.hsb.grid(row=row + 1, column=column, sticky='ew')
+
+    def set_rows(self, positions):
+        """Replaces the displayed row set (positions into the source frame, in display order)."""
+        self.positions = np.asarray(positions, dtype=np.int64)
+        self.offset = 0
+        self.tree.selection_set(())
+        self.refresh()
+
+    # --- Scrolling ---
+    def scroll_to(self, offset):
+        max_offset = max(len(self.positions) - self.visible, 0)
+        offset = min(max(int(offset), 0), max_offset)
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.offset + rows)
+        return 'break'
+
+    def move_cursor(self, rows):
+        """Moves the selected row by `rows`, shifting the offset when it leaves the visible rows."""
+        total = len(self.positions)
+        cursor = self._cursor()
+        if not total:
+            return 'break'
+        target = self.offset if cursor is None else min(max(cursor + rows, 0), total - 1)
+        if target < self.offset:
+            self.scroll_to(target)
+        elif target >= self.offset + self.visible:
+            self.scroll_to(target - self.visible + 1)
+        self._select(target)
+        return 'break'
+
+    def _cursor(self):
+        """Source index of the selected row, or None when nothing is selected."""
+        focus = self.tree.focus()
+        if not focus or focus not in self.tree.selection():
+            return None
+        return self.start + self.tree.index(focus)
+
+    def _select(self, index):
+        items = self.tree.get_children()
+        if self.start <= index < self.start + len(items):
+            iid = items[index - self.start]
+            self.tree.focus(iid)
+            self.tree.selection_set(iid)
+        else:
+            self.tree.selection_set(())
+
+    def _on_scrollbar(self, action, *args):
+        if action == 'moveto':
+            self.scroll_to(float(args[0]) * len(self.positions))
+        elif action == 'scroll':
+            step = int(args[0]) * (self.visible if args[1] == 'pages' else 1)
+            self.scroll_by(step)
+
+    def _on_mousewheel(self, event):
+        return self.scroll_by(-3 if event.delta > 0 else 3)
+
+    def _on_resize(self, event):
+        # One row of the height is taken by the headings.
+        visible = max(event.height // self.row_height - 1, 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.scroll_to(self.offset)
+            self.refresh()
+
+    # --- Rendering ---
+    def refresh(self):
+        """Re-fills the item pool around the current offset, keeping the selection on its row."""
+        cursor = self._cursor()
+        self.start = max(self.offset - self.OVERSCAN, 0)
+        window = self.positions[self.start:self.offset + self.visible + self.OVERSCAN]
+        with profiler.span('prep.fetch_rows'):
+            rows = self.fetch_rows(window) if len(window) else []
+
+        with profiler.span('treeview.fill'):
+            items = self.tree.get_children()
+            for iid, (values, tags) in zip(items, rows):
+                self.tree.item(iid, values=values, tags=tags)
+            for values, tags in rows[len(items):]:
+                self.tree.insert('', 'end', values=values, tags=tags)
+            if len(items) > len(rows):
+                self.tree.delete(*items[len(rows):])
+        self.tree.yview_moveto(0)
+        self.tree.yview_scroll(self.offset - self.start, 'units')
+        if cursor is not None:
+            self._select(cursor)
+
+        total = len(self.positions)
+        if total:
+            self.vsb.set(self.offset / total, min((self.offset + self.visible) / total, 1.0))
+        else:
+            self.vsb.set(0.0, 1.0)
@@ -0,0 +1,113 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# --- ⚙️ Background Task Runner ⚙️ ---
+# Loading, aggregation and export run on a worker pool so the Tk main loop never
+# blocks. Tk is not thread-safe, so workers never touch widgets: the main thread
+# polls the futures with root.after and dispatches results/progress from there.
+# Threads (not processes) are used because results are large DataFrames that
+# would otherwise have to be pickled back to the UI process.
+#
+# The Cancel button only aborts cancellable (user-facing) tasks; housekeeping such
+# as compaction, spills and watch checks is submitted with cancellable=False so a
+# half-applied result (e.g. a rewritten file whose journal was never rebased) can't
+# be dropped. A task that does end cancelled still gets its on_cancel callback, so
+# callers can clear their in-flight markers.
+
+
+class TaskCancelled(Exception):
+    """Raised inside a worker by Task.report once cancellation was requested."""
+
+
+class Task:
+    def __init__(self, label, cancellable=True):
+        self.label = label
+        self.cancellable = cancellable
+        self.future = None
+        self.progress = (0.0, label)
+        self.partial = None     # optional partial result published while the task runs
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def report(self, fraction, text=None, partial=None):
+        """Called from the worker to publish progress; doubles as a cancellation point."""
+        if self._cancel.is_set():
+            raise TaskCancelled()
+        if partial is not None:
+            self.partial = partial
+        self.progress = (fraction, text or self.label)
+
+
+class TaskRunner:
+    POLL_MS = 50
+
+    def __init__(self, root, max_workers=2, on_progress=None, on_idle=None):
+        self.root = root
+        self.on_progress = on_progress
+        self.on_idle = on_idle
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='dashboard')
+        self._tasks = []
+        self._after_id = None
+
+    def submit(self, label, fn, *args, on_done=None, on_error=None, on_cancel=None, cancellable=True):
+        """Runs fn(task, *args) on the pool; callbacks are invoked on the Tk main thread.
+
+        Exactly one of on_done, on_error and on_cancel runs when the task ends.
+        """
+        task = Task(label, cancellable)
+        task.future = self._pool.submit(fn, task, *args)
+        self._tasks.append((task, on_done, on_error, on_cancel))
+        if self._after_id is None:
+            self._after_id = self.root.after(self.POLL_MS, self._poll)
+        return task
+
+    @property
+    def busy(self):
+        return bool(self._tasks)
+
+    def cancel_all(self):
+        """Cancels every cancellable task (housekeeping tasks run to completion)."""
+        for task, *_ in self._tasks:
+            if task.cancellable:
+                task.cancel()
+
+    def shutdown(self):
+        for task, *_ in self._tasks:
+            task.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _poll(self):
+        self._after_id = None
+        for entry in list(self._tasks):
+            task, on_done, on_error, on_cancel = entry
+            if not task.future.done():
+                continue
+            self._tasks.remove(entry)
+            error = None if task.future.cancelled() else task.future.exception()
+            if task.cancelled or task.future.cancelled() or isinstance(error, TaskCancelled):
+                if on_cancel:
+                    on_cancel()
+            elif error is not None:
+                if on_error:
+                    on_error(error)
+            elif on_done:
+                on_done(task.future.result())
+
+        if self._tasks:
+            self._after_id = self.root.after(self.POLL_MS, self._poll)
+        live = [task for task, *_ in self._tasks if not task.cancelled]
+        if live:
+            if self.on_progress:
+                # The bar (and its Cancel button) follows the latest user-facing task
+                shown = [task for task in live if task.cancellable] or live
+                self.on_progress(shown[-1])
+        elif self.on_idle:
+            self.on_idle()
@@ -0,0 +1,214 @@
+import atexit
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+
+# --- 🗂️ Multi-Ledger Workspace 🗂️ ---
+# Several ledgers (one per account or family member) stay open at once. Each Ledger
+# bundles the typed store with its aggregates, indexes, journal and unsaved edits;
+# the dashboard swaps the active one's state onto itself. Ledgers are kept in LRU
+# order, and once the loaded frames outgrow the memory budget the coldest inactive
+# ones are spilled: the frame is written to an uncompressed Feather file in a
+# private temp folder and dropped, while the small aggregate cubes stay in memory.
+# Re-activating a spilled ledger memory-maps the file back and rebuilds its indexes;
+# the file stays until the ledger is spilled again or replaced (Windows can't delete
+# a mapped file), and a delete that still fails is retried on the next discard.
+# The consolidated view sums the per-ledger cubes (AggregateCache.combine), so it
+# never needs the rows of any ledger, spilled or not. The dashboard creates the
+# Workspace at startup, so pandas/numpy/pyarrow are only imported on first use.
+
+MEMORY_BUDGET_MB = int(os.environ.get('DASHBOARD_MEMORY_BUDGET_MB', 1024))
+LEDGER_STATE = ('df', 'aggregates', 'search_index', 'filter_index', 'top_index',
+                'journal', 'pending_records', 'pending_exclusions', 'budgets', 'budgets_dirty', 'watcher', 'fx')
+INDEX_STATE = ('search_index', 'filter_index', 'top_index')
+
+
+def _array_bytes(obj, depth=2):
+    """Bytes held in numpy arrays reachable from an index object's attributes."""
+    import numpy as np
+
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if depth == 0:
+        return 0
+    if isinstance(obj, (list, tuple)):
+        return sum(_array_bytes(item, depth - 1) for item in obj)
+    if isinstance(obj, dict):
+        return sum(_array_bytes(item, depth - 1) for item in obj.values())
+    if hasattr(obj, '__dict__'):
+        return sum(_array_bytes(item, depth - 1) for item in vars(obj).values())
+    return 0
+
+
+class Ledger:
+    """Everything the dashboard holds for one open file."""
+
+    def __init__(self, file_path, **state):
+        self.file_path = file_path
+        for name in LEDGER_STATE:
+            setattr(self, name, state.get(name))
+        self.spill_path = None      # frame on disk while spilled (and mapped from once restored)
+        self.spilling = False       # a spill write is in flight
+
+    @property
+    def name(self):
+        return os.path.basename(self.file_path)
+
+    @property
+    def loaded(self):
+        return self.df is not None
+
+    @property
+    def rows(self):
+        """Transaction count, read from the category cube so spilled ledgers need no rows."""
+        _, counts = self.aggregates.by_category(self.df)
+        return int(counts.to_numpy().sum())
+
+    def memory_bytes(self):
+        """In-memory size of the frame plus its indexes (0 while spilled)."""
+        if self.df is None:
+            return 0
+        indexes = sum(_array_bytes(getattr(self, name)) for name in INDEX_STATE)
+        return int(self.df.memory_usage(deep=False).sum()) + indexes
+
+
+class Workspace:
+    def __init__(self, memory_budget=MEMORY_BUDGET_MB << 20):
+        self.memory_budget = memory_budget
+        self.ledgers = OrderedDict()    # file path -> Ledger, least recently used first
+        self.active = None
+        self._spill_dir = None
+        self._spills = 0
+        self._stale = []                # spill files that could not be deleted yet
+        self._combined = None
+
+    def __contains__(self, file_path):
+        return file_path in self.ledgers
+
+    def __len__(self):
+        return len(self.ledgers)
+
+    def get(self, file_path):
+        return self.ledgers.get(file_path)
+
+    def add(self, ledger):
+        """Registers a freshly loaded ledger (replacing a stale copy of the same file)."""
+        old = self.ledgers.pop(ledger.file_path, None)
+        if old is not None:
+            self._discard_spill(old)
+        self.ledgers[ledger.file_path] = ledger
+        return ledger
+
+    def activate(self, ledger):
+        """Marks a ledger as active and most recently used, with a fresh data version."""
+        self.ledgers.move_to_end(ledger.file_path)
+        self.active = ledger
+        ledger.aggregates.version = self.next_version()
+        return ledger
+
+    def next_version(self):
+        """A data version above every open ledger's, so no chart cache mistakes one for another."""
+        return max((ledger.aggregates.version for ledger in self.ledgers.values()), default=0) + 1
+
+    def memory_bytes(self):
+        return sum(ledger.memory_bytes() for ledger in self.ledgers.values())
+
+    def to_spill(self):
+        """Coldest loaded, inactive ledgers to spill until the rest fits the budget."""
+        excess = self.memory_bytes() - self.memory_budget
+        victims = []
+        for ledger in self.ledgers.values():
+            if excess <= 0:
+                break
+            if ledger is self.active or not ledger.loaded or ledger.spilling:
+                continue
+            victims.append(ledger)
+            excess -= ledger.memory_bytes()
+        return victims
+
+    # --- Spilling ---
+    def _spill_file(self, ledger):
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix='budget-workspace-')
+            atexit.register(shutil.rmtree, self._spill_dir, True)
+        self._spills += 1
+        return os.path.join(self._spill_dir, f"{self._spills}-{ledger.name}.feather")
+
+    def write_spill(self, ledger, df):
+        """Worker: writes a ledger's frame to the spill folder; returns (path, version)."""
+        from app_snapshot import write_frame
+
+        return write_frame(self._spill_file(ledger), df), ledger.aggregates.version
+
+    def drop(self, ledger, path, version):
+        """Main thread: releases the frame once spilled, unless it was used in the meantime."""
+        ledger.spilling = False
+        if ledger is self.active or ledger.aggregates.version != version \
+                or self.ledgers.get(ledger.file_path) is not ledger:
+            _remove(path)
+            return False
+        ledger.df = None
+        for name in INDEX_STATE:
+            setattr(ledger, name, None)
+        self._discard_spill(ledger)  # the file of an earlier spill, no longer mapped
+        ledger.spill_path = path
+        return True
+
+    @staticmethod
+    def read_spill(ledger):
+        """Worker: the spilled frame of a ledger, memory-mapped back in."""
+        from app_snapshot import read_frame
+
+        return read_frame(ledger.spill_path)
+
+    def restore(self, ledger, df, search_index, filter_index, top_index):
+        """Main thread: reattaches a spilled ledger's frame and rebuilt indexes.
+
+        The frame may still be memory-mapped from the spill file, so the file is kept.
+        """
+        ledger.df = df
+        ledger.search_index, ledger.filter_index, ledger.top_index = search_index, filter_index, top_index
+
+    def _discard_spill(self, ledger):
+        """Deletes a ledger's spill file; files still mapped elsewhere are retried next time."""
+        if ledger.spill_path is not None:
+            self._stale.append(ledger.spill_path)
+            ledger.spill_path = None
+        self._stale = [path for path in self._stale if not _remove(path)]
+
+    # --- Consolidated View ---
+    def in_display_currency(self):
+        """Open ledgers whose amounts are in the display currency (the others can't be summed)."""
+        from app_currency import display_currency
+
+        currency = display_currency()
+        return [ledger for ledger in self.ledgers.values() if ledger.fx.currency == currency]
+
+    def key(self):
+        """Cache key of the consolidated view: every summed ledger's path, data version and residency."""
+        return tuple((ledger.file_path, ledger.aggregates.version, ledger.loaded, ledger.fx.currency)
+                     for ledger in self.in_display_currency())
+
+    def combined(self):
+        """AggregateCache summing the cubes of every open ledger in the display currency,
+        rebuilt only when one changes."""
+        key = self.key()
+        if self._combined is None or self._combined[0] != key:
+            from app_aggregates import AggregateCache
+
+            cache = AggregateCache.combine(ledger.aggregates for ledger in self.in_display_currency())
+            cache.version = key
+            self._combined = (key, cache)
+        return self._combined[1]
+
+
+def _remove(path):
+    """True once path is gone."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return True
+    except OSError:
+        return False
+    return True
@@ -0,0 +1,9 @@
+import os
+
+from app_startup import check_startup_budget
+
+
+def test_entry_modules_start_within_budget(monkeypatch):
+    """The entry modules import within STARTUP_BUDGET_MS and leave the heavy modules deferred."""
+    monkeypatch.chdir(os.path.dirname(os.path.abspath(__file__)))  # the probe imports from the cwd
+    assert check_startup_budget() == []